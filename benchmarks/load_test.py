@@ -0,0 +1,375 @@
+"""
+Reproducible load test of the dashboard API against offline price data.
+
+The app is created with ``data_loader.SyntheticPriceSource`` and driven
+in-process by simulated browser sessions replaying what ``app.js`` does:
+page loads firing the three ``/api/*`` calls, slider sweeps sending the
+previous ETags as ``base``, and repeat views revalidated with
+``If-None-Match``. Example::
+
+    python -m benchmarks.load_test --sessions 200 --concurrency 8 \\
+        --output load-test.json --baseline previous.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import functools
+import json
+import platform
+import random
+import resource
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from urllib.parse import urlencode
+
+import numpy as np
+import pandas as pd
+
+from src import dashboard
+from src.data_loader import SyntheticPriceSource
+
+
+ENDPOINTS = ("time_series", "sentiment", "performance")
+
+# Slider fields of the settings form: (query name, step, min, max).
+SLIDERS = (
+    ("short_window", 1, 2, 20),
+    ("long_window", 10, 10, 200),
+    ("extreme_fear", 5, 0, 50),
+    ("extreme_greed", 5, 50, 100),
+)
+
+# Session mix: share of page loads, slider sweeps and repeat views.
+SESSION_MIX = {"page_load": 0.5, "slider_sweep": 0.3, "repeat_view": 0.2}
+
+# Dashboard functions run once per in-memory cache miss.
+COMPUTE_FUNCTIONS = ("_compute_and_cache", "_compute_asset_and_cache")
+
+
+def _random_view(rng: random.Random, tickers: List[str]) -> Dict[str, Any]:
+    # Most visitors keep the form defaults or a few popular settings.
+    popular = [
+        {"short_window": 12, "long_window": 100},
+        {"short_window": 5, "long_window": 50},
+        {"short_window": 10, "long_window": 200},
+    ]
+    view = {
+        "ticker": tickers[0] if rng.random() < 0.7 else rng.choice(tickers),
+        "short_window": 12,
+        "long_window": 100,
+        "extreme_fear": 25,
+        "extreme_greed": 75,
+    }
+    if rng.random() < 0.4:
+        view.update(rng.choice(popular))
+    return view
+
+
+def build_sessions(
+    n_sessions: int, seed: int = 0, tickers: Optional[List[str]] = None
+) -> List[Tuple[str, List[Dict[str, Any]]]]:
+    """
+    Generate a deterministic list of ``(kind, views)`` sessions.
+
+    Every view is one form state; replaying it fires the three API calls.
+    """
+    rng = random.Random(seed)
+    tickers = tickers or ["BTC-USD"]
+    kinds = list(SESSION_MIX)
+    weights = list(SESSION_MIX.values())
+
+    sessions = []
+    for _ in range(n_sessions):
+        kind = rng.choices(kinds, weights)[0]
+        view = _random_view(rng, tickers)
+        views = [view]
+        if kind == "slider_sweep":
+            name, step, low, high = rng.choice(SLIDERS)
+            direction = rng.choice((-1, 1))
+            for _step in range(rng.randint(3, 8)):
+                value = view[name] + direction * step
+                if not low <= value <= high:
+                    break
+                view = dict(view, **{name: value})
+                views.append(view)
+        elif kind == "repeat_view":
+            views.append(dict(view))
+        sessions.append((kind, views))
+    return sessions
+
+
+def _run_session(
+    app: Any,
+    number: int,
+    kind: str,
+    views: List[Dict[str, Any]],
+) -> List[Tuple[str, float, int]]:
+    """Replay one session; returns (endpoint, seconds, status) samples."""
+    client = app.test_client()
+    environ = {"REMOTE_ADDR": f"10.0.{number // 256 % 256}.{number % 256}"}
+    etags: Dict[str, str] = {}
+    samples = []
+    for position, view in enumerate(views):
+        query = urlencode(view)
+        for endpoint in ENDPOINTS:
+            url = f"/api/{endpoint}?{query}"
+            headers = {}
+            if kind == "slider_sweep" and endpoint in etags:
+                url += "&" + urlencode({"base": etags[endpoint]})
+            if kind == "repeat_view" and position > 0 and endpoint in etags:
+                headers["If-None-Match"] = f'"{etags[endpoint]}"'
+
+            started = time.perf_counter()
+            response = client.get(
+                url, headers=headers, environ_base=environ
+            )
+            response.get_data()
+            elapsed = time.perf_counter() - started
+
+            etag, _weak = response.get_etag()
+            if etag:
+                etags[endpoint] = etag
+            samples.append((endpoint, elapsed, response.status_code))
+    return samples
+
+
+@contextlib.contextmanager
+def _count_computations() -> Iterator[List[int]]:
+    """
+    Count calls of the dashboard's compute functions while active.
+
+    The size of the (bounded) result cache stops growing once it evicts,
+    so the calls themselves are the cache misses.
+    """
+    counter = [0]
+    lock = threading.Lock()
+    originals = {name: getattr(dashboard, name) for name in COMPUTE_FUNCTIONS}
+
+    def _counted(func: Any) -> Any:
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            with lock:
+                counter[0] += 1
+            return func(*args, **kwargs)
+
+        return wrapper
+
+    for name, func in originals.items():
+        setattr(dashboard, name, _counted(func))
+    try:
+        yield counter
+    finally:
+        for name, func in originals.items():
+            setattr(dashboard, name, func)
+
+
+def _peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes.
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def _latency_summary(seconds: List[float]) -> Dict[str, float]:
+    millis = np.asarray(seconds) * 1000.0
+    p50, p95, p99 = np.percentile(millis, [50, 95, 99])
+    return {
+        "count": int(millis.size),
+        "mean_ms": round(float(millis.mean()), 3),
+        "p50_ms": round(float(p50), 3),
+        "p95_ms": round(float(p95), 3),
+        "p99_ms": round(float(p99), 3),
+        "max_ms": round(float(millis.max()), 3),
+    }
+
+
+def run_load_test(
+    sessions: int = 100,
+    concurrency: int = 4,
+    seed: int = 0,
+    config: Optional[Dict[str, Any]] = None,
+) -> Dict[str, Any]:
+    """
+    Run a load test and return the report as a JSON-ready dict.
+
+    Parameters
+    ----------
+    sessions:
+        Number of simulated browser sessions.
+    concurrency:
+        Sessions replayed at the same time.
+    seed:
+        Seed of both the traffic and the synthetic prices.
+    config:
+        Extra app configuration, e.g. ``{"COMPACT_CACHE": True}``.
+
+    Returns
+    -------
+    dict[str, Any]
+        Throughput, latency percentiles per endpoint, cache hit ratio and
+        peak RSS.
+    """
+    # Start from empty process caches, like a fresh worker.
+    dashboard._CACHE.clear()
+    dashboard._DATA_CACHE.clear()
+    dashboard._PANEL_CACHE.clear()
+    dashboard._CACHE_HITS.clear()
+    dashboard._SNAPSHOT_INDEX.clear()
+
+    app_config = {
+        "PRICE_SOURCE": SyntheticPriceSource(seed=seed),
+        "SHARED_CACHE_DIR": None,
+        "SNAPSHOT_DIR": None,
+        "RESULTS_DB": None,
+        "HEATMAP_DIR": None,
+        "HEATMAP_PRECOMPUTE": False,
+    }
+    app_config.update(config or {})
+    app = dashboard.create_app(app_config)
+    tickers = list(app.config["PANEL_TICKERS"])
+    replay = build_sessions(sessions, seed=seed, tickers=tickers)
+
+    started = time.perf_counter()
+    try:
+        with _count_computations() as misses, ThreadPoolExecutor(
+            max_workers=concurrency
+        ) as executor:
+            futures = [
+                executor.submit(_run_session, app, number, kind, views)
+                for number, (kind, views) in enumerate(replay)
+            ]
+            samples = [sample for f in futures for sample in f.result()]
+    finally:
+        app.extensions["compute_pool"].shutdown()
+    wall_time = time.perf_counter() - started
+
+    frame = pd.DataFrame(samples, columns=["endpoint", "seconds", "status"])
+    endpoints = {}
+    for endpoint, group in frame.groupby("endpoint"):
+        summary = _latency_summary(group["seconds"].tolist())
+        summary["statuses"] = {
+            str(status): int(count)
+            for status, count in group["status"].value_counts().items()
+        }
+        endpoints[endpoint] = summary
+
+    lookups = sum(dashboard._CACHE_HITS.values())
+    computations = misses[0]
+    return {
+        "config": {
+            "sessions": sessions,
+            "concurrency": concurrency,
+            "seed": seed,
+            "session_mix": SESSION_MIX,
+            "app_config": {
+                key: value
+                for key, value in app_config.items()
+                if key != "PRICE_SOURCE"
+            },
+        },
+        "environment": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "numpy": np.__version__,
+            "pandas": pd.__version__,
+        },
+        "requests": len(frame),
+        "wall_time_s": round(wall_time, 3),
+        "throughput_rps": round(len(frame) / wall_time, 2),
+        "overall": _latency_summary(frame["seconds"].tolist()),
+        "endpoints": endpoints,
+        "cache": {
+            "lookups": lookups,
+            "computations": computations,
+            "hit_ratio": (
+                round(1.0 - computations / lookups, 4) if lookups else 0.0
+            ),
+            "not_modified": int((frame["status"] == 304).sum()),
+        },
+        "peak_rss_mb": round(_peak_rss_mb(), 1),
+    }
+
+
+def compare(
+    report: Dict[str, Any], baseline: Dict[str, Any], tolerance: float = 0.2
+) -> List[str]:
+    """
+    Return the regressions of ``report`` against ``baseline``.
+
+    p95 latencies may grow and throughput may drop by at most
+    ``tolerance`` (a fraction) before they count as regressions.
+    """
+    regressions = []
+    for endpoint, summary in report["endpoints"].items():
+        previous = baseline.get("endpoints", {}).get(endpoint)
+        if previous and summary["p95_ms"] > previous["p95_ms"] * (
+            1 + tolerance
+        ):
+            regressions.append(
+                f"{endpoint} p95 {summary['p95_ms']:.1f} ms "
+                f"(baseline {previous['p95_ms']:.1f} ms)"
+            )
+    if report["throughput_rps"] < baseline.get("throughput_rps", 0) * (
+        1 - tolerance
+    ):
+        regressions.append(
+            f"throughput {report['throughput_rps']:.1f} req/s "
+            f"(baseline {baseline['throughput_rps']:.1f} req/s)"
+        )
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sessions", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--compact", action="store_true", help="Enable COMPACT_CACHE."
+    )
+    parser.add_argument("--output", type=Path, help="Write the JSON report.")
+    parser.add_argument(
+        "--baseline", type=Path, help="Previous report to compare with."
+    )
+    parser.add_argument("--tolerance", type=float, default=0.2)
+    args = parser.parse_args(argv)
+
+    report = run_load_test(
+        sessions=args.sessions,
+        concurrency=args.concurrency,
+        seed=args.seed,
+        config={"COMPACT_CACHE": args.compact},
+    )
+
+    print(
+        f"{report['requests']} requests in {report['wall_time_s']} s "
+        f"({report['throughput_rps']} req/s), "
+        f"cache hit ratio {report['cache']['hit_ratio']:.1%}, "
+        f"peak RSS {report['peak_rss_mb']} MB"
+    )
+    for endpoint, summary in report["endpoints"].items():
+        print(
+            f"  {endpoint:<12} n={summary['count']:<5} "
+            f"p50={summary['p50_ms']:.1f} ms  p95={summary['p95_ms']:.1f} ms"
+            f"  p99={summary['p99_ms']:.1f} ms  {summary['statuses']}"
+        )
+
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2) + "\n")
+
+    if args.baseline:
+        baseline = json.loads(args.baseline.read_text())
+        regressions = compare(report, baseline, args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION: {regression}")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,132 @@
+"""
+Import-time and startup benchmark of the dashboard.
+
+Every sample runs in a fresh interpreter: it imports the libraries the
+app cannot do without (pandas, flask), then ``src.dashboard``, then calls
+``create_app()``. Only the last two steps count against the budgets, so
+the numbers say little about the machine and a lot about what the app
+imports eagerly. Example::
+
+    python -m benchmarks.startup --repeats 5
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import subprocess
+import sys
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+
+ROOT = Path(__file__).resolve().parents[1]
+
+# Seconds spent importing src.dashboard on top of pandas and flask.
+IMPORT_BUDGET = 0.15
+
+# Seconds spent in create_app() with the default configuration.
+CREATE_APP_BUDGET = 0.1
+
+# Modules that must only be imported once they are used.
+LAZY_MODULES = ("yfinance", "requests", "scipy", "matplotlib")
+
+_SAMPLE = """
+import json, sys, time
+started = time.perf_counter()
+import pandas, flask
+baseline = time.perf_counter()
+from src import dashboard
+imported = time.perf_counter()
+dashboard.create_app({"SHARED_CACHE_DIR": None, "SNAPSHOT_DIR": None,
+                      "RESULTS_DB": None, "HEATMAP_DIR": None,
+                      "PRELOAD": False})
+created = time.perf_counter()
+print(json.dumps({
+    "baseline_s": baseline - started,
+    "import_s": imported - baseline,
+    "create_app_s": created - imported,
+    "modules": sorted(sys.modules),
+}))
+"""
+
+
+def _sample() -> Dict[str, Any]:
+    output = subprocess.run(
+        [sys.executable, "-c", _SAMPLE],
+        cwd=ROOT,
+        capture_output=True,
+        check=True,
+        text=True,
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def measure_startup(repeats: int = 3) -> Dict[str, Any]:
+    """
+    Measure the startup of ``repeats`` fresh interpreters.
+
+    Returns
+    -------
+    dict[str, Any]
+        The fastest 'baseline_s', 'import_s' and 'create_app_s', and the
+        'lazy_modules_loaded' that should not have been imported.
+    """
+    samples = [_sample() for _ in range(repeats)]
+    loaded = set(samples[0]["modules"])
+    return {
+        "repeats": repeats,
+        "baseline_s": min(s["baseline_s"] for s in samples),
+        "import_s": min(s["import_s"] for s in samples),
+        "create_app_s": min(s["create_app_s"] for s in samples),
+        "lazy_modules_loaded": [m for m in LAZY_MODULES if m in loaded],
+    }
+
+
+def check_budget(report: Dict[str, Any], slack: float = 1.0) -> List[str]:
+    """
+    Return the startup budgets exceeded by ``report``.
+
+    ``slack`` multiplies the time budgets, e.g. for shared CI machines.
+    """
+    failures = []
+    import_budget = IMPORT_BUDGET * slack
+    create_app_budget = CREATE_APP_BUDGET * slack
+    if report["import_s"] > import_budget:
+        failures.append(
+            f"import took {report['import_s']:.3f} s "
+            f"(budget {import_budget:g} s)"
+        )
+    if report["create_app_s"] > create_app_budget:
+        failures.append(
+            f"create_app took {report['create_app_s']:.3f} s "
+            f"(budget {create_app_budget:g} s)"
+        )
+    for module in report["lazy_modules_loaded"]:
+        failures.append(f"{module} imported at startup")
+    return failures
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--output", type=Path, help="Write the JSON report.")
+    args = parser.parse_args(argv)
+
+    report = measure_startup(args.repeats)
+    print(
+        f"pandas+flask {report['baseline_s'] * 1000:.0f} ms, "
+        f"src.dashboard {report['import_s'] * 1000:.0f} ms, "
+        f"create_app {report['create_app_s'] * 1000:.0f} ms"
+    )
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2) + "\n")
+
+    failures = check_budget(report)
+    for failure in failures:
+        print(f"OVER BUDGET: {failure}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,156 @@
+"""As-of alignment of alternative data series onto a price calendar."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+
+@dataclass(frozen=True)
+class AlternativeSeries:
+    """
+    Date-indexed data to align onto the price bars.
+
+    ``max_staleness`` is the largest age a value may have at a bar before
+    it counts as missing (None = no limit), e.g. ``pd.Timedelta("3D")``
+    for a daily metric that may skip a weekend. ``columns`` selects the
+    columns to align (None = all).
+    """
+
+    name: str
+    frame: pd.DataFrame
+    max_staleness: Optional[pd.Timedelta] = None
+    columns: Optional[Sequence[str]] = None
+
+
+class AsOfAligner:
+    """
+    Align any number of series onto one sorted price calendar.
+
+    The calendar is converted to int64 nanoseconds once; every series is
+    then matched with one ``np.searchsorted`` over its own dates: a bar
+    gets the last value dated at or before it, provided it is not older
+    than the series' ``max_staleness``.
+
+    Parameters
+    ----------
+    calendar:
+        Sorted bar dates.
+    """
+
+    def __init__(self, calendar: pd.Index) -> None:
+        self.calendar = pd.DatetimeIndex(calendar)
+        if not self.calendar.is_monotonic_increasing:
+            raise ValueError("The calendar must be sorted.")
+        self._stamps = self.calendar.as_unit("ns").asi8
+
+    def indexer(
+        self,
+        dates: pd.Index,
+        max_staleness: Optional[pd.Timedelta] = None,
+    ) -> np.ndarray:
+        """
+        Return, per bar, the position in sorted ``dates`` to take (-1 = none).
+
+        With duplicate dates the last one is taken.
+        """
+        stamps = pd.DatetimeIndex(dates).as_unit("ns").asi8
+        positions = np.searchsorted(stamps, self._stamps, side="right") - 1
+        if max_staleness is not None and len(stamps):
+            age = self._stamps - stamps[np.maximum(positions, 0)]
+            limit = pd.Timedelta(max_staleness).value
+            positions[age > limit] = -1
+        return positions
+
+    def align(self, series: AlternativeSeries) -> pd.DataFrame:
+        """Return the columns of one series on the calendar."""
+        frame = series.frame
+        if series.columns is not None:
+            frame = frame[list(series.columns)]
+        if not frame.index.is_monotonic_increasing:
+            frame = frame.sort_index(kind="stable")
+
+        positions = self.indexer(frame.index, series.max_staleness)
+        missing = positions < 0
+        take = np.maximum(positions, 0)
+        columns = {}
+        for name, column in frame.items():
+            if not len(column):
+                values = pd.Series(np.nan, index=self.calendar)
+            else:
+                values = pd.Series(
+                    column.to_numpy().take(take), index=self.calendar
+                )
+            if pd.api.types.is_integer_dtype(values.dtype):
+                # Same dtype whether or not the series has gaps.
+                values = values.astype(np.float64)
+            if missing.any():
+                values = values.where(~missing)
+            columns[name] = values
+        return pd.DataFrame(columns, index=self.calendar)
+
+    def align_all(self, sources: Sequence[AlternativeSeries]) -> pd.DataFrame:
+        """
+        Align several series into one frame on the calendar.
+
+        ValueError if two series share a column name.
+        """
+        frames = [self.align(series) for series in sources]
+        if not frames:
+            return pd.DataFrame(index=self.calendar)
+        aligned = pd.concat(frames, axis=1)
+        duplicated = aligned.columns[aligned.columns.duplicated()]
+        if len(duplicated):
+            raise ValueError(
+                f"Duplicate alternative data columns: {list(duplicated)}"
+            )
+        return aligned
+
+
+def load_alternative_csv(
+    csv_path: str | Path,
+    name: Optional[str] = None,
+    date_column: str = "date",
+    columns: Optional[Sequence[str]] = None,
+    max_staleness: Optional[str | pd.Timedelta] = None,
+) -> AlternativeSeries:
+    """
+    Load a local CSV (funding rates, on-chain metrics, ...) for alignment.
+
+    Parameters
+    ----------
+    csv_path:
+        CSV file with a date column and one or more value columns.
+    name:
+        Name of the series; defaults to the file name without suffix.
+    date_column:
+        Column holding the dates (or timestamps).
+    columns:
+        Value columns to keep (None = all others).
+    max_staleness:
+        Largest age of a value at a bar, e.g. '3D' (None = no limit).
+
+    Returns
+    -------
+    AlternativeSeries
+        The file's values indexed by date.
+    """
+    csv_path = Path(csv_path)
+    frame = pd.read_csv(csv_path)
+    if date_column not in frame.columns:
+        raise ValueError(f"{csv_path} has no '{date_column}' column.")
+    frame = frame.set_index(
+        pd.DatetimeIndex(pd.to_datetime(frame.pop(date_column)), name="date")
+    ).sort_index(kind="stable")
+    return AlternativeSeries(
+        name=name or csv_path.stem,
+        frame=frame,
+        max_staleness=(
+            None if max_staleness is None else pd.Timedelta(max_staleness)
+        ),
+        columns=columns,
+    )
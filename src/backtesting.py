@@ -5,21 +5,36 @@ from __future__ import annotations
 from math import sqrt
 from typing import Dict, Tuple
 
+import numpy as np
 import pandas as pd
 
+from . import kernels
 
 TRADING_DAYS_PER_YEAR = 252
 
+# Keys of the metrics dictionary returned by ``run_backtest``.
+METRIC_NAMES = (
+    "strategy_cumulative_return",
+    "benchmark_cumulative_return",
+    "strategy_max_drawdown",
+    "strategy_sharpe_ratio",
+    "strategy_hit_rate",
+)
 
-def run_backtest(data: pd.DataFrame) -> Tuple[pd.DataFrame, Dict[str, float]]:
+
+def run_backtest(
+    data: pd.DataFrame, periods_per_year: int = TRADING_DAYS_PER_YEAR
+) -> Tuple[pd.DataFrame, Dict[str, float]]:
     """
     Run a simple long/flat backtest based on the 'position' column.
 
     Parameters
     ----------
     data:
-        Data frame with columns 'return' (daily returns of Bitcoin)
+        Data frame with columns 'return' (per-bar returns of Bitcoin)
         and 'position' (1 for long, 0 for flat).
+    periods_per_year:
+        Bars per year, used to annualize the Sharpe ratio.
 
     Returns
     -------
@@ -35,19 +50,17 @@ def run_backtest(data: pd.DataFrame) -> Tuple[pd.DataFrame, Dict[str, float]]:
     result["strategy_equity"] = (1.0 + result["strategy_return"]).cumprod()
     result["benchmark_equity"] = (1.0 + result["return"]).cumprod()
 
-    drawdown = (
-        result["strategy_equity"]
-        / result["strategy_equity"].cummax()
-        - 1.0
+    drawdown = kernels.get_kernel("drawdown")(
+        result["strategy_equity"].to_numpy(dtype=float)
     )
-    max_drawdown = float(drawdown.min())
+    max_drawdown = float(np.nanmin(drawdown))
 
     strat_ret = result["strategy_return"]
     mean_daily = float(strat_ret.mean())
     std_daily = float(strat_ret.std())
 
     if std_daily > 0.0:
-        sharpe_ratio = mean_daily / std_daily * sqrt(TRADING_DAYS_PER_YEAR)
+        sharpe_ratio = mean_daily / std_daily * sqrt(periods_per_year)
     else:
         sharpe_ratio = 0.0
 
@@ -71,3 +84,65 @@ def run_backtest(data: pd.DataFrame) -> Tuple[pd.DataFrame, Dict[str, float]]:
     }
 
     return result, metrics
+
+
+def vectorized_metrics(
+    position_lagged: np.ndarray,
+    returns: np.ndarray,
+    periods_per_year: int = TRADING_DAYS_PER_YEAR,
+) -> Dict[str, np.ndarray]:
+    """
+    Compute the ``run_backtest`` metrics for many scenarios at once.
+
+    Parameters
+    ----------
+    position_lagged:
+        Positions already shifted by one period, time on the last axis.
+        Leading axes are independent scenarios.
+    returns:
+        Asset returns broadcastable against ``position_lagged``. NaN
+        returns (e.g. before an asset was listed) are skipped, as pandas
+        does in ``run_backtest``.
+    periods_per_year:
+        Bars per year, used to annualize the Sharpe ratio.
+
+    Returns
+    -------
+    dict[str, np.ndarray]
+        Same keys as the ``run_backtest`` metrics, one value per scenario.
+    """
+    returns = np.asarray(returns, dtype=float)
+    strat_ret = np.asarray(position_lagged, dtype=float) * returns
+    valid = ~np.isnan(strat_ret)
+    filled = np.where(valid, strat_ret, 0.0)
+    n_obs = valid.sum(axis=-1)
+
+    equity = np.cumprod(1.0 + filled, axis=-1)
+    drawdown = kernels.get_kernel("drawdown")(equity)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        mean_daily = filled.sum(axis=-1) / n_obs
+        deviations = np.where(valid, strat_ret - mean_daily[..., None], 0.0)
+        std_daily = np.sqrt((deviations**2).sum(axis=-1) / (n_obs - 1))
+        sharpe = np.where(
+            std_daily > 0.0,
+            mean_daily / std_daily * sqrt(periods_per_year),
+            0.0,
+        )
+
+    benchmark = np.cumprod(1.0 + np.nan_to_num(returns), axis=-1)
+    benchmark = np.broadcast_to(benchmark[..., -1], equity.shape[:-1])
+
+    active = (np.asarray(position_lagged) != 0) & valid
+    n_active = active.sum(axis=-1)
+    n_wins = (active & (strat_ret > 0)).sum(axis=-1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        hit_rate = np.where(n_active > 0, n_wins / n_active, 0.0)
+
+    return {
+        "strategy_cumulative_return": equity[..., -1] - 1.0,
+        "benchmark_cumulative_return": benchmark - 1.0,
+        "strategy_max_drawdown": drawdown.min(axis=-1),
+        "strategy_sharpe_ratio": sharpe,
+        "strategy_hit_rate": hit_rate,
+    }
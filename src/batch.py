@@ -0,0 +1,489 @@
+"""Config-driven batch runs of many strategy configurations in parallel."""
+
+from __future__ import annotations
+
+import functools
+import itertools
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Any, Dict, List, Mapping, Optional, Set, Tuple
+
+import numpy as np
+import pandas as pd
+
+from . import (
+    backtesting,
+    data_loader,
+    pipeline,
+    results_store,
+    strategy,
+    timeframes,
+)
+
+
+METRIC_COLUMNS = backtesting.METRIC_NAMES
+
+TEXT_COLUMNS = (
+    "run_id",
+    "ticker",
+    "timeframe",
+    "start",
+    "end",
+    "result_version",
+    "latest_signal",
+)
+
+EQUITY_COLUMNS = ("strategy_equity", "benchmark_equity")
+
+
+def make_run(
+    ticker: str = "BTC-USD",
+    start: str = data_loader.START_DATE,
+    end: str = data_loader.END_DATE,
+    params: Optional[Dict[str, int]] = None,
+    timeframe: str = timeframes.DEFAULT_TIMEFRAME,
+) -> Dict[str, Any]:
+    """
+    Normalize one configuration; missing parameters take their defaults.
+
+    The run id combines ticker, timeframe (unless daily), date range and
+    parameter token, so the same configuration always maps to the same
+    id.
+    """
+    timeframes.get_timeframe(timeframe)
+    full_params = dict(pipeline.DEFAULT_PARAMETERS)
+    full_params.update({k: int(v) for k, v in (params or {}).items()})
+    unknown = set(full_params) - set(pipeline.DEFAULT_PARAMETERS)
+    if unknown:
+        raise ValueError(f"Unknown strategy parameters: {sorted(unknown)}")
+    token = pipeline.params_token(full_params)
+    prefix = ticker
+    if timeframe != timeframes.DEFAULT_TIMEFRAME:
+        prefix = f"{ticker}:{timeframe}"
+    return {
+        "run_id": f"{prefix}:{start}:{end}:{token}",
+        "ticker": ticker,
+        "timeframe": timeframe,
+        "start": start,
+        "end": end,
+        "params": full_params,
+    }
+
+
+def load_config(path: str | Path) -> List[Dict[str, Any]]:
+    """
+    Read a JSON batch file and expand it into a list of runs.
+
+    The file may contain a ``runs`` list of explicit configurations
+    (keys 'ticker', 'timeframe', 'start', 'end', 'params') and a ``grid``
+    whose 'tickers', 'timeframes', 'date_ranges' and per-parameter value
+    lists are combined exhaustively. ``defaults`` fills in keys missing
+    from ``runs``.
+
+    Returns
+    -------
+    list[dict[str, Any]]
+        Runs from :func:`make_run`, without duplicates, grouped by data
+        set so that workers can reuse prepared data.
+    """
+    config = json.loads(Path(path).read_text(encoding="utf-8"))
+    defaults = config.get("defaults", {})
+
+    runs = [
+        make_run(**{**defaults, **entry}) for entry in config.get("runs", [])
+    ]
+
+    grid = config.get("grid")
+    if grid:
+        tickers = grid.get("tickers", [defaults.get("ticker", "BTC-USD")])
+        date_ranges = grid.get(
+            "date_ranges",
+            [[
+                defaults.get("start", data_loader.START_DATE),
+                defaults.get("end", data_loader.END_DATE),
+            ]],
+        )
+        bar_sizes = grid.get(
+            "timeframes",
+            [defaults.get("timeframe", timeframes.DEFAULT_TIMEFRAME)],
+        )
+        names = [name for name in pipeline.DEFAULT_PARAMETERS if name in grid]
+        values = [grid[name] for name in names]
+        datasets = itertools.product(tickers, bar_sizes, date_ranges)
+        for ticker, timeframe, (start, end) in datasets:
+            for combination in itertools.product(*values):
+                runs.append(
+                    make_run(
+                        ticker,
+                        start,
+                        end,
+                        dict(zip(names, combination)),
+                        timeframe,
+                    )
+                )
+
+    unique = {run["run_id"]: run for run in runs}
+    return sorted(
+        unique.values(),
+        key=lambda run: (
+            run["ticker"], run["timeframe"], run["start"], run["end"]
+        ),
+    )
+
+
+def load_prices(runs: List[Dict[str, Any]]) -> Dict[str, pd.DataFrame]:
+    """
+    Download the prices of all tickers used by ``runs`` in one batch.
+
+    Returns
+    -------
+    dict[str, pd.DataFrame]
+        Per ticker, a frame with 'Date' and 'close' columns as returned
+        by ``data_loader.download_bitcoin_history``.
+    """
+    tickers = sorted({run["ticker"] for run in runs})
+    closes = data_loader.download_price_panel(
+        tickers,
+        start_date=min(run["start"] for run in runs),
+        end_date=max(run["end"] for run in runs),
+    )
+    return {
+        ticker: closes[ticker]
+        .dropna()
+        .rename("close")
+        .rename_axis("Date")
+        .reset_index()
+        for ticker in tickers
+    }
+
+
+# Data handed to every worker process once, by the pool initializer.
+_WORKER_PRICES: Dict[str, pd.DataFrame] = {}
+_WORKER_SENTIMENT: Optional[pd.DataFrame] = None
+
+# Prepared data (Bollinger Bands, Kalman trend) per ticker, timeframe and
+# date range.
+_WORKER_BASES: Dict[Tuple[str, str, str, str], pd.DataFrame] = {}
+
+
+def _init_worker(
+    prices: Dict[str, pd.DataFrame], sentiment_df: pd.DataFrame
+) -> None:
+    global _WORKER_SENTIMENT
+    _WORKER_PRICES.clear()
+    _WORKER_PRICES.update(prices)
+    _WORKER_SENTIMENT = sentiment_df
+    _WORKER_BASES.clear()
+
+
+def _prepared_data(
+    ticker: str, timeframe: str, start: str, end: str
+) -> pd.DataFrame:
+    key = (ticker, timeframe, start, end)
+    base = _WORKER_BASES.get(key)
+    if base is None:
+        merged = data_loader.merge_price_and_sentiment(
+            _WORKER_PRICES[ticker],
+            _WORKER_SENTIMENT,
+            start_date=start,
+            end_date=end,
+        )
+        merged = timeframes.resample_merged(merged, timeframe)
+        base = pipeline.prepare_base(merged)
+        _WORKER_BASES[key] = base
+    return base
+
+
+def run_one(run: Dict[str, Any]) -> Dict[str, Any]:
+    """Run one configuration on a worker and return its result row."""
+    timeframe = run.get("timeframe", timeframes.DEFAULT_TIMEFRAME)
+    base = _prepared_data(run["ticker"], timeframe, run["start"], run["end"])
+    enriched, metrics = pipeline.run_parameter_stages(
+        base,
+        run["params"],
+        timeframes.get_timeframe(timeframe).periods_per_year,
+    )
+    signal, _explanation = strategy.latest_recommendation(enriched)
+    return {
+        **run,
+        "metrics": metrics,
+        "latest_signal": signal,
+        "dates": enriched.index.values.astype("datetime64[D]"),
+        "strategy_equity": enriched["_strategy_equity"].to_numpy(float),
+        "benchmark_equity": enriched["_benchmark_equity"].to_numpy(float),
+    }
+
+
+class ResultWriter:
+    """
+    Append batch results to numbered ``.npz`` part files.
+
+    Each part stores one array per column: run metadata, parameters and
+    metrics, plus the equity curves of all its runs concatenated with an
+    offsets array. Parts are written under a temporary name and renamed,
+    so an interrupted run leaves only complete parts behind; the run ids
+    in them are skipped when the batch is resumed, unless they were
+    stored under another result version. A run stored more than once is
+    read from the latest part.
+
+    Parameters
+    ----------
+    directory:
+        Output directory; created if missing.
+    flush_every:
+        Number of results buffered before a part is written.
+    """
+
+    def __init__(self, directory: str | Path, flush_every: int = 32) -> None:
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.flush_every = flush_every
+        self._buffer: List[Dict[str, Any]] = []
+        parts = self.parts()
+        self._next_part = (
+            int(parts[-1].stem.split("-")[1]) + 1 if parts else 0
+        )
+
+    def parts(self) -> List[Path]:
+        """Return the complete part files in write order."""
+        return sorted(self.directory.glob("part-*.npz"))
+
+    def completed(
+        self, versions: Optional[Mapping[str, str]] = None
+    ) -> Set[str]:
+        """
+        Return the run ids already stored in the output directory.
+
+        Parameters
+        ----------
+        versions:
+            Current result version by run id. When given, runs stored
+            under another version (or, in older parts, none) are not
+            counted as completed.
+        """
+        done: Set[str] = set()
+        for part in self.parts():
+            with np.load(part) as data:
+                run_ids = data["run_id"].tolist()
+                if versions is None:
+                    done.update(run_ids)
+                    continue
+                if "result_version" not in data.files:
+                    continue
+                stored = data["result_version"].tolist()
+                done.update(
+                    run_id
+                    for run_id, version in zip(run_ids, stored)
+                    if versions.get(run_id) == version
+                )
+        return done
+
+    def add(self, result: Dict[str, Any]) -> None:
+        """Buffer one result row, writing a part when the buffer is full."""
+        self._buffer.append(result)
+        if len(self._buffer) >= self.flush_every:
+            self.flush()
+
+    def flush(self) -> None:
+        """Write the buffered results as a new part file."""
+        if not self._buffer:
+            return
+        rows, self._buffer = self._buffer, []
+
+        columns: Dict[str, np.ndarray] = {
+            name: np.array([row[name] for row in rows], dtype=str)
+            for name in TEXT_COLUMNS
+        }
+        for name in pipeline.DEFAULT_PARAMETERS:
+            columns[name] = np.array(
+                [row["params"][name] for row in rows], dtype=np.int64
+            )
+        for name in METRIC_COLUMNS:
+            columns[name] = np.array(
+                [row["metrics"][name] for row in rows], dtype=np.float64
+            )
+        lengths = [len(row["dates"]) for row in rows]
+        columns["equity_offsets"] = np.concatenate(
+            [[0], np.cumsum(lengths)]
+        ).astype(np.int64)
+        columns["equity_dates"] = np.concatenate(
+            [row["dates"] for row in rows]
+        ).astype("datetime64[D]").astype(np.int64)
+        for name in EQUITY_COLUMNS:
+            columns[name] = np.concatenate([row[name] for row in rows])
+
+        name = f"part-{self._next_part:05d}.npz"
+        tmp_path = self.directory / f".{name}.{os.getpid()}"
+        with open(tmp_path, "wb") as handle:
+            np.savez(handle, **columns)
+        os.replace(tmp_path, self.directory / name)
+        self._next_part += 1
+
+
+def record_result(
+    store: results_store.ResultsStore, result: Dict[str, Any]
+) -> int:
+    """Record one result row from :func:`run_one` in a results store."""
+    return store.record(
+        ticker=result["ticker"],
+        start_date=result["start"],
+        end_date=result["end"],
+        params=result["params"],
+        metrics=result["metrics"],
+        dates=result["dates"],
+        strategy_equity=result["strategy_equity"],
+        benchmark_equity=result["benchmark_equity"],
+        result_version=result["result_version"],
+        latest_signal=result["latest_signal"],
+        timeframe=result["timeframe"],
+    )
+
+
+def read_results(directory: str | Path) -> pd.DataFrame:
+    """
+    Read the run metadata, parameters and metrics of a batch output.
+
+    Returns
+    -------
+    pd.DataFrame
+        One row per run, indexed by run id, from the latest part that
+        stores it.
+    """
+    scalar_columns = (
+        list(TEXT_COLUMNS)
+        + list(pipeline.DEFAULT_PARAMETERS)
+        + list(METRIC_COLUMNS)
+    )
+    frames = []
+    for part in ResultWriter(directory).parts():
+        with np.load(part) as data:
+            frames.append(
+                pd.DataFrame(
+                    {
+                        name: data[name]
+                        for name in scalar_columns
+                        if name in data.files
+                    }
+                )
+            )
+    if not frames:
+        return pd.DataFrame(columns=scalar_columns).set_index("run_id")
+    results = pd.concat(frames, ignore_index=True).set_index("run_id")
+    return results[~results.index.duplicated(keep="last")]
+
+
+def read_equity(directory: str | Path, run_id: str) -> pd.DataFrame:
+    """Return the equity curves of one run, indexed by date."""
+    for part in reversed(ResultWriter(directory).parts()):
+        with np.load(part) as data:
+            matches = np.flatnonzero(data["run_id"] == run_id)
+            if not matches.size:
+                continue
+            offsets = data["equity_offsets"]
+            span = slice(offsets[matches[0]], offsets[matches[0] + 1])
+            index = pd.DatetimeIndex(
+                data["equity_dates"][span].astype("datetime64[D]"),
+                name="date",
+            )
+            return pd.DataFrame(
+                {name: data[name][span] for name in EQUITY_COLUMNS},
+                index=index,
+            )
+    raise KeyError(run_id)
+
+
+def run_batch(
+    runs: List[Dict[str, Any]],
+    output_dir: str | Path,
+    workers: Optional[int] = None,
+    flush_every: int = 32,
+    prices: Optional[Dict[str, pd.DataFrame]] = None,
+    sentiment_df: Optional[pd.DataFrame] = None,
+    store: Optional[results_store.ResultsStore] = None,
+) -> int:
+    """
+    Run all configurations not yet stored in ``output_dir``.
+
+    Runs stored under an older result version (see
+    :func:`pipeline.result_version`) are run again.
+
+    Prices of all tickers are loaded once in this process and handed to
+    each worker by the pool initializer; workers additionally keep the
+    prepared data of every ticker and date range they have seen, so a
+    parameter sweep only runs the parameter-dependent stages.
+
+    Parameters
+    ----------
+    runs:
+        Runs from :func:`load_config` or :func:`make_run`.
+    output_dir:
+        Directory of the part files; an existing output is resumed.
+    workers:
+        Worker processes (defaults to the number of CPUs).
+    flush_every:
+        Results per part file.
+    prices, sentiment_df:
+        Preloaded inputs; downloaded / read from the default CSV if None.
+    store:
+        Results store in which every finished run is also recorded.
+
+    Returns
+    -------
+    int
+        Number of runs completed by this call.
+    """
+    writer = ResultWriter(output_dir, flush_every=flush_every)
+    version = functools.lru_cache(maxsize=None)(pipeline.result_version)
+    runs = [
+        {
+            **run,
+            "result_version": version(run["ticker"], run["start"], run["end"]),
+        }
+        for run in runs
+    ]
+    done = writer.completed(
+        {run["run_id"]: run["result_version"] for run in runs}
+    )
+    pending = [run for run in runs if run["run_id"] not in done]
+    print(f"{len(done)} runs already stored, {len(pending)} to run")
+    if not pending:
+        return 0
+
+    if prices is None:
+        prices = load_prices(pending)
+    if sentiment_df is None:
+        sentiment_df = data_loader.load_fear_greed_index(
+            pipeline.default_fear_greed_csv(),
+            start_date=min(run["start"] for run in pending),
+            end_date=max(run["end"] for run in pending),
+        )
+
+    completed = 0
+    executor = ProcessPoolExecutor(
+        max_workers=workers or os.cpu_count(),
+        initializer=_init_worker,
+        initargs=(prices, sentiment_df),
+    )
+    try:
+        futures = {executor.submit(run_one, run): run for run in pending}
+        for future in as_completed(futures):
+            run = futures[future]
+            try:
+                result = future.result()
+            except Exception as e:
+                print(f"Run {run['run_id']} failed: {e}")
+                continue
+            writer.add(result)
+            if store is not None:
+                record_result(store, result)
+            completed += 1
+            if completed % 100 == 0:
+                print(f"{completed}/{len(pending)} runs done")
+    finally:
+        writer.flush()
+        executor.shutdown(wait=True, cancel_futures=True)
+
+    print(f"Batch complete: {completed}/{len(pending)} runs stored")
+    return completed
@@ -0,0 +1,142 @@
+"""Bounded worker pool with admission control for pipeline computations."""
+
+from __future__ import annotations
+
+import os
+import threading
+import weakref
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict
+
+
+class PoolSaturatedError(RuntimeError):
+    """Raised when the compute pool refuses new work."""
+
+    def __init__(self, message: str, retry_after: int) -> None:
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class ComputePool:
+    """
+    Run expensive computations on a fixed number of worker threads.
+
+    At most ``max_workers + max_queue`` distinct computations are admitted
+    at the same time and every client may hold at most ``per_client`` of
+    them. Requests for a key that is already being computed join the
+    running computation instead of queueing a duplicate.
+
+    Parameters
+    ----------
+    max_workers:
+        Number of worker threads.
+    max_queue:
+        Number of admitted computations allowed to wait for a worker.
+    per_client:
+        Maximum number of admitted computations per client.
+    retry_after:
+        Seconds suggested to rejected clients before retrying.
+
+    Worker threads do not survive ``fork``: a pool inherited by a forked
+    process (e.g. a worker of a preloading server) is reset to a fresh
+    executor with no computations in flight.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = 2,
+        max_queue: int = 8,
+        per_client: int = 2,
+        retry_after: int = 2,
+    ) -> None:
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self.per_client = per_client
+        self.retry_after = retry_after
+        self._closed = False
+        self._reset()
+        _POOLS.add(self)
+
+    def _reset(self) -> None:
+        # Threads are only started on the first submission.
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.max_workers, thread_name_prefix="pipeline"
+        )
+        self._lock = threading.Lock()
+        self._inflight: Dict[str, Future] = {}
+        self._client_counts: Dict[str, int] = {}
+
+    @property
+    def pending(self) -> int:
+        """Number of admitted computations that have not finished."""
+        with self._lock:
+            return len(self._inflight)
+
+    def submit(
+        self,
+        key: str,
+        client: str,
+        func: Callable[..., Any],
+        *args: Any,
+    ) -> Future:
+        """
+        Schedule ``func(*args)`` under ``key`` unless the pool is saturated.
+
+        Raises
+        ------
+        PoolSaturatedError
+            If the queue is full or the client reached its limit.
+        """
+        with self._lock:
+            running = self._inflight.get(key)
+            if running is not None:
+                return running
+
+            if len(self._inflight) >= self.max_workers + self.max_queue:
+                raise PoolSaturatedError(
+                    "Compute queue is full.", self.retry_after
+                )
+            if self._client_counts.get(client, 0) >= self.per_client:
+                raise PoolSaturatedError(
+                    "Too many concurrent computations for this client.",
+                    self.retry_after,
+                )
+
+            future = self._executor.submit(func, *args)
+            self._inflight[key] = future
+            self._client_counts[client] = (
+                self._client_counts.get(client, 0) + 1
+            )
+
+        future.add_done_callback(
+            lambda _f: self._release(key, client)
+        )
+        return future
+
+    def _release(self, key: str, client: str) -> None:
+        with self._lock:
+            self._inflight.pop(key, None)
+            remaining = self._client_counts.get(client, 0) - 1
+            if remaining > 0:
+                self._client_counts[client] = remaining
+            else:
+                self._client_counts.pop(client, None)
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop accepting work and release the worker threads."""
+        self._closed = True
+        self._executor.shutdown(wait=wait)
+
+
+# Live pools of this process, reset in forked children.
+_POOLS: "weakref.WeakSet[ComputePool]" = weakref.WeakSet()
+
+
+def _reset_pools_after_fork() -> None:
+    for pool in list(_POOLS):
+        if not pool._closed:
+            pool._reset()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_pools_after_fork)
@@ -2,71 +2,717 @@
 
 from __future__ import annotations
 
+import atexit
+import functools
+import gc
+import json
+import os
+import threading
+import weakref
+from concurrent.futures import Future
+from concurrent.futures import TimeoutError as FutureTimeoutError
 from pathlib import Path
-from typing import Any, Dict, Tuple
+from typing import Any, Callable, Dict, Optional, Sequence
 
 import pandas as pd
-from flask import Flask, jsonify, render_template, request
+from flask import (
+    Flask,
+    Response,
+    current_app,
+    jsonify,
+    render_template,
+    request,
+)
 
 from . import (
-    backtesting,
     data_loader,
-    indicators,
-    sentiment,
+    heatmap,
+    kernels,
+    live_feed,
+    panel,
+    pipeline,
+    regimes,
     serialization,
     strategy,
+    timeframes,
+    trades,
 )
+from .compute_pool import ComputePool, PoolSaturatedError
+from .memory_cache import LRUCache
+from .pipeline import PipelineResult
+from .results_store import ResultsStore
+from .shared_cache import SharedResultCache
+from .snapshot import SnapshotStore, start_periodic_snapshots
+
+
+DEFAULT_CONFIG: Dict[str, Any] = {
+    # Worker threads running pipeline computations on cache misses.
+    "COMPUTE_WORKERS": 2,
+    # Admitted computations allowed to wait for a free worker.
+    "COMPUTE_QUEUE_DEPTH": 8,
+    # Concurrent computations a single client may have admitted.
+    "COMPUTE_PER_CLIENT": 2,
+    # Seconds a request waits for its computation before giving up.
+    "COMPUTE_TIMEOUT": 60,
+    # Value of the Retry-After header on 503 responses.
+    "COMPUTE_RETRY_AFTER": 2,
+    # Directory of the cache shared by all worker processes (None = off).
+    "SHARED_CACHE_DIR": os.environ.get("ALGO_DASH_SHARED_CACHE_DIR"),
+    # Entries kept in the shared cache; the least recently used go first.
+    "SHARED_CACHE_MAX_ENTRIES": int(
+        os.environ.get("ALGO_DASH_SHARED_CACHE_ENTRIES", 1024)
+    ),
+    # Directory of warm-restart snapshots of the hottest entries (None = off).
+    "SNAPSHOT_DIR": os.environ.get("ALGO_DASH_SNAPSHOT_DIR"),
+    # Seconds between periodic snapshots (0 = only on shutdown).
+    "SNAPSHOT_INTERVAL": 300,
+    # Number of cache entries kept in a snapshot.
+    "SNAPSHOT_MAX_ENTRIES": 32,
+    # Source of live bars for /api/stream (None = poll yfinance).
+    "LIVE_FEED": None,
+    # Seconds between polls of the live feed.
+    "LIVE_POLL_INTERVAL": 60,
+    # Seconds between SSE keep-alive comments on an idle stream.
+    "LIVE_HEARTBEAT": 15,
+    # Live bars kept for replay to newly connected streams.
+    "LIVE_MAX_BARS": 1000,
+    # Concurrent /api/stream clients; each holds a request thread while
+    # connected, further clients get a 503.
+    "LIVE_MAX_STREAMS": 16,
+    # Directory where the parameter heatmap cube is persisted (None = off).
+    "HEATMAP_DIR": os.environ.get("ALGO_DASH_HEATMAP_DIR"),
+    # Build the heatmap cube in the background as soon as the app starts.
+    "HEATMAP_PRECOMPUTE": False,
+    # Cache frames as float32/int8/categoricals (payloads are unchanged).
+    "COMPACT_CACHE": os.environ.get("ALGO_DASH_COMPACT_CACHE") == "1",
+    # Results kept in memory per process; the least recently used go first.
+    "CACHE_MAX_ENTRIES": int(os.environ.get("ALGO_DASH_CACHE_ENTRIES", 128)),
+    # Sentiment-regime cubes kept in memory, one per pair of MA windows.
+    "REGIME_CACHE_ENTRIES": int(
+        os.environ.get("ALGO_DASH_REGIME_CACHE_ENTRIES", 16)
+    ),
+    # Assets offered in the asset selector, loaded together as one panel.
+    "PANEL_TICKERS": panel.DEFAULT_TICKERS,
+    # Bar sizes offered in the timeframe selector (see timeframes.py).
+    "TIMEFRAMES": tuple(timeframes.TIMEFRAMES),
+    # Backend of the sequential kernels: 'auto', 'numpy' or 'numba'.
+    "KERNEL_BACKEND": os.environ.get("ALGO_DASH_KERNEL_BACKEND", "auto"),
+    # SQLite file recording every computed run (None = off).
+    "RESULTS_DB": os.environ.get("ALGO_DASH_RESULTS_DB"),
+    # Offline price source such as data_loader.SyntheticPriceSource
+    # (None = download from yfinance).
+    "PRICE_SOURCE": None,
+    # Load data and the default result in create_app, for servers that
+    # fork workers from an initialised app (gunicorn --preload).
+    "PRELOAD": os.environ.get("ALGO_DASH_PRELOAD") == "1",
+}
 
 
-def create_app() -> Flask:
+def create_app(config: Optional[Dict[str, Any]] = None) -> Flask:
     """Create and configure the Flask application."""
     app = Flask(
         __name__,
         template_folder=str(Path(__file__).resolve().parents[1] / "templates"),
         static_folder=str(Path(__file__).resolve().parents[1] / "static"),
     )
+    app.config.update(DEFAULT_CONFIG)
+    if config:
+        app.config.update(config)
+
+    kernels.set_backend(app.config["KERNEL_BACKEND"])
+    app.extensions["compute_pool"] = ComputePool(
+        max_workers=app.config["COMPUTE_WORKERS"],
+        max_queue=app.config["COMPUTE_QUEUE_DEPTH"],
+        per_client=app.config["COMPUTE_PER_CLIENT"],
+        retry_after=app.config["COMPUTE_RETRY_AFTER"],
+    )
+    version = pipeline.result_version(DATA_TICKER)
+    panel_version = pipeline.result_version(
+        ",".join(app.config["PANEL_TICKERS"])
+    )
+    source = app.config["PRICE_SOURCE"]
+    if source is not None:
+        # Keep results of other price sources apart in persisted caches.
+        tag = getattr(source, "version", type(source).__name__)
+        version = f"{version}-{tag}"
+        panel_version = f"{panel_version}-{tag}"
+    app.extensions["result_version"] = version
+    app.extensions["panel_version"] = panel_version
+    _CACHE.maxsize = app.config["CACHE_MAX_ENTRIES"]
+    app.extensions["live_streams"] = threading.BoundedSemaphore(
+        app.config["LIVE_MAX_STREAMS"]
+    )
+    # Sentiment-regime cubes by scoped "short_window.long_window" key.
+    app.extensions["regime_cubes"] = LRUCache(
+        app.config["REGIME_CACHE_ENTRIES"]
+    )
+    if app.config["SHARED_CACHE_DIR"]:
+        app.extensions["shared_cache"] = SharedResultCache(
+            app.config["SHARED_CACHE_DIR"],
+            version=version,
+            max_entries=app.config["SHARED_CACHE_MAX_ENTRIES"],
+        )
+    if app.config["RESULTS_DB"]:
+        app.extensions["results_store"] = ResultsStore(
+            app.config["RESULTS_DB"]
+        )
+    if app.config["SNAPSHOT_DIR"]:
+        store = SnapshotStore(app.config["SNAPSHOT_DIR"], version=version)
+        app.extensions["snapshots"] = store
+        _SNAPSHOT_INDEX.update(store.load_index())
+
+        def _save() -> None:
+            if app.config["PRELOAD"] and not _FORKED:
+                # A preloading parent only serves as a template for its
+                # workers; its cache would overwrite theirs.
+                return
+            try:
+                save_snapshot(store, app.config["SNAPSHOT_MAX_ENTRIES"])
+            except Exception as e:
+                print(f"Snapshot error: {e}")
+
+        atexit.register(_save)
+        app.extensions["snapshot_save"] = _save
+        if app.config["SNAPSHOT_INTERVAL"] > 0 and not app.config["PRELOAD"]:
+            app.extensions["snapshot_stop"] = start_periodic_snapshots(
+                _save, app.config["SNAPSHOT_INTERVAL"]
+            )
+    if app.config["HEATMAP_DIR"]:
+        cube = heatmap.HeatmapCube.load(
+            app.config["HEATMAP_DIR"], version, heatmap.GRID_AXES
+        )
+        if cube is not None:
+            app.extensions["heatmap"] = cube
+    if app.config["PRELOAD"]:
+        _preload(app)
+    elif app.config["HEATMAP_PRECOMPUTE"] and "heatmap" not in app.extensions:
+        _submit_heatmap_build(app, client="startup")
+    _APPS.add(app)
+
+    @app.errorhandler(PoolSaturatedError)
+    def handle_saturated(error: PoolSaturatedError) -> Any:
+        response = jsonify({"error": str(error)})
+        response.status_code = 503
+        response.headers["Retry-After"] = str(error.retry_after)
+        return response
 
     @app.route("/", methods=["GET"])
     def index() -> str:
-        return render_template("dashboard.html")
+        return render_template(
+            "dashboard.html",
+            tickers=app.config["PANEL_TICKERS"],
+            default_ticker=DATA_TICKER,
+            timeframes=[
+                timeframes.get_timeframe(name)
+                for name in app.config["TIMEFRAMES"]
+            ],
+            default_timeframe=timeframes.DEFAULT_TIMEFRAME,
+        )
 
     @app.route("/api/time_series", methods=["GET"])
     def api_time_series() -> Any:
-        try:
-            enriched, _metrics = _run_pipeline_from_request()
-            payload = serialization.serialize_time_series(enriched)
-            return jsonify(payload)
-        except Exception as e:
-            print(f"API Error: {e}")
-            return jsonify({"error": str(e)}), 500
+        return _payload_response("time_series")
 
     @app.route("/api/sentiment", methods=["GET"])
     def api_sentiment() -> Any:
-        try:
-            enriched, _metrics = _run_pipeline_from_request()
-            payload = serialization.serialize_sentiment(enriched)
-            return jsonify(payload)
-        except Exception as e:
-            print(f"API Error: {e}")
-            return jsonify({"error": str(e)}), 500
+        return _payload_response("sentiment")
 
     @app.route("/api/performance", methods=["GET"])
     def api_performance() -> Any:
-        try:
-            enriched, metrics = _run_pipeline_from_request()
-            backtest_df, metrics = backtesting.run_backtest(enriched)
-            payload = serialization.serialize_performance(backtest_df, metrics)
-            signal, explanation = strategy.latest_recommendation(enriched)
-            payload["latest_signal"] = signal
-            payload["latest_explanation"] = explanation
-            return jsonify(payload)
-        except Exception as e:
-            print(f"API Error: {e}")
-            return jsonify({"error": str(e)}), 500
+        return _payload_response("performance")
+
+    @app.route("/api/heatmap", methods=["GET"])
+    def api_heatmap() -> Any:
+        return _heatmap_response()
+
+    @app.route("/api/regimes", methods=["GET"])
+    def api_regimes() -> Any:
+        return _regimes_response()
+
+    @app.route("/api/trades", methods=["GET"])
+    def api_trades() -> Any:
+        return _trades_response()
+
+    @app.route("/api/stream", methods=["GET"])
+    def api_stream() -> Any:
+        return _stream_response()
+
+    @app.route("/api/runs", methods=["GET"])
+    def api_runs() -> Any:
+        return _runs_response()
+
+    @app.route("/api/runs/<int:run_id>", methods=["GET"])
+    def api_run(run_id: int) -> Any:
+        return _run_response(run_id)
 
     return app
 
 
+def _preload(app: Flask) -> None:
+    """
+    Compute the default view on the calling thread before workers fork.
+
+    Forked workers share the loaded frames copy-on-write; ``gc.freeze``
+    keeps the garbage collector from writing to (and so copying) them.
+    """
+    _register_fork_hook()
+    shared = app.extensions.get("shared_cache")
+    source = app.config["PRICE_SOURCE"]
+    version = app.extensions["result_version"]
+    params = dict(pipeline.DEFAULT_PARAMETERS)
+    key = _scoped(version, pipeline.cache_key(params))
+    try:
+        _load_data(shared, source, version)
+        if key not in _CACHE:
+            restored = _restore_from_snapshot(key)
+            if restored is not None:
+                _CACHE[key] = restored
+            else:
+                _compute_and_cache(
+                    key, params, shared, version,
+                    app.config["COMPACT_CACHE"], source=source,
+                )
+        if app.config["HEATMAP_PRECOMPUTE"]:
+            if "heatmap" not in app.extensions:
+                _build_heatmap(app, shared)
+    except Exception as e:
+        # Workers compute on demand, as without preloading.
+        print(f"Preload error: {e}")
+    gc.freeze()
+
+
+def _payload_response(name: str) -> Any:
+    """
+    Serve one pre-encoded API payload for the request parameters.
+
+    Responses carry an ETag naming the result version (per asset) and
+    parameters. If the client passes a previous ETag as ``base``, only
+    the fields that the changed parameters can affect are sent, marked
+    with ``"delta": true``. Clients accepting
+    ``serialization.COLUMNS_MIMETYPE`` (and preferring it to JSON) get
+    the full payload in the binary columnar format instead.
+    """
+    ticker = request.args.get("ticker", DATA_TICKER)
+    if ticker not in current_app.config["PANEL_TICKERS"]:
+        return jsonify({"error": f"Unknown ticker: {ticker}"}), 400
+    timeframe = request.args.get("timeframe", timeframes.DEFAULT_TIMEFRAME)
+    if timeframe not in current_app.config["TIMEFRAMES"]:
+        return jsonify({"error": f"Unknown timeframe: {timeframe}"}), 400
+
+    try:
+        params = _parse_parameters_from_request()
+        result = _get_cached_data(
+            params,
+            client=request.remote_addr or "unknown",
+            ticker=ticker,
+            timeframe=timeframe,
+        )
+
+        version = current_app.extensions["result_version"]
+        if ticker != DATA_TICKER:
+            version = f"{current_app.extensions['panel_version']}-{ticker}"
+        if timeframe != timeframes.DEFAULT_TIMEFRAME:
+            version = f"{version}-{timeframe}"
+        etag = f"{version}:{pipeline.params_token(params)}"
+        mimetype = request.accept_mimetypes.best_match(
+            ["application/json", serialization.COLUMNS_MIMETYPE],
+            default="application/json",
+        )
+        binary = mimetype == serialization.COLUMNS_MIMETYPE
+        if binary:
+            etag += BINARY_ETAG_SUFFIX
+        if request.if_none_match.contains(etag):
+            response = Response(status=304)
+            response.set_etag(etag)
+            response.vary.add("Accept")
+            return response
+
+        if binary:
+            body = pipeline.encode_binary(result, name)
+        else:
+            body = result.payloads[name]
+            base = request.args.get("base", "")
+            base_version, _, base_token = base.removesuffix(
+                BINARY_ETAG_SUFFIX
+            ).rpartition(":")
+            base_params = pipeline.parse_params_token(base_token)
+            if base_version == version and base_params is not None:
+                fields = pipeline.changed_fields(base_params, params)
+                body = pipeline.encode_delta(result, name, fields, base)
+
+        response = Response(body, mimetype=mimetype)
+        response.set_etag(etag)
+        response.vary.add("Accept")
+        return response
+    except PoolSaturatedError:
+        raise
+    except Exception as e:
+        print(f"API Error: {e}")
+        return jsonify({"error": str(e)}), 500
+
+
+def _build_heatmap(
+    app: Flask, shared: Optional[SharedResultCache]
+) -> heatmap.HeatmapCube:
+    """Build (and persist) the parameter heatmap cube on a worker."""
+    print("Building parameter heatmap cube")
+    cube = heatmap.build_cube(
+        _load_data(
+            shared,
+            app.config["PRICE_SOURCE"],
+            app.extensions["result_version"],
+        ),
+        version=app.extensions["result_version"],
+    )
+    if app.config["HEATMAP_DIR"]:
+        cube.save(app.config["HEATMAP_DIR"])
+        cube = heatmap.HeatmapCube.load(
+            app.config["HEATMAP_DIR"], cube.version
+        )
+    app.extensions["heatmap"] = cube
+    return cube
+
+
+def _submit_heatmap_build(app: Flask, client: str) -> Future:
+    """Schedule the heatmap build on the compute pool (deduplicated)."""
+    pool: ComputePool = app.extensions["compute_pool"]
+    return pool.submit(
+        "heatmap",
+        client,
+        _build_heatmap,
+        app,
+        app.extensions.get("shared_cache"),
+    )
+
+
+def _heatmap_response() -> Any:
+    """
+    Serve a 2-D slice of the precomputed heatmap cube.
+
+    Query parameters ``x`` and ``y`` name the varying axes and ``metric``
+    the metric; the remaining axes are fixed at the request parameters.
+    The first request builds the cube on the compute pool.
+    """
+    try:
+        cube = current_app.extensions.get("heatmap")
+        if cube is None:
+            future = _submit_heatmap_build(
+                current_app._get_current_object(),
+                client=request.remote_addr or "unknown",
+            )
+            try:
+                cube = future.result(
+                    timeout=current_app.config["COMPUTE_TIMEOUT"]
+                )
+            except FutureTimeoutError:
+                raise PoolSaturatedError(
+                    "Heatmap is still being built, retry shortly.",
+                    current_app.extensions["compute_pool"].retry_after,
+                ) from None
+
+        params = _parse_parameters_from_request()
+        payload = cube.slice(
+            request.args.get("x", "short_window"),
+            request.args.get("y", "long_window"),
+            params,
+            metric=request.args.get("metric", "strategy_sharpe_ratio"),
+        )
+        return jsonify(payload)
+    except PoolSaturatedError:
+        raise
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        print(f"API Error: {e}")
+        return jsonify({"error": str(e)}), 500
+
+
+def _trades_response() -> Any:
+    """
+    Serve one page of the trade ledger for the request parameters.
+
+    Query parameters: the strategy parameters, ``ticker`` and
+    ``timeframe`` as for the chart endpoints, plus ``offset`` (default 0)
+    and ``limit`` (default 100, at most 1000). Statistics always cover
+    all trades.
+    """
+    ticker = request.args.get("ticker", DATA_TICKER)
+    if ticker not in current_app.config["PANEL_TICKERS"]:
+        return jsonify({"error": f"Unknown ticker: {ticker}"}), 400
+    timeframe = request.args.get("timeframe", timeframes.DEFAULT_TIMEFRAME)
+    if timeframe not in current_app.config["TIMEFRAMES"]:
+        return jsonify({"error": f"Unknown timeframe: {timeframe}"}), 400
+
+    try:
+        params = _parse_parameters_from_request()
+        result = _get_cached_data(
+            params,
+            client=request.remote_addr or "unknown",
+            ticker=ticker,
+            timeframe=timeframe,
+        )
+        payload = trades.serialize_trades(
+            pipeline.trade_ledger(result),
+            offset=request.args.get("offset", 0, type=int),
+            limit=min(request.args.get("limit", 100, type=int), 1000),
+        )
+        return jsonify(payload)
+    except PoolSaturatedError:
+        raise
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        print(f"API Error: {e}")
+        return jsonify({"error": str(e)}), 500
+
+
+def _build_regime_cube(
+    app: Flask,
+    shared: Optional[SharedResultCache],
+    short_window: int,
+    long_window: int,
+) -> regimes.RegimeCube:
+    """Build the sentiment-regime cube of one pair of MA windows once."""
+    version = app.extensions["result_version"]
+
+    def _build() -> regimes.RegimeCube:
+        return regimes.build_regime_cube(
+            _load_data(shared, app.config["PRICE_SOURCE"], version),
+            short_window,
+            long_window,
+            version=version,
+        )
+
+    return app.extensions["regime_cubes"].get_or_load(
+        _regime_key(version, short_window, long_window), _build
+    )
+
+
+def _regime_key(version: str, short_window: int, long_window: int) -> str:
+    return _scoped(version, f"{short_window}.{long_window}")
+
+
+def _regimes_response() -> Any:
+    """
+    Serve return, volatility and hit-rate statistics per sentiment regime.
+
+    Statistics are aggregated for every threshold pair at once, so one
+    cube per pair of moving-average windows (built on the compute pool on
+    first use) answers all threshold changes. The optional ``year``
+    query parameter restricts them to one calendar year.
+    """
+    try:
+        params = _parse_parameters_from_request()
+        raw_year = request.args.get("year", "")
+        year = int(raw_year) if raw_year else None
+        windows = (params["short_window"], params["long_window"])
+
+        app = current_app._get_current_object()
+        cube = app.extensions["regime_cubes"].get(
+            _regime_key(app.extensions["result_version"], *windows)
+        )
+        if cube is None:
+            pool: ComputePool = app.extensions["compute_pool"]
+            future = pool.submit(
+                f"regimes:{windows[0]}.{windows[1]}",
+                request.remote_addr or "unknown",
+                _build_regime_cube,
+                app,
+                app.extensions.get("shared_cache"),
+                *windows,
+            )
+            try:
+                cube = future.result(timeout=app.config["COMPUTE_TIMEOUT"])
+            except FutureTimeoutError:
+                raise PoolSaturatedError(
+                    "Regime statistics are still being computed, retry "
+                    "shortly.",
+                    pool.retry_after,
+                ) from None
+
+        return jsonify(
+            cube.summary(
+                params["extreme_fear_threshold"],
+                params["extreme_greed_threshold"],
+                year=year,
+            )
+        )
+    except PoolSaturatedError:
+        raise
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        print(f"API Error: {e}")
+        return jsonify({"error": str(e)}), 500
+
+
+_HUB_LOCK = threading.Lock()
+
+
+def _live_hub() -> live_feed.BarHub:
+    """Return the app's bar hub, creating and starting it on first use."""
+    app = current_app._get_current_object()
+    with _HUB_LOCK:
+        hub = app.extensions.get("live_hub")
+        if hub is None:
+            feed = app.config["LIVE_FEED"]
+            if feed is None:
+                base = _load_data(
+                    _shared_cache(),
+                    app.config["PRICE_SOURCE"],
+                    app.extensions["result_version"],
+                )
+                feed = live_feed.YFinanceFeed(
+                    DATA_TICKER,
+                    last_date=base.index[-1],
+                    fg_value=float(base["fg_value"].iloc[-1]),
+                )
+            hub = live_feed.BarHub(
+                feed,
+                poll_interval=app.config["LIVE_POLL_INTERVAL"],
+                max_bars=app.config["LIVE_MAX_BARS"],
+            )
+            app.extensions["live_hub"] = hub
+        hub.start()
+    return hub
+
+
+def _stream_response() -> Any:
+    """
+    Stream new bars as Server-Sent Events.
+
+    Every event is one chart point computed incrementally from the
+    cached result for the request parameters. Each open stream occupies
+    a request thread, so at most ``LIVE_MAX_STREAMS`` are served at once.
+    """
+    slots: threading.BoundedSemaphore = current_app.extensions[
+        "live_streams"
+    ]
+    if not slots.acquire(blocking=False):
+        raise PoolSaturatedError(
+            "Too many live streams, retry shortly.",
+            current_app.config["COMPUTE_RETRY_AFTER"],
+        )
+    try:
+        params = _parse_parameters_from_request()
+        result = _get_cached_data(
+            params, client=request.remote_addr or "unknown"
+        )
+        updater = live_feed.IncrementalStrategy(result.frame, params)
+        hub = _live_hub()
+    except PoolSaturatedError:
+        slots.release()
+        raise
+    except Exception as e:
+        slots.release()
+        print(f"API Error: {e}")
+        return jsonify({"error": str(e)}), 500
+
+    heartbeat = current_app.config["LIVE_HEARTBEAT"]
+
+    def _events():
+        yield "retry: 5000\n\n"
+        cursor = 0
+        while True:
+            bars, cursor, closed = hub.wait(cursor, timeout=heartbeat)
+            points = [updater.update(bar) for bar in bars]
+            points = [point for point in points if point is not None]
+            for point in points:
+                yield f"data: {json.dumps(point)}\n\n"
+            if closed and not bars:
+                yield "event: end\ndata: {}\n\n"
+                return
+            if not points:
+                yield ": keep-alive\n\n"
+
+    response = Response(
+        _events(),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+    response.call_on_close(slots.release)
+    return response
+
+
+def _results_store() -> Optional[ResultsStore]:
+    return current_app.extensions.get("results_store")
+
+
+def _runs_response() -> Any:
+    """
+    List recorded runs from the results store, best first.
+
+    Query parameters: ``ticker``, ``timeframe``, ``metric`` (default
+    Sharpe ratio), ``limit`` (default 20, at most 500),
+    ``min_pipeline_version`` and ``result_version``.
+    """
+    store = _results_store()
+    if store is None:
+        return jsonify({"error": "Results store is not configured."}), 404
+    try:
+        min_version = request.args.get("min_pipeline_version")
+        runs = store.top_runs(
+            metric=request.args.get("metric", "strategy_sharpe_ratio"),
+            limit=min(request.args.get("limit", 20, type=int), 500),
+            ticker=request.args.get("ticker"),
+            timeframe=request.args.get("timeframe"),
+            min_pipeline_version=(
+                int(min_version) if min_version is not None else None
+            ),
+            result_version=request.args.get("result_version"),
+        )
+        return jsonify({"runs": runs})
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        print(f"API Error: {e}")
+        return jsonify({"error": str(e)}), 500
+
+
+def _run_response(run_id: int) -> Any:
+    """Serve one recorded run with its equity curves from the store."""
+    store = _results_store()
+    if store is None:
+        return jsonify({"error": "Results store is not configured."}), 404
+    try:
+        run = store.get_run(run_id)
+    except Exception as e:
+        print(f"API Error: {e}")
+        return jsonify({"error": str(e)}), 500
+    if run is None:
+        return jsonify({"error": f"Unknown run: {run_id}"}), 404
+    return jsonify(run)
+
+
+def _record_run(
+    store: ResultsStore,
+    ticker: str,
+    params: Dict[str, int],
+    version: str,
+    timeframe: str,
+    result: PipelineResult,
+) -> None:
+    """Record a computed result in the results store; errors are logged."""
+    try:
+        frame = result.frame
+        signal, _explanation = strategy.latest_recommendation(frame)
+        store.record(
+            ticker=ticker,
+            start_date=data_loader.START_DATE,
+            end_date=data_loader.END_DATE,
+            params=params,
+            metrics=result.metrics,
+            dates=frame.index,
+            strategy_equity=frame["_strategy_equity"].to_numpy(float),
+            benchmark_equity=frame["_benchmark_equity"].to_numpy(float),
+            result_version=version,
+            latest_signal=signal,
+            timeframe=timeframe,
+        )
+    except Exception as e:
+        print(f"Results store error: {e}")
+
+
 def _parse_parameters_from_request() -> Dict[str, int]:
     """
     Read strategy parameters from the query string with safe defaults.
@@ -93,68 +739,408 @@ def _parse_parameters_from_request() -> Dict[str, int]:
     return params
 
 
-# Simple global cache to avoid refetching on every request
-_CACHE: Dict[str, Any] = {}
+# All in-memory caches are LRU-bounded and keyed by ``_scoped`` keys, so
+# results of another price source or data version are never mixed in.
 
+# Results by request key, resized to CACHE_MAX_ENTRIES by create_app
+_CACHE: LRUCache = LRUCache(DEFAULT_CONFIG["CACHE_MAX_ENTRIES"])
 
-def _get_cached_data(
-    params: Dict[str, int],
-) -> Tuple[pd.DataFrame, Dict[str, float]]:
-    """Fetch data from cache or load it if missing/stale."""
-    # Create a cache key based on parameters
-    key = str(sorted(params.items()))
+# Merged data with the parameter-independent stages applied, per ticker
+# and timeframe
+_DATA_CACHE: LRUCache = LRUCache(16)
 
-    if key in _CACHE:
-        print("Returning cached data for key:", key)
-        return _CACHE[key]
+# Panels shared by all non-default tickers: the downloaded prices, the
+# prepared data per timeframe and run panels by parameter cache key
+_PANEL_CACHE: LRUCache = LRUCache(64)
 
-    print("Loading new data for key:", key)
+# Cache accesses per key, used to pick the entries worth snapshotting
+_CACHE_HITS: LRUCache = LRUCache(4096)
+
+# Entries of the restored snapshot that have not been loaded yet
+_SNAPSHOT_INDEX: Dict[str, Path] = {}
+
+# Apps created in this process, re-armed in forked workers
+_APPS: "weakref.WeakSet[Flask]" = weakref.WeakSet()
+
+# Whether this process was forked from the one that created the apps
+_FORKED = False
+
+# Whether _reinit_after_fork is registered (by the first preload)
+_FORK_HOOK_REGISTERED = False
+
+DATA_TICKER = "BTC-USD"
+DATA_KEY = f"data:{DATA_TICKER}"
+PANEL_DATA_KEY = "panel:data"
+PANEL_PRICES_KEY = "panel:prices"
+
+# Appended to the ETag of binary payloads, which are full payloads in
+# another representation; their ETag still works as a delta ``base``.
+BINARY_ETAG_SUFFIX = ":bin"
+
+
+def _reinit_after_fork() -> None:
+    """
+    Give a forked worker its own locks and background threads.
+
+    Caches are inherited as they are. Threads are not: the live hub is
+    recreated on the next stream request and periodic snapshots restart
+    here. (The compute pools and cache locks reset themselves.)
+    """
+    global _FORKED, _HUB_LOCK
+    _FORKED = True
+    _HUB_LOCK = threading.Lock()
+    for app in list(_APPS):
+        app.extensions.pop("live_hub", None)
+        save = app.extensions.get("snapshot_save")
+        if save is not None and app.config["SNAPSHOT_INTERVAL"] > 0:
+            app.extensions["snapshot_stop"] = start_periodic_snapshots(
+                save, app.config["SNAPSHOT_INTERVAL"]
+            )
+
+
+def _register_fork_hook() -> None:
+    """
+    Run :func:`_reinit_after_fork` in forked children, once per process.
+
+    Only a preloading process forks workers with live apps; importing
+    the module or creating an app elsewhere registers nothing.
+    """
+    global _FORK_HOOK_REGISTERED
+    if _FORK_HOOK_REGISTERED or not hasattr(os, "register_at_fork"):
+        return
+    os.register_at_fork(after_in_child=_reinit_after_fork)
+    _FORK_HOOK_REGISTERED = True
+
+
+def _scoped(version: str, key: str) -> str:
+    """Prefix a cache key with the result (or panel) version."""
+    return f"{version}|{key}"
+
+
+def _shared_cache() -> Optional[SharedResultCache]:
+    return current_app.extensions.get("shared_cache")
+
+
+def _restore_from_snapshot(key: str) -> Optional[PipelineResult]:
+    """Memory-map a snapshot entry the first time its key is requested."""
+    entry_dir = _SNAPSHOT_INDEX.pop(key, None)
+    if entry_dir is None:
+        return None
+    try:
+        return SnapshotStore.load_entry(entry_dir)
+    except OSError as e:
+        print(f"Snapshot entry unavailable for key {key}: {e}")
+        return None
+
+
+def save_snapshot(store: SnapshotStore, max_entries: int) -> Path:
+    """
+    Write the most used cache entries and the loaded data to ``store``.
 
-    project_root = Path(__file__).resolve().parents[1]
-    fg_csv = data_loader.get_default_data_paths(project_root)
+    Only entries of the store's version are saved.
+    """
+    prefix = _scoped(store.version, "")
+    results: Dict[str, PipelineResult] = {
+        key: result
+        for key, result in _CACHE.items()
+        if key.startswith(prefix)
+    }
+    hits = dict(_CACHE_HITS)
+    base = _DATA_CACHE.get(_scoped(store.version, DATA_TICKER))
+    data_key = _scoped(store.version, DATA_KEY)
+    if base is not None:
+        results[data_key] = PipelineResult(frame=base)
+        hits[data_key] = max(hits.values(), default=0) + 1
+
+    # Carry over restored entries nobody asked for yet; saving prunes
+    # the snapshot they currently live in.
+    pending = dict(_SNAPSHOT_INDEX)
+    for key, entry_dir in pending.items():
+        if key not in results:
+            try:
+                results[key] = SnapshotStore.load_entry(entry_dir)
+            except OSError:
+                continue
+
+    snapshot_dir = store.save(results, hits, max_entries=max_entries + 1)
+    for key, entry_dir in store.load_index().items():
+        if key in pending and key in _SNAPSHOT_INDEX:
+            _SNAPSHOT_INDEX[key] = entry_dir
+    return snapshot_dir
+
+
+def _load_data(
+    shared: Optional[SharedResultCache],
+    source: Optional[Any],
+    version: str,
+    timeframe: str = timeframes.DEFAULT_TIMEFRAME,
+) -> pd.DataFrame:
+    """
+    Load merged data and run the parameter-independent stages.
+
+    This happens once per process and ``version``, or once per host with
+    a shared cache; concurrent first requests wait for a single load.
+    ``source`` is the configured ``PRICE_SOURCE`` (None = yfinance) and
+    ``version`` the app's result version, which names it. Other
+    timeframes are resampled from the cached daily data, once per
+    timeframe.
+    """
+    if timeframe != timeframes.DEFAULT_TIMEFRAME:
+        return _load_resampled_data(shared, source, version, timeframe)
+
+    data_key = _scoped(version, DATA_KEY)
+
+    def _load() -> pd.DataFrame:
+        restored = _restore_from_snapshot(data_key)
+        if restored is not None:
+            return restored.frame
+        if shared is not None:
+            return shared.get_or_compute(
+                data_key,
+                lambda: PipelineResult(
+                    frame=pipeline.prepare_base(
+                        pipeline.load_merged_data(DATA_TICKER, source=source)
+                    )
+                ),
+            ).frame
+        return pipeline.prepare_base(
+            pipeline.load_merged_data(DATA_TICKER, source=source)
+        )
+
+    return _DATA_CACHE.get_or_load(_scoped(version, DATA_TICKER), _load)
 
-    # Load data (this might take time due to yfinance)
+
+def _load_resampled_data(
+    shared: Optional[SharedResultCache],
+    source: Optional[Any],
+    version: str,
+    timeframe: str,
+) -> pd.DataFrame:
+    """Resample the daily data to ``timeframe`` and prepare it once."""
+
+    def _prepare() -> PipelineResult:
+        daily = _load_data(shared, source, version)
+        merged = timeframes.resample_merged(daily, timeframe)
+        return PipelineResult(frame=pipeline.prepare_base(merged))
+
+    def _load() -> pd.DataFrame:
+        if shared is not None:
+            return shared.get_or_compute(
+                _scoped(version, f"{DATA_KEY}:{timeframe}"), _prepare
+            ).frame
+        return _prepare().frame
+
+    return _DATA_CACHE.get_or_load(
+        _scoped(version, f"{DATA_TICKER}:{timeframe}"), _load
+    )
+
+
+def _compute_and_cache(
+    key: str,
+    params: Dict[str, int],
+    shared: Optional[SharedResultCache],
+    version: str,
+    compact: bool = False,
+    record: Optional[Callable[[PipelineResult], None]] = None,
+    source: Optional[Any] = None,
+    timeframe: str = timeframes.DEFAULT_TIMEFRAME,
+) -> PipelineResult:
+    """Run the pipeline on a worker thread and store the result."""
+    print("Loading new data for key:", key)
+    periods = timeframes.get_timeframe(timeframe).periods_per_year
     try:
-        _price_df, _fg_df, merged = data_loader.load_all_data(fg_csv)
+        if shared is not None:
+            result = shared.get_or_compute(
+                key,
+                lambda: pipeline.build_result(
+                    _load_data(shared, source, version, timeframe),
+                    params,
+                    compact=compact,
+                    periods_per_year=periods,
+                ),
+            )
+        else:
+            result = pipeline.build_result(
+                _load_data(None, source, version, timeframe),
+                params,
+                compact=compact,
+                periods_per_year=periods,
+            )
     except Exception as e:
         print(f"Error loading data: {e}")
         raise
+    _CACHE[key] = result
+    if record is not None:
+        record(result)
+    return result
 
-    enriched = indicators.add_moving_averages(
-        merged,
-        short_window=params["short_window"],
-        long_window=params["long_window"],
-    )
-    enriched = indicators.add_bollinger_bands(enriched)
-    enriched = indicators.add_kalman_trend(enriched)
-    enriched = sentiment.add_sentiment_regime(
-        enriched,
-        extreme_fear_threshold=params["extreme_fear_threshold"],
-        extreme_greed_threshold=params["extreme_greed_threshold"],
-    )
-    enriched = strategy.generate_positions(enriched)
-    enriched = strategy.generate_trade_signals(enriched)
 
-    backtest_df, metrics = backtesting.run_backtest(enriched)
-    enriched["_strategy_equity"] = backtest_df["strategy_equity"]
-    enriched["_benchmark_equity"] = backtest_df["benchmark_equity"]
+def _get_panel(
+    params: Dict[str, int],
+    tickers: Sequence[str],
+    source: Optional[Any],
+    version: str,
+    timeframe: str = timeframes.DEFAULT_TIMEFRAME,
+) -> panel.Panel:
+    """
+    Return the run panel for ``params``, computing it once per process.
+
+    The price panel of all ``tickers`` is downloaded in one batch on
+    first use and resampled and prepared once per timeframe; every
+    parameter set then costs one vectorized pass over all assets. Each
+    of these steps runs once per key (``version`` is the panel version)
+    even for concurrent requests.
+    """
+    key = pipeline.cache_key(params)
+    data_key = PANEL_DATA_KEY
+    if timeframe != timeframes.DEFAULT_TIMEFRAME:
+        key = f"{timeframe}:{key}"
+        data_key = f"{PANEL_DATA_KEY}:{timeframe}"
+
+    def _load_prices() -> panel.Panel:
+        # The downloaded closes, kept for resampling.
+        closes, sentiment_frame = panel.load_panel_data(
+            tickers, source=source
+        )
+        return panel.Panel(sentiment=sentiment_frame, fields={"close": closes})
+
+    def _prepare() -> panel.Panel:
+        loaded = _PANEL_CACHE.get_or_load(
+            _scoped(version, PANEL_PRICES_KEY), _load_prices
+        )
+        return panel.prepare_panel(
+            *timeframes.resample_panel(
+                loaded.fields["close"], loaded.sentiment, timeframe
+            )
+        )
+
+    def _run() -> panel.Panel:
+        base = _PANEL_CACHE.get_or_load(_scoped(version, data_key), _prepare)
+        return panel.run_panel(
+            base,
+            params,
+            timeframes.get_timeframe(timeframe).periods_per_year,
+        )
 
-    # Update cache
-    _CACHE[key] = (enriched, metrics)
-    return enriched, metrics
+    return _PANEL_CACHE.get_or_load(_scoped(version, key), _run)
+
+
+def _compute_asset_and_cache(
+    key: str,
+    params: Dict[str, int],
+    ticker: str,
+    tickers: Sequence[str],
+    compact: bool = False,
+    record: Optional[Callable[[PipelineResult], None]] = None,
+    source: Optional[Any] = None,
+    timeframe: str = timeframes.DEFAULT_TIMEFRAME,
+    version: str = "",
+) -> PipelineResult:
+    """Extract one asset of the shared panel result on a worker thread."""
+    print("Loading panel data for key:", key)
+    try:
+        result = panel.asset_result(
+            _get_panel(params, tickers, source, version, timeframe),
+            ticker,
+            compact=compact,
+        )
+    except Exception as e:
+        print(f"Error loading data: {e}")
+        raise
+    _CACHE[key] = result
+    if record is not None:
+        record(result)
+    return result
 
 
-def _run_pipeline_from_request():
+def _get_cached_data(
+    params: Dict[str, int],
+    client: str = "local",
+    ticker: str = DATA_TICKER,
+    timeframe: str = timeframes.DEFAULT_TIMEFRAME,
+) -> PipelineResult:
     """
-    Run the data and strategy pipeline based on user parameters.
+    Fetch data from cache or compute it on the bounded worker pool.
 
-    Returns
-    -------
-    tuple[pd.DataFrame, dict[str, float]]
-        Enriched data frame and backtest metrics dictionary.
+    Cache hits and entries of a restored snapshot are answered on the
+    calling thread. Misses are handed to
+    the app's compute pool and awaited for at most ``COMPUTE_TIMEOUT``
+    seconds; with a shared cache configured, the worker first looks for
+    a result computed by another process. Tickers other than
+    ``DATA_TICKER`` are served from the panel of all ``PANEL_TICKERS``,
+    and other timeframes from data resampled once per timeframe.
+
+    Raises
+    ------
+    PoolSaturatedError
+        If the pool rejects the computation or it does not finish in time.
     """
-    params = _parse_parameters_from_request()
-    return _get_cached_data(params)
+    version = current_app.extensions["result_version"]
+    if ticker != DATA_TICKER:
+        version = current_app.extensions["panel_version"]
+    key = pipeline.cache_key(params)
+    if timeframe != timeframes.DEFAULT_TIMEFRAME:
+        key = f"{timeframe}:{key}"
+    if ticker != DATA_TICKER:
+        key = f"{ticker}:{key}"
+    key = _scoped(version, key)
+    _CACHE_HITS[key] = _CACHE_HITS.get(key, 0) + 1
+
+    cached = _CACHE.get(key)
+    if cached is not None:
+        print("Returning cached data for key:", key)
+        return cached
+
+    cached = _restore_from_snapshot(key)
+    if cached is not None:
+        print("Restored snapshot data for key:", key)
+        _CACHE[key] = cached
+        return cached
+
+    record = None
+    store = _results_store()
+    if store is not None:
+        record = functools.partial(
+            _record_run, store, ticker, params, version, timeframe
+        )
+
+    pool: ComputePool = current_app.extensions["compute_pool"]
+    if ticker == DATA_TICKER:
+        future = pool.submit(
+            key,
+            client,
+            _compute_and_cache,
+            key,
+            params,
+            _shared_cache(),
+            version,
+            current_app.config["COMPACT_CACHE"],
+            record,
+            current_app.config["PRICE_SOURCE"],
+            timeframe,
+        )
+    else:
+        future = pool.submit(
+            key,
+            client,
+            _compute_asset_and_cache,
+            key,
+            params,
+            ticker,
+            current_app.config["PANEL_TICKERS"],
+            current_app.config["COMPACT_CACHE"],
+            record,
+            current_app.config["PRICE_SOURCE"],
+            timeframe,
+            version,
+        )
+    try:
+        return future.result(timeout=current_app.config["COMPUTE_TIMEOUT"])
+    except FutureTimeoutError:
+        raise PoolSaturatedError(
+            "Computation is still running, retry shortly.",
+            pool.retry_after,
+        ) from None
 
 
 if __name__ == "__main__":
@@ -2,16 +2,22 @@
 
 from __future__ import annotations
 
+import hashlib
+import zlib
 from pathlib import Path
-from typing import Tuple
+from typing import Any, Optional, Sequence, Tuple
 
+import numpy as np
 import pandas as pd
-import yfinance as yf
 
+from .alignment import AlternativeSeries, AsOfAligner
 
 START_DATE = "2020-01-01"
 END_DATE = "2024-12-31"
 
+# Price columns kept from the downloads, renamed to lower case.
+OHLCV_COLUMNS = ("open", "high", "low", "close", "volume")
+
 
 def download_bitcoin_history(
     ticker: str = "BTC-USD",
@@ -33,8 +39,12 @@ def download_bitcoin_history(
     Returns
     -------
     pd.DataFrame
-        Data frame with at least the columns 'Date' and 'Close'.
+        Data frame with the columns 'Date' and ``OHLCV_COLUMNS``.
     """
+    # Imported on first download: yfinance and its dependencies are slow
+    # to import and not needed to serve cached or offline data.
+    import yfinance as yf
+
     data = yf.download(
         ticker,
         start=start_date,
@@ -53,11 +63,65 @@ def download_bitcoin_history(
     if isinstance(data.columns, pd.MultiIndex):
         data.columns = data.columns.get_level_values(0)
 
-    data = data[["Date", "Close"]].rename(columns={"Close": "close"})
+    renamed = {column.title(): column for column in OHLCV_COLUMNS}
+    data = data[["Date", *renamed]].rename(columns=renamed)
     data["Date"] = pd.to_datetime(data["Date"])
     return data
 
 
+def download_price_panel(
+    tickers: Sequence[str],
+    start_date: str = START_DATE,
+    end_date: str = END_DATE,
+) -> pd.DataFrame:
+    """
+    Download closing prices of several tickers in one yfinance request.
+
+    Parameters
+    ----------
+    tickers:
+        Yahoo Finance ticker symbols.
+    start_date:
+        Start date for the download in ISO format (YYYY-MM-DD).
+    end_date:
+        End date for the download in ISO format (YYYY-MM-DD).
+
+    Returns
+    -------
+    pd.DataFrame
+        Close prices indexed by date with one column per ticker (NaN
+        before a ticker was listed).
+    """
+    import yfinance as yf
+
+    tickers = list(tickers)
+    data = yf.download(
+        tickers,
+        start=start_date,
+        end=end_date,
+        progress=False,
+        auto_adjust=False,
+        group_by="column",
+    )
+
+    if data.empty:
+        raise ValueError("No price data downloaded from yfinance.")
+
+    closes = data["Close"]
+    if isinstance(closes, pd.Series):
+        closes = closes.to_frame(tickers[0])
+
+    missing = [ticker for ticker in tickers if ticker not in closes.columns]
+    if missing:
+        raise ValueError(f"No price data downloaded for: {missing}")
+
+    closes = closes[tickers].sort_index()
+    closes.index = pd.to_datetime(closes.index)
+    closes.index.name = "date"
+    closes.columns.name = None
+    return closes
+
+
 def load_fear_greed_index(
     csv_path: str | Path,
     start_date: str = START_DATE,
@@ -121,44 +185,61 @@ def load_fear_greed_index(
 def merge_price_and_sentiment(
     price_df: pd.DataFrame,
     sentiment_df: pd.DataFrame,
+    start_date: str = START_DATE,
+    end_date: str = END_DATE,
+    extra_series: Sequence[AlternativeSeries] = (),
 ) -> pd.DataFrame:
     """
     Merge Bitcoin prices and Fear & Greed sentiment into one data frame.
 
+    Sentiment and any ``extra_series`` are aligned as of each price date
+    (see ``alignment.AsOfAligner``): every bar carries the latest
+    'fg_value' and 'fg_classification' published on or before it.
+
     Parameters
     ----------
     price_df:
-        Data frame containing 'Date' and 'close' columns.
+        Data frame containing 'Date' and 'close' columns, and optionally
+        the other ``OHLCV_COLUMNS``, which are kept.
     sentiment_df:
         Data frame containing 'date' and 'fg_value' columns.
+    start_date:
+        First date kept in ISO format (YYYY-MM-DD).
+    end_date:
+        Last date kept in ISO format (YYYY-MM-DD).
+    extra_series:
+        Further data aligned onto the price dates, such as funding rates
+        loaded with ``alignment.load_alternative_csv``.
 
     Returns
     -------
     pd.DataFrame
         Combined data frame indexed by date with price and sentiment.
     """
-    price = price_df.copy()
-    price = price.rename(columns={"Date": "date"})
-    price["date"] = pd.to_datetime(price["date"])
-    price = price.sort_values("date").reset_index(drop=True)
-
-    sentiment = sentiment_df.copy()
-    sentiment["date"] = pd.to_datetime(sentiment["date"])
-    sentiment = sentiment.sort_values("date").reset_index(drop=True)
+    date_col = "Date" if "Date" in price_df.columns else "date"
+    dates = pd.DatetimeIndex(price_df[date_col], name="date")
+    price = price_df.drop(columns=date_col).set_axis(dates, axis=0)
+    if not dates.is_monotonic_increasing:
+        price = price.sort_index(kind="stable")
+    price = price.loc[
+        (price.index >= pd.to_datetime(start_date))
+        & (price.index <= pd.to_datetime(end_date))
+    ]
 
-    # Merge on the explicit date column to avoid MultiIndex join errors.
-    merged = price.merge(
-        sentiment[["date", "fg_value", "fg_classification"]],
-        on="date",
-        how="left",
+    sentiment_dates = pd.DatetimeIndex(sentiment_df["date"], name="date")
+    sentiment = AlternativeSeries(
+        name="fear_greed",
+        frame=sentiment_df.set_axis(sentiment_dates, axis=0),
+        columns=[
+            column
+            for column in ("fg_value", "fg_classification")
+            if column in sentiment_df.columns
+        ],
     )
-    merged = merged.set_index("date").sort_index()
-    merged["fg_value"] = merged["fg_value"].ffill()
-
-    merged = merged.loc[
-        (merged.index >= pd.to_datetime(START_DATE))
-        & (merged.index <= pd.to_datetime(END_DATE))
-    ]
+    aligned = AsOfAligner(price.index).align_all(
+        [sentiment, *extra_series]
+    )
+    merged = pd.concat([price, aligned], axis=1)
 
     merged["return"] = merged["close"].pct_change()
     merged = merged.dropna(subset=["return"])
@@ -168,6 +249,8 @@ def merge_price_and_sentiment(
 def load_all_data(
     fear_greed_csv: str | Path,
     ticker: str = "BTC-USD",
+    source: Optional[Any] = None,
+    extra_series: Sequence[AlternativeSeries] = (),
 ) -> Tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]:
     """
     Load and merge Bitcoin price data with Fear & Greed sentiment.
@@ -178,18 +261,129 @@ def load_all_data(
         Path to the Fear & Greed CSV file.
     ticker:
         Yahoo Finance ticker symbol for Bitcoin.
+    source:
+        Price source with a ``download_bitcoin_history`` method, such as
+        :class:`SyntheticPriceSource`; None downloads from yfinance.
+    extra_series:
+        Alternative data aligned onto the price dates.
 
     Returns
     -------
     tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]
         Tuple with (price_df, sentiment_df, merged_df).
     """
-    price_df = download_bitcoin_history(ticker=ticker)
+    download = (
+        download_bitcoin_history
+        if source is None
+        else source.download_bitcoin_history
+    )
+    price_df = download(ticker=ticker)
     sentiment_df = load_fear_greed_index(csv_path=fear_greed_csv)
-    merged_df = merge_price_and_sentiment(price_df, sentiment_df)
+    merged_df = merge_price_and_sentiment(
+        price_df, sentiment_df, extra_series=extra_series
+    )
     return price_df, sentiment_df, merged_df
 
 
+class SyntheticPriceSource:
+    """
+    Deterministic offline replacement for the yfinance downloads.
+
+    Daily closes are a log-normal random walk seeded by ``seed`` and the
+    ticker, generated from a fixed origin so that any date range of the
+    same ticker yields the same prices. Each bar opens at the previous
+    close, with random wicks and volume. Used for tests and load tests.
+
+    Parameters
+    ----------
+    seed:
+        Base seed of the random walks.
+    volatility:
+        Standard deviation of the daily log returns.
+    """
+
+    ORIGIN = "2015-01-01"
+
+    def __init__(self, seed: int = 0, volatility: float = 0.03) -> None:
+        self.seed = seed
+        self.volatility = volatility
+        self.version = f"synthetic{seed}"
+
+    def _bars(
+        self, ticker: str, start_date: str, end_date: str
+    ) -> pd.DataFrame:
+        # Like yfinance, the end date is exclusive.
+        dates = pd.date_range(
+            self.ORIGIN, end_date, freq="D", inclusive="left", name="Date"
+        )
+        ticker_seed = zlib.crc32(ticker.encode("utf-8"))
+        rng = np.random.default_rng([self.seed, ticker_seed])
+        log_returns = rng.normal(0.0005, self.volatility, len(dates))
+        start_price = 10.0 * (1 + ticker_seed % 1000)
+        close = start_price * np.exp(np.cumsum(log_returns))
+        open_ = np.concatenate([[start_price], close[:-1]])
+        wicks = np.abs(rng.normal(0.0, self.volatility / 2, (2, len(dates))))
+        bars = pd.DataFrame(
+            {
+                "open": open_,
+                "high": np.maximum(open_, close) * (1 + wicks[0]),
+                "low": np.minimum(open_, close) * (1 - wicks[1]),
+                "close": close,
+                "volume": rng.lognormal(15.0, 0.5, len(dates)).round(),
+            },
+            index=dates,
+        )
+        return bars.loc[start_date:]
+
+    def download_bitcoin_history(
+        self,
+        ticker: str = "BTC-USD",
+        start_date: str = START_DATE,
+        end_date: str = END_DATE,
+    ) -> pd.DataFrame:
+        """Same output as the module-level ``download_bitcoin_history``."""
+        return self._bars(ticker, start_date, end_date).reset_index()
+
+    def download_price_panel(
+        self,
+        tickers: Sequence[str],
+        start_date: str = START_DATE,
+        end_date: str = END_DATE,
+    ) -> pd.DataFrame:
+        """Same output as the module-level ``download_price_panel``."""
+        closes = pd.DataFrame(
+            {
+                ticker: self._bars(ticker, start_date, end_date)["close"]
+                for ticker in tickers
+            }
+        )
+        closes.index.name = "date"
+        return closes
+
+
+def data_version(
+    fear_greed_csv: str | Path,
+    ticker: str = "BTC-USD",
+    start_date: str = START_DATE,
+    end_date: str = END_DATE,
+) -> str:
+    """
+    Return a short fingerprint of the inputs behind ``load_all_data``.
+
+    The fingerprint covers the Fear & Greed CSV contents, the ticker and
+    the date range, so it changes whenever the merged data could change.
+
+    Returns
+    -------
+    str
+        Hexadecimal digest.
+    """
+    digest = hashlib.sha1()
+    digest.update(Path(fear_greed_csv).read_bytes())
+    digest.update(f"|{ticker}|{start_date}|{end_date}".encode("utf-8"))
+    return digest.hexdigest()[:16]
+
+
 def get_default_data_paths(base_dir: str | Path) -> Path:
     """
     Return the default path for the Fear & Greed CSV inside the data folder.
@@ -0,0 +1,124 @@
+"""Column-per-file storage of data frames that can be memory-mapped."""
+
+from __future__ import annotations
+
+import json
+import os
+import shutil
+import uuid
+from pathlib import Path
+from typing import Any, Dict
+
+import numpy as np
+import pandas as pd
+
+
+META_FILE = "meta.json"
+
+
+def _is_numeric(series: pd.Series) -> bool:
+    return pd.api.types.is_numeric_dtype(series.dtype) and not isinstance(
+        series.dtype, pd.CategoricalDtype
+    )
+
+
+def write_frame(directory: str | Path, data: pd.DataFrame) -> None:
+    """
+    Write a date-indexed data frame as one ``.npy`` file per column.
+
+    Numeric columns are stored as-is, all other columns as integer codes
+    plus a list of categories in the metadata file.
+
+    Parameters
+    ----------
+    directory:
+        Target directory; created if missing.
+    data:
+        Data frame with a ``DatetimeIndex``.
+    """
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+
+    index = pd.DatetimeIndex(data.index)
+    np.save(directory / "index.npy", index.asi8)
+
+    columns = []
+    for position, name in enumerate(data.columns):
+        series = data[name]
+        file_name = f"col{position}.npy"
+        entry: Dict[str, Any] = {
+            "name": name,
+            "file": file_name,
+            "dtype": str(series.dtype),
+        }
+        if _is_numeric(series):
+            np.save(directory / file_name, series.to_numpy())
+        else:
+            categorical = pd.Categorical(series)
+            np.save(directory / file_name, categorical.codes)
+            entry["categories"] = [str(c) for c in categorical.categories]
+        columns.append(entry)
+
+    meta = {
+        "index_name": index.name,
+        "index_unit": str(index.dtype),
+        "columns": columns,
+    }
+    (directory / META_FILE).write_text(json.dumps(meta), encoding="utf-8")
+
+
+def read_frame(directory: str | Path, mmap: bool = True) -> pd.DataFrame:
+    """
+    Read a data frame written by :func:`write_frame`.
+
+    With ``mmap=True`` numeric columns are read-only views on the files,
+    so processes reading the same entry share the pages.
+    """
+    directory = Path(directory)
+    meta = json.loads((directory / META_FILE).read_text(encoding="utf-8"))
+    mmap_mode = "r" if mmap else None
+
+    index_values = np.load(directory / "index.npy")
+    index = pd.DatetimeIndex(
+        index_values.view(meta["index_unit"]), name=meta["index_name"]
+    )
+
+    columns: Dict[str, Any] = {}
+    for entry in meta["columns"]:
+        values = np.load(directory / entry["file"], mmap_mode=mmap_mode)
+        if "categories" in entry:
+            categorical = pd.Categorical.from_codes(
+                np.asarray(values), categories=entry["categories"]
+            )
+            if entry["dtype"] == "category":
+                columns[entry["name"]] = categorical
+            else:
+                columns[entry["name"]] = np.asarray(categorical, dtype=object)
+        else:
+            columns[entry["name"]] = values.view(np.ndarray)
+
+    return pd.DataFrame(columns, index=index, copy=False)
+
+
+def write_atomically(directory: str | Path, writer) -> bool:
+    """
+    Run ``writer(tmp_dir)`` and move the result to ``directory``.
+
+    Returns False if another writer published ``directory`` first.
+    """
+    directory = Path(directory)
+    directory.parent.mkdir(parents=True, exist_ok=True)
+    tmp_dir = directory.with_name(
+        f".{directory.name}.{os.getpid()}.{uuid.uuid4().hex}"
+    )
+    try:
+        writer(tmp_dir)
+        os.rename(tmp_dir, directory)
+    except OSError:
+        if directory.exists():
+            return False
+        raise
+    finally:
+        if tmp_dir.exists():
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+    return True
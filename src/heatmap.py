@@ -0,0 +1,256 @@
+"""Precomputed backtest metrics over the whole strategy parameter grid."""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from . import (
+    backtesting,
+    frame_store,
+    indicators,
+    pipeline,
+    sentiment,
+    strategy,
+)
+
+
+def _grid_axis(name: str, start: int, stop: int, step: int) -> np.ndarray:
+    # Sampled range plus the default value, so that the default
+    # parameters always fall on a grid cell.
+    return np.union1d(
+        np.arange(start, stop, step), [pipeline.DEFAULT_PARAMETERS[name]]
+    )
+
+
+# Grid covered by the dashboard inputs, sampled at a coarser step.
+GRID_AXES: Dict[str, np.ndarray] = {
+    "short_window": _grid_axis("short_window", 2, 21, 2),
+    "long_window": _grid_axis("long_window", 10, 201, 10),
+    "extreme_fear_threshold": _grid_axis("extreme_fear_threshold", 0, 51, 5),
+    "extreme_greed_threshold": _grid_axis(
+        "extreme_greed_threshold", 50, 101, 5
+    ),
+}
+
+METRICS = (
+    "strategy_sharpe_ratio",
+    "strategy_cumulative_return",
+    "strategy_max_drawdown",
+    "strategy_hit_rate",
+)
+
+
+class HeatmapCube:
+    """
+    Float32 array of metrics for every cell of a parameter grid.
+
+    ``values`` has one axis per entry of ``axes`` (in order) followed by
+    one axis over ``METRICS``.
+    """
+
+    def __init__(
+        self,
+        values: np.ndarray,
+        axes: Dict[str, np.ndarray],
+        version: str = "",
+    ) -> None:
+        self.values = values
+        self.axes = axes
+        self.version = version
+
+    def nearest_index(self, name: str, value: float) -> int:
+        """Return the grid index closest to ``value`` on axis ``name``."""
+        return int(np.abs(self.axes[name] - value).argmin())
+
+    def slice(
+        self,
+        x_axis: str,
+        y_axis: str,
+        fixed: Dict[str, float],
+        metric: str = "strategy_sharpe_ratio",
+    ) -> Dict[str, Any]:
+        """
+        Return a 2-D slice with the other axes fixed at the nearest cells.
+
+        Parameters
+        ----------
+        x_axis, y_axis:
+            Names of the two varying axes.
+        fixed:
+            Parameter values; used for the axes not being sliced and to
+            mark the currently selected cell.
+        metric:
+            One of ``METRICS``.
+
+        Returns
+        -------
+        dict
+            JSON-ready slice with rows along ``y_axis``. 'off_grid' lists
+            the parameters whose value is not on the grid, for which the
+            nearest cell is used instead.
+        """
+        if x_axis == y_axis or x_axis not in self.axes or (
+            y_axis not in self.axes
+        ):
+            raise ValueError("x and y must be two different grid axes.")
+        if metric not in METRICS:
+            raise ValueError(f"Unknown metric: {metric}")
+
+        names = list(self.axes)
+        selector: List[Any] = []
+        for name in names:
+            if name in (x_axis, y_axis):
+                selector.append(slice(None))
+            else:
+                selector.append(self.nearest_index(name, fixed[name]))
+        selector.append(METRICS.index(metric))
+
+        plane = self.values[tuple(selector)]
+        if names.index(x_axis) < names.index(y_axis):
+            plane = plane.T
+
+        values = np.where(np.isfinite(plane), np.round(plane, 4), np.nan)
+        return {
+            "x_axis": x_axis,
+            "y_axis": y_axis,
+            "metric": metric,
+            "x_values": self.axes[x_axis].tolist(),
+            "y_values": self.axes[y_axis].tolist(),
+            "values": [
+                [None if np.isnan(v) else float(v) for v in row]
+                for row in values
+            ],
+            "selected": {
+                "x": self.nearest_index(x_axis, fixed[x_axis]),
+                "y": self.nearest_index(y_axis, fixed[y_axis]),
+            },
+            "off_grid": [
+                name
+                for name in names
+                if not np.any(self.axes[name] == fixed[name])
+            ],
+        }
+
+    def save(self, directory: str | Path) -> Path:
+        """Write the cube as ``heatmap-<version>.npy`` plus its axes."""
+        directory = Path(directory)
+        target = directory / f"heatmap-{self.version}"
+
+        def _write(tmp_dir: Path) -> None:
+            tmp_dir.mkdir(parents=True)
+            np.save(tmp_dir / "values.npy", self.values)
+            axes = {name: axis.tolist() for name, axis in self.axes.items()}
+            (tmp_dir / "axes.json").write_text(
+                json.dumps(axes), encoding="utf-8"
+            )
+
+        frame_store.write_atomically(target, _write)
+        return target
+
+    @classmethod
+    def load(
+        cls,
+        directory: str | Path,
+        version: str,
+        axes: Optional[Dict[str, np.ndarray]] = None,
+    ) -> Optional["HeatmapCube"]:
+        """
+        Memory-map a saved cube of ``version``; None if there is none.
+
+        With ``axes``, a cube saved on a different grid is ignored too.
+        """
+        target = Path(directory) / f"heatmap-{version}"
+        if not (target / "axes.json").exists():
+            return None
+        saved = json.loads((target / "axes.json").read_text(encoding="utf-8"))
+        if axes is not None and saved != {
+            name: axis.tolist() for name, axis in axes.items()
+        }:
+            return None
+        return cls(
+            values=np.load(target / "values.npy", mmap_mode="r"),
+            axes={name: np.asarray(v) for name, v in saved.items()},
+            version=version,
+        )
+
+
+def build_cube(
+    base: pd.DataFrame,
+    axes: Optional[Dict[str, np.ndarray]] = None,
+    version: str = "",
+) -> HeatmapCube:
+    """
+    Backtest every cell of the parameter grid in vectorized passes.
+
+    For each pair of moving-average windows, the positions for all
+    fear/greed threshold pairs are computed at once with
+    ``strategy.hysteresis_positions`` and scored with
+    ``backtesting.vectorized_metrics``.
+
+    Parameters
+    ----------
+    base:
+        Output of ``pipeline.prepare_base`` (needs 'close', 'return',
+        'fg_value' and 'kalman_trend').
+    axes:
+        Grid axes; defaults to ``GRID_AXES``.
+    version:
+        Version tag stored with the cube.
+
+    Returns
+    -------
+    HeatmapCube
+        Cube of shape (short, long, fear, greed, metric).
+    """
+    axes = GRID_AXES if axes is None else axes
+    shorts = axes["short_window"]
+    longs = axes["long_window"]
+    fears = axes["extreme_fear_threshold"]
+    greeds = axes["extreme_greed_threshold"]
+
+    close = base["close"]
+    returns = base["return"].to_numpy(dtype=float)
+    fg_values = base["fg_value"].to_numpy(dtype=float)
+    trend_up = base["kalman_trend"].to_numpy(dtype=float) > 0
+
+    # Regime masks for every threshold pair: (fear, greed, time).
+    fear_mask = sentiment.extreme_fear_mask(
+        fg_values, fears[:, None, None]
+    )
+    greed_mask = sentiment.extreme_greed_mask(
+        fg_values, fears[:, None, None], greeds[None, :, None]
+    )
+
+    smas = {
+        window: indicators.calculate_sma(close, int(window)).to_numpy()
+        for window in np.union1d(shorts, longs)
+    }
+
+    values = np.full(
+        (len(shorts), len(longs), len(fears), len(greeds), len(METRICS)),
+        np.nan,
+        dtype=np.float32,
+    )
+    for i, short in enumerate(shorts):
+        for j, long in enumerate(longs):
+            short_ma, long_ma = smas[short], smas[long]
+            enter = (short_ma > long_ma) & trend_up & ~greed_mask
+            exit = (short_ma < long_ma) | fear_mask
+            positions = strategy.hysteresis_positions(enter, exit)
+
+            lagged = np.zeros_like(positions)
+            lagged[..., 1:] = positions[..., :-1]
+            metrics = backtesting.vectorized_metrics(lagged, returns)
+            for k, name in enumerate(METRICS):
+                values[i, j, ..., k] = metrics[name]
+
+    return HeatmapCube(
+        values=values,
+        axes={name: np.asarray(v) for name, v in axes.items()},
+        version=version,
+    )
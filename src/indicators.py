@@ -5,6 +5,12 @@ from __future__ import annotations
 import numpy as np
 import pandas as pd
 
+from . import kernels
+
+KALMAN_PROCESS_VARIANCE = 1e-5
+KALMAN_MEASUREMENT_VARIANCE = 1e-2
+KALMAN_INITIAL_VARIANCE = 1.0
+
 
 def calculate_sma(series: pd.Series, window: int) -> pd.Series:
     """
@@ -62,40 +68,71 @@ def add_bollinger_bands(
 
 def estimate_kalman_trend(
     series: pd.Series,
-    process_variance: float = 1e-5,
-    measurement_variance: float = 1e-2,
-    initial_estimate_variance: float = 1.0,
+    process_variance: float = KALMAN_PROCESS_VARIANCE,
+    measurement_variance: float = KALMAN_MEASUREMENT_VARIANCE,
+    initial_estimate_variance: float = KALMAN_INITIAL_VARIANCE,
 ) -> pd.Series:
     """
     Estimate the trend of a series using a simple 1D Kalman filter.
+
+    The recurrence runs in the active ``kernels`` backend.
     """
     values = series.to_numpy(dtype=float)
-    n_obs = values.size
-
-    if n_obs == 0:
+    if values.size == 0:
         return series.copy()
 
-    estimates = np.empty(n_obs, dtype=float)
+    estimates = kernels.get_kernel("kalman_filter")(
+        values,
+        process_variance,
+        measurement_variance,
+        initial_estimate_variance,
+    )
+    return pd.Series(estimates, index=series.index, name="kalman_trend")
+
 
-    estimate = values[0]
-    estimate_variance = float(initial_estimate_variance)
-    estimates[0] = estimate
+def estimate_kalman_trend_panel(
+    values: np.ndarray,
+    process_variance: float = KALMAN_PROCESS_VARIANCE,
+    measurement_variance: float = KALMAN_MEASUREMENT_VARIANCE,
+    initial_estimate_variance: float = KALMAN_INITIAL_VARIANCE,
+) -> np.ndarray:
+    """
+    Run ``estimate_kalman_trend`` on every column of a (time x asset) array.
+
+    Each column starts at its first non-NaN value; NaN observations leave
+    the filter state unchanged and yield NaN.
+    """
+    values = np.asarray(values, dtype=float)
+    estimates = np.full(values.shape, np.nan)
+    if values.size == 0:
+        return estimates
+
+    estimate = np.full(values.shape[1:], np.nan)
+    estimate_variance = np.full(values.shape[1:], np.nan)
+    started = np.zeros(values.shape[1:], dtype=bool)
+
+    for i in range(values.shape[0]):
+        observed = ~np.isnan(values[i])
+        first = observed & ~started
+        update = observed & started
+
+        estimate[first] = values[i][first]
+        estimate_variance[first] = initial_estimate_variance
+        started |= first
 
-    for i in range(1, n_obs):
         # Predict
-        estimate_variance += process_variance
+        variance = estimate_variance[update] + process_variance
 
         # Update
-        kalman_gain = (
-            estimate_variance
-            / (estimate_variance + measurement_variance)
+        kalman_gain = variance / (variance + measurement_variance)
+        estimate[update] += kalman_gain * (
+            values[i][update] - estimate[update]
         )
-        estimate += kalman_gain * (values[i] - estimate)
-        estimate_variance *= 1.0 - kalman_gain
+        estimate_variance[update] = variance * (1.0 - kalman_gain)
 
-        estimates[i] = estimate
+        estimates[i] = np.where(observed, estimate, np.nan)
 
-    return pd.Series(estimates, index=series.index, name="kalman_trend")
+    return estimates
 
 
 def add_kalman_trend(data: pd.DataFrame) -> pd.DataFrame:
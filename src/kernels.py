@@ -0,0 +1,254 @@
+"""
+Interchangeable implementations of the sequential recurrences.
+
+Every kernel has a NumPy/Python reference implementation and, when
+numba is installed, a JIT-compiled one with the same signature and
+results. ``get_kernel`` returns the implementation of the active backend:
+'numba' if available under the default 'auto' setting, else 'numpy'.
+numba is only imported (and the kernels compiled) on first use.
+"""
+
+from __future__ import annotations
+
+import functools
+import importlib.util
+import os
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+
+
+BACKENDS = ("auto", "numpy", "numba")
+
+# Reference implementations, by kernel name.
+_REFERENCE: Dict[str, Callable[..., np.ndarray]] = {}
+
+# JIT-compiled implementations, built on first use.
+_COMPILED: Optional[Dict[str, Callable[..., np.ndarray]]] = None
+
+_backend = os.environ.get("ALGO_DASH_KERNEL_BACKEND", "auto")
+
+
+def _reference(func: Callable[..., np.ndarray]) -> Callable[..., np.ndarray]:
+    _REFERENCE[func.__name__] = func
+    return func
+
+
+@_reference
+def kalman_filter(
+    values: np.ndarray,
+    process_variance: float,
+    measurement_variance: float,
+    initial_estimate_variance: float,
+) -> np.ndarray:
+    """
+    Filter a 1-D float array with a scalar random-walk Kalman filter.
+
+    The first estimate is the first value; see
+    ``indicators.estimate_kalman_trend``.
+    """
+    n_obs = values.size
+    estimates = np.empty(n_obs, dtype=np.float64)
+    if n_obs == 0:
+        return estimates
+
+    estimate = values[0]
+    estimate_variance = float(initial_estimate_variance)
+    estimates[0] = estimate
+
+    for i in range(1, n_obs):
+        # Predict
+        estimate_variance += process_variance
+
+        # Update
+        kalman_gain = (
+            estimate_variance
+            / (estimate_variance + measurement_variance)
+        )
+        estimate += kalman_gain * (values[i] - estimate)
+        estimate_variance *= 1.0 - kalman_gain
+
+        estimates[i] = estimate
+
+    return estimates
+
+
+@_reference
+def hysteresis_positions(enter: np.ndarray, exit: np.ndarray) -> np.ndarray:
+    """
+    Long/flat state machine along the last axis, as int8.
+
+    The position becomes 1 where ``enter`` is True, 0 where only ``exit``
+    is True, and otherwise keeps its previous value (starting flat).
+    Both arrays are boolean with the same shape; leading axes are
+    independent scenarios.
+    """
+    steps = np.arange(enter.shape[-1])
+    last_set = np.where(enter | exit, steps, -1)
+    last_set = np.maximum.accumulate(last_set, axis=-1)
+    entered = np.take_along_axis(enter, np.maximum(last_set, 0), axis=-1)
+    return np.where(last_set >= 0, entered, False).astype(np.int8)
+
+
+@_reference
+def drawdown(equity: np.ndarray) -> np.ndarray:
+    """
+    Drawdown from the running peak along the last axis.
+
+    NaN values are skipped when tracking the peak (as pandas ``cummax``
+    does) and yield NaN.
+    """
+    return equity / np.fmax.accumulate(equity, axis=-1) - 1.0
+
+
+# Loops compiled by numba. They are module-level functions without
+# closure variables so that numba can cache the machine code on disk.
+
+
+def _kalman_loop(values, q, r, p0):
+    n_obs = values.size
+    estimates = np.empty(n_obs, dtype=np.float64)
+    if n_obs == 0:
+        return estimates
+    estimate = values[0]
+    variance = p0
+    estimates[0] = estimate
+    for i in range(1, n_obs):
+        variance += q
+        gain = variance / (variance + r)
+        estimate += gain * (values[i] - estimate)
+        variance *= 1.0 - gain
+        estimates[i] = estimate
+    return estimates
+
+
+def _hysteresis_loop(enter, exit):
+    positions = np.zeros(enter.shape, dtype=np.int8)
+    for row in range(enter.shape[0]):
+        current = 0
+        for t in range(enter.shape[1]):
+            if enter[row, t]:
+                current = 1
+            elif exit[row, t]:
+                current = 0
+            positions[row, t] = current
+    return positions
+
+
+def _drawdown_loop(equity):
+    result = np.empty(equity.shape, dtype=np.float64)
+    for row in range(equity.shape[0]):
+        peak = np.nan
+        for t in range(equity.shape[1]):
+            value = equity[row, t]
+            if not np.isnan(value) and not value <= peak:
+                peak = value
+            result[row, t] = value / peak - 1.0
+    return result
+
+
+def _build_compiled() -> Dict[str, Callable[..., np.ndarray]]:
+    """
+    Compile the numba kernels; wrappers handle shapes and dtypes.
+
+    The compiled code is cached next to this module (``cache=True``), so
+    later processes skip the compilation.
+    """
+    import numba
+
+    jit = numba.njit(nogil=True, cache=True)
+    _kalman = jit(_kalman_loop)
+    _hysteresis = jit(_hysteresis_loop)
+    _drawdown = jit(_drawdown_loop)
+
+    def _rows(func, *arrays):
+        # The compiled loops take 2-D (scenario x time) arrays.
+        shape = arrays[0].shape
+        n_rows = int(np.prod(shape[:-1]))
+        flat = [
+            np.ascontiguousarray(a.reshape(n_rows, shape[-1]))
+            for a in arrays
+        ]
+        return func(*flat).reshape(shape)
+
+    def kalman(
+        values,
+        process_variance,
+        measurement_variance,
+        initial_estimate_variance,
+    ):
+        return _kalman(
+            np.ascontiguousarray(values, dtype=np.float64),
+            float(process_variance),
+            float(measurement_variance),
+            float(initial_estimate_variance),
+        )
+
+    return {
+        "kalman_filter": kalman,
+        "hysteresis_positions": lambda enter, exit: _rows(
+            _hysteresis, enter, exit
+        ),
+        "drawdown": lambda equity: _rows(
+            _drawdown, np.asarray(equity, dtype=np.float64)
+        ),
+    }
+
+
+@functools.lru_cache(maxsize=None)
+def _numba_installed() -> bool:
+    return importlib.util.find_spec("numba") is not None
+
+
+def available_backends() -> List[str]:
+    """Return the concrete backends usable in this environment."""
+    return ["numpy", "numba"] if _numba_installed() else ["numpy"]
+
+
+def set_backend(name: str) -> None:
+    """
+    Select the kernel backend for the whole process.
+
+    Parameters
+    ----------
+    name:
+        'auto' (numba when installed, else numpy), 'numpy' or 'numba'.
+        ValueError if unknown or not installed.
+    """
+    global _backend
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown kernel backend: {name}")
+    if name != "auto" and name not in available_backends():
+        raise ValueError(f"Kernel backend is not available: {name}")
+    _backend = name
+
+
+def active_backend() -> str:
+    """Return the concrete backend ``get_kernel`` currently uses."""
+    if _backend == "auto":
+        return available_backends()[-1]
+    return _backend
+
+
+def get_kernel(name: str, backend: Optional[str] = None) -> Any:
+    """
+    Return the implementation of kernel ``name``.
+
+    Parameters
+    ----------
+    name:
+        'kalman_filter', 'hysteresis_positions' or 'drawdown'.
+    backend:
+        Concrete backend to use instead of the active one.
+    """
+    global _COMPILED
+    if name not in _REFERENCE:
+        raise ValueError(f"Unknown kernel: {name}")
+    backend = backend or active_backend()
+    if backend == "numpy":
+        return _REFERENCE[name]
+    if backend != "numba":
+        raise ValueError(f"Unknown kernel backend: {backend}")
+    if _COMPILED is None:
+        _COMPILED = _build_compiled()
+    return _COMPILED[name]
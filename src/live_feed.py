@@ -0,0 +1,335 @@
+"""Live bar feeds and incremental strategy updates for streaming clients."""
+
+from __future__ import annotations
+
+import functools
+import itertools
+import threading
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from . import indicators, sentiment, strategy
+
+
+@dataclass(frozen=True)
+class Bar:
+    """One new daily bar: close price and Fear & Greed value."""
+
+    date: pd.Timestamp
+    close: float
+    fg_value: float
+
+
+class SyntheticFeed:
+    """
+    Deterministic feed replaying a fixed list of bars.
+
+    Each poll returns the next ``batch_size`` bars; once all bars were
+    returned the feed reports itself as exhausted by returning None.
+    """
+
+    def __init__(self, bars: List[Bar], batch_size: int = 1) -> None:
+        self._bars = list(bars)
+        self._position = 0
+        self.batch_size = batch_size
+
+    @classmethod
+    def random_walk(
+        cls,
+        start_date: str | pd.Timestamp,
+        start_price: float,
+        periods: int,
+        seed: int = 0,
+        batch_size: int = 1,
+    ) -> "SyntheticFeed":
+        """Build a feed of ``periods`` daily log-normal random-walk bars."""
+        rng = np.random.default_rng(seed)
+        dates = pd.date_range(start_date, periods=periods, freq="D")
+        log_returns = rng.normal(0, 0.02, periods)
+        closes = start_price * np.exp(np.cumsum(log_returns))
+        fg_steps = rng.normal(0, 4, periods)
+        fg_values = np.clip(50 + np.cumsum(fg_steps), 0, 100)
+        bars = [
+            Bar(date, float(close), float(round(fg)))
+            for date, close, fg in zip(dates, closes, fg_values)
+        ]
+        return cls(bars, batch_size=batch_size)
+
+    def poll(self) -> Optional[List[Bar]]:
+        """Return the next bars, or None when the feed is exhausted."""
+        if self._position >= len(self._bars):
+            return None
+        end = self._position + self.batch_size
+        batch = self._bars[self._position:end]
+        self._position = end
+        return batch
+
+
+class YFinanceFeed:
+    """
+    Poll yfinance for daily closes after the last known date.
+
+    No live Fear & Greed source is queried; new bars carry the last known
+    index value forward.
+    """
+
+    def __init__(
+        self, ticker: str, last_date: pd.Timestamp, fg_value: float
+    ) -> None:
+        self.ticker = ticker
+        self.last_date = pd.Timestamp(last_date)
+        self.fg_value = fg_value
+
+    def poll(self) -> Optional[List[Bar]]:
+        """Return bars newer than the last returned one (possibly none)."""
+        import yfinance as yf
+
+        start = self.last_date + pd.Timedelta(days=1)
+        data = yf.download(
+            self.ticker,
+            start=start.strftime("%Y-%m-%d"),
+            progress=False,
+            auto_adjust=False,
+        )
+        if data.empty:
+            return []
+        if isinstance(data.columns, pd.MultiIndex):
+            data.columns = data.columns.get_level_values(0)
+
+        bars = []
+        for date, close in data["Close"].items():
+            date = pd.Timestamp(date).tz_localize(None).normalize()
+            if date > self.last_date:
+                bars.append(Bar(date, float(close), self.fg_value))
+                self.last_date = date
+        return bars
+
+
+class BarHub:
+    """
+    Poll one feed on a background thread and fan bars out to subscribers.
+
+    Bars are appended to a shared buffer; every subscriber only keeps a
+    cursor (an absolute bar number) into it, so the per-client cost is a
+    wait on a condition. The buffer keeps the last ``max_bars`` bars: new
+    subscribers replay at most that many, and a subscriber that fell
+    further behind skips the dropped bars.
+
+    Parameters
+    ----------
+    feed:
+        Object with a ``poll()`` method returning new bars, or None once
+        the feed is exhausted.
+    poll_interval:
+        Seconds between polls.
+    max_bars:
+        Number of bars kept for replay.
+    """
+
+    def __init__(
+        self, feed: Any, poll_interval: float = 60.0, max_bars: int = 1000
+    ) -> None:
+        self.feed = feed
+        self.poll_interval = poll_interval
+        self._bars: deque = deque(maxlen=max_bars)
+        # Number of bars dropped from the front of the buffer.
+        self._dropped = 0
+        self._closed = False
+        self._condition = threading.Condition()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        """Start the polling thread if it is not running yet."""
+        with self._condition:
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(
+                target=self._run, name="bar-hub", daemon=True
+            )
+            self._thread.start()
+
+    def stop(self) -> None:
+        """Stop polling and wake up all subscribers."""
+        self._stop.set()
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                bars = self.feed.poll()
+            except Exception as e:
+                print(f"Live feed error: {e}")
+                bars = []
+            with self._condition:
+                if bars is None:
+                    self._closed = True
+                    self._condition.notify_all()
+                    return
+                if bars:
+                    overflow = len(self._bars) + len(bars)
+                    self._dropped += max(overflow - self._bars.maxlen, 0)
+                    self._bars.extend(bars)
+                    self._condition.notify_all()
+            self._stop.wait(self.poll_interval)
+
+    def wait(
+        self, cursor: int, timeout: float
+    ) -> Tuple[List[Bar], int, bool]:
+        """
+        Wait up to ``timeout`` seconds for bars after ``cursor``.
+
+        Returns
+        -------
+        tuple[list[Bar], int, bool]
+            New bars, the next cursor and whether the hub is closed.
+        """
+        with self._condition:
+            end = self._dropped + len(self._bars)
+            if end <= cursor and not self._closed:
+                self._condition.wait(timeout)
+                end = self._dropped + len(self._bars)
+            start = max(cursor, self._dropped)
+            bars = list(
+                itertools.islice(self._bars, start - self._dropped, None)
+            )
+            return bars, end, self._closed
+
+
+class IncrementalStrategy:
+    """
+    Extend a computed pipeline result one bar at a time.
+
+    The state (rolling windows, Kalman estimate, position, equity) is
+    taken from the tail of an enriched frame, so each update costs
+    O(window) instead of a full pipeline run.
+    """
+
+    def __init__(
+        self,
+        enriched: pd.DataFrame,
+        params: Dict[str, int],
+        bollinger_window: int = 20,
+        bollinger_std: float = 2.0,
+    ) -> None:
+        self.params = params
+        self.bollinger_window = bollinger_window
+        self.bollinger_std = bollinger_std
+
+        window = max(
+            params["long_window"], params["short_window"], bollinger_window
+        )
+        closes = enriched["close"].to_numpy(dtype=float)
+        self._closes = deque(closes[-window:], maxlen=window)
+
+        self.last_date = enriched.index[-1]
+        self.last_close = float(closes[-1])
+        self.kalman_estimate = float(enriched["kalman_trend"].iloc[-1])
+        self.kalman_variance = self._kalman_variance(len(closes))
+        self.position = int(enriched["position"].iloc[-1])
+        self.strategy_equity = float(enriched["_strategy_equity"].iloc[-1])
+        self.benchmark_equity = float(enriched["_benchmark_equity"].iloc[-1])
+
+    @staticmethod
+    @functools.lru_cache(maxsize=64)
+    def _kalman_variance(n_obs: int) -> float:
+        # The variance recursion does not depend on the observations and
+        # reaches its fixed point after a few hundred steps.
+        variance = indicators.KALMAN_INITIAL_VARIANCE
+        for _ in range(1, n_obs):
+            previous = variance
+            variance += indicators.KALMAN_PROCESS_VARIANCE
+            gain = variance / (
+                variance + indicators.KALMAN_MEASUREMENT_VARIANCE
+            )
+            variance *= 1.0 - gain
+            if variance == previous:
+                break
+        return variance
+
+    def _mean(self, window: int) -> Optional[float]:
+        if len(self._closes) < window:
+            return None
+        return float(np.mean(list(self._closes)[-window:]))
+
+    def update(self, bar: Bar) -> Optional[Dict[str, Any]]:
+        """
+        Apply one bar and return the new chart point.
+
+        Bars at or before the last processed date are ignored (None).
+        """
+        date = pd.Timestamp(bar.date)
+        if date <= self.last_date:
+            return None
+
+        self._closes.append(bar.close)
+        daily_return = bar.close / self.last_close - 1.0
+
+        self.kalman_variance += indicators.KALMAN_PROCESS_VARIANCE
+        gain = self.kalman_variance / (
+            self.kalman_variance + indicators.KALMAN_MEASUREMENT_VARIANCE
+        )
+        self.kalman_estimate += gain * (bar.close - self.kalman_estimate)
+        self.kalman_variance *= 1.0 - gain
+
+        sma_short = self._mean(self.params["short_window"])
+        sma_long = self._mean(self.params["long_window"])
+        bb_middle = self._mean(self.bollinger_window)
+        bb_upper = bb_lower = None
+        if bb_middle is not None:
+            window = list(self._closes)[-self.bollinger_window:]
+            spread = float(np.std(window, ddof=1)) * self.bollinger_std
+            bb_upper = bb_middle + spread
+            bb_lower = bb_middle - spread
+
+        regime = sentiment.classify_sentiment_value(
+            bar.fg_value,
+            extreme_fear_threshold=self.params["extreme_fear_threshold"],
+            extreme_greed_threshold=self.params["extreme_greed_threshold"],
+        )
+
+        previous_position = self.position
+        self.position = strategy.next_position(
+            previous_position,
+            np.nan if sma_short is None else sma_short,
+            np.nan if sma_long is None else sma_long,
+            self.kalman_estimate,
+            regime,
+        )
+        if previous_position == 0 and self.position == 1:
+            signal = "Buy"
+        elif previous_position == 1 and self.position == 0:
+            signal = "Sell"
+        else:
+            signal = "Hold"
+
+        self.strategy_equity *= 1.0 + previous_position * daily_return
+        self.benchmark_equity *= 1.0 + daily_return
+        self.last_date = date
+        self.last_close = bar.close
+
+        def _round(value: Optional[float], decimals: int = 2):
+            return None if value is None else round(value, decimals)
+
+        return {
+            "date": date.strftime("%Y-%m-%d"),
+            "close": _round(bar.close),
+            "sma_short": _round(sma_short),
+            "sma_long": _round(sma_long),
+            "bb_middle": _round(bb_middle),
+            "bb_upper": _round(bb_upper),
+            "bb_lower": _round(bb_lower),
+            "kalman_trend": _round(self.kalman_estimate),
+            "fg_value": _round(bar.fg_value, 0),
+            "sentiment_regime": regime,
+            "position": self.position,
+            "trade_signal": signal,
+            "strategy_equity": _round(self.strategy_equity, 3),
+            "benchmark_equity": _round(self.benchmark_equity, 3),
+        }
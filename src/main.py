@@ -1,25 +1,35 @@
 from __future__ import annotations
 
+import argparse
+import os
 from pathlib import Path
+from typing import List, Optional
 
-from src import backtesting, data_loader, indicators, sentiment, strategy
+from src import batch, data_loader, pipeline, strategy
+from src.results_store import ResultsStore
 
 
-def run_default_backtest() -> None:
-    """Run the full pipeline and print summary metrics."""
-    project_root = Path(__file__).resolve().parents[1]
-    fg_csv = data_loader.get_default_data_paths(project_root)
+def run_default_backtest(store: Optional[ResultsStore] = None) -> None:
+    """Run the full pipeline, print summary metrics and record the run."""
+    merged = pipeline.load_merged_data()
+    enriched, metrics = pipeline.run_pipeline(
+        merged, pipeline.DEFAULT_PARAMETERS
+    )
+    signal, explanation = strategy.latest_recommendation(enriched)
 
-    price_df, fg_df, merged = data_loader.load_all_data(fg_csv)
-
-    enriched = indicators.add_moving_averages(merged)
-    enriched = indicators.add_kalman_trend(enriched)
-    enriched = sentiment.add_sentiment_regime(enriched)
-    enriched = strategy.generate_positions(enriched)
-    enriched = strategy.generate_trade_signals(enriched)
-
-    backtest_df, metrics = backtesting.run_backtest(enriched)
-    signal, explanation = strategy.get_latest_recommendation(enriched)
+    if store is not None:
+        store.record(
+            ticker="BTC-USD",
+            start_date=data_loader.START_DATE,
+            end_date=data_loader.END_DATE,
+            params=pipeline.DEFAULT_PARAMETERS,
+            metrics=metrics,
+            dates=enriched.index,
+            strategy_equity=enriched["_strategy_equity"].to_numpy(),
+            benchmark_equity=enriched["_benchmark_equity"].to_numpy(),
+            result_version=pipeline.result_version("BTC-USD"),
+            latest_signal=signal,
+        )
 
     print("Backtest complete for BTC-USD (2020-01-01 to 2024-12-31)")
     print("------------------------------------------------------")
@@ -30,5 +40,57 @@ def run_default_backtest() -> None:
     print(explanation)
 
 
+def main(argv: Optional[List[str]] = None) -> None:
+    """Run the default backtest, or a batch with the 'batch' command."""
+    parser = argparse.ArgumentParser(
+        description="Backtest the sentiment-aware trend strategy."
+    )
+    parser.add_argument(
+        "--results-db",
+        type=Path,
+        default=os.environ.get("ALGO_DASH_RESULTS_DB"),
+        help="SQLite file in which runs are recorded.",
+    )
+    commands = parser.add_subparsers(dest="command")
+    batch_parser = commands.add_parser(
+        "batch", help="Run the configurations of a JSON file in parallel."
+    )
+    batch_parser.add_argument(
+        "config", type=Path, help="JSON file listing the runs."
+    )
+    batch_parser.add_argument(
+        "--output",
+        type=Path,
+        required=True,
+        help="Output directory; an existing output is resumed.",
+    )
+    batch_parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Worker processes (default: all CPUs).",
+    )
+    batch_parser.add_argument(
+        "--flush-every",
+        type=int,
+        default=32,
+        help="Results written per part file.",
+    )
+    args = parser.parse_args(argv)
+    store = ResultsStore(args.results_db) if args.results_db else None
+
+    if args.command == "batch":
+        runs = batch.load_config(args.config)
+        batch.run_batch(
+            runs,
+            args.output,
+            workers=args.workers,
+            flush_every=args.flush_every,
+            store=store,
+        )
+    else:
+        run_default_backtest(store)
+
+
 if __name__ == "__main__":
-    run_default_backtest()
+    main()
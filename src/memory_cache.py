@@ -0,0 +1,128 @@
+"""Bounded in-process caches with single-flight loading."""
+
+from __future__ import annotations
+
+import os
+import threading
+import weakref
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Iterator, MutableMapping
+
+
+class LRUCache(MutableMapping):
+    """
+    Thread-safe mapping that keeps the ``maxsize`` most recently used keys.
+
+    Reads and writes mark a key as recently used; inserting beyond
+    ``maxsize`` evicts the least recently used key. :meth:`get_or_load`
+    loads a missing key once even when several threads ask for it at the
+    same time: the first caller runs the loader, the others wait for it
+    and share its value (or retry if it failed).
+
+    Parameters
+    ----------
+    maxsize:
+        Maximum number of entries (at least 1).
+
+    Locks do not survive ``fork``; a cache inherited by a forked process
+    gets fresh locks with no load in flight.
+    """
+
+    # Caches are compared by identity (and can be kept in a WeakSet).
+    __eq__ = object.__eq__
+    __hash__ = object.__hash__
+
+    def __init__(self, maxsize: int) -> None:
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1.")
+        self.maxsize = maxsize
+        self._data: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._reset()
+        _CACHES.add(self)
+
+    def _reset(self) -> None:
+        self._lock = threading.RLock()
+        # Per-key locks of the loads in flight, with their waiter counts.
+        self._loading: Dict[Hashable, list] = {}
+
+    def __getitem__(self, key: Hashable) -> Any:
+        with self._lock:
+            value = self._data[key]
+            self._data.move_to_end(key)
+            return value
+
+    def __setitem__(self, key: Hashable, value: Any) -> None:
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def __delitem__(self, key: Hashable) -> None:
+        with self._lock:
+            del self._data[key]
+
+    def __contains__(self, key: object) -> bool:
+        with self._lock:
+            return key in self._data
+
+    def __iter__(self) -> Iterator[Hashable]:
+        with self._lock:
+            return iter(list(self._data))
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            if key not in self._data:
+                return default
+            self._data.move_to_end(key)
+            return self._data[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def get_or_load(self, key: Hashable, load: Callable[[], Any]) -> Any:
+        """
+        Return the value of ``key``, calling ``load`` once if it is missing.
+
+        Concurrent callers for the same key wait for the first one; other
+        keys are not blocked. Exceptions of ``load`` propagate and nothing
+        is stored.
+        """
+        value = self.get(key, _MISSING)
+        if value is not _MISSING:
+            return value
+
+        with self._lock:
+            entry = self._loading.setdefault(key, [threading.Lock(), 0])
+            entry[1] += 1
+        try:
+            with entry[0]:
+                value = self.get(key, _MISSING)
+                if value is _MISSING:
+                    value = load()
+                    self[key] = value
+                return value
+        finally:
+            with self._lock:
+                entry[1] -= 1
+                if entry[1] == 0 and self._loading.get(key) is entry:
+                    del self._loading[key]
+
+
+_MISSING = object()
+
+# Live caches of this process, given fresh locks in forked children.
+_CACHES: "weakref.WeakSet[LRUCache]" = weakref.WeakSet()
+
+
+def _reset_caches_after_fork() -> None:
+    for cache in list(_CACHES):
+        cache._reset()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_caches_after_fork)
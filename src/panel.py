@@ -0,0 +1,333 @@
+"""Multi-asset strategy engine working on (time x asset) panels."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from . import (
+    backtesting,
+    data_loader,
+    indicators,
+    pipeline,
+    sentiment,
+    strategy,
+)
+from .alignment import AlternativeSeries, AsOfAligner
+from .pipeline import PipelineResult
+
+
+DEFAULT_TICKERS = ("BTC-USD", "ETH-USD", "SOL-USD")
+
+
+@dataclass
+class Panel:
+    """
+    Strategy fields for several assets sharing one sentiment series.
+
+    Every frame in ``fields`` is indexed by date with one column per
+    ticker; ``sentiment`` holds 'fg_value' and 'fg_classification' on the
+    same index. ``params`` and ``metrics`` (per ticker) are only set on
+    panels returned by :func:`run_panel`, which also records the
+    ``periods_per_year`` the metrics were annualized with.
+    """
+
+    sentiment: pd.DataFrame
+    fields: Dict[str, pd.DataFrame]
+    params: Dict[str, int] = field(default_factory=dict)
+    metrics: Dict[str, Dict[str, float]] = field(default_factory=dict)
+    periods_per_year: int = backtesting.TRADING_DAYS_PER_YEAR
+
+    @property
+    def tickers(self) -> List[str]:
+        return list(self.fields["close"].columns)
+
+
+def merge_price_panel(
+    closes: pd.DataFrame,
+    sentiment_df: pd.DataFrame,
+) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Align a close price panel with the Fear & Greed index.
+
+    The Fear & Greed value and classification are aligned as of every
+    price date and both frames are limited to the loader's date range, as
+    in ``data_loader.merge_price_and_sentiment``.
+
+    Parameters
+    ----------
+    closes:
+        Close prices indexed by date, one column per ticker.
+    sentiment_df:
+        Data frame containing 'date', 'fg_value' and 'fg_classification'.
+
+    Returns
+    -------
+    tuple[pd.DataFrame, pd.DataFrame]
+        Close panel and sentiment frame on the same date index.
+    """
+    closes = closes.copy()
+    closes.index = pd.to_datetime(closes.index)
+    closes.index.name = "date"
+    closes = closes.sort_index()
+
+    sentiment_dates = pd.DatetimeIndex(sentiment_df["date"], name="date")
+    sentiment_frame = AsOfAligner(closes.index).align(
+        AlternativeSeries(
+            name="fear_greed",
+            frame=sentiment_df.set_axis(sentiment_dates, axis=0),
+            columns=["fg_value", "fg_classification"],
+        )
+    )
+
+    in_range = (
+        (closes.index >= pd.to_datetime(data_loader.START_DATE))
+        & (closes.index <= pd.to_datetime(data_loader.END_DATE))
+    )
+    return closes.loc[in_range], sentiment_frame.loc[in_range]
+
+
+def load_panel_data(
+    tickers: Sequence[str] = DEFAULT_TICKERS,
+    fear_greed_csv: Optional[str | Path] = None,
+    source: Optional[Any] = None,
+) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Download all ``tickers`` in one batch and align them with sentiment.
+
+    ``source`` may replace yfinance by an object with a
+    ``download_price_panel`` method, e.g.
+    ``data_loader.SyntheticPriceSource``.
+
+    Returns
+    -------
+    tuple[pd.DataFrame, pd.DataFrame]
+        Output of :func:`merge_price_panel`.
+    """
+    if fear_greed_csv is None:
+        fear_greed_csv = pipeline.default_fear_greed_csv()
+    download = (
+        data_loader.download_price_panel
+        if source is None
+        else source.download_price_panel
+    )
+    closes = download(tickers)
+    sentiment_df = data_loader.load_fear_greed_index(fear_greed_csv)
+    return merge_price_panel(closes, sentiment_df)
+
+
+def _per_asset(
+    frame: pd.DataFrame, func: Callable[[pd.Series], pd.Series]
+) -> pd.DataFrame:
+    """
+    Apply ``func`` to every column on that asset's own dates.
+
+    Dates on which an asset has no price (weekends for equities, days
+    before a listing) are left out of its rolling windows and returns
+    and are NaN in the result, which is on the index of ``frame``.
+    """
+    return pd.DataFrame(
+        {ticker: func(column.dropna()) for ticker, column in frame.items()},
+        index=frame.index,
+        columns=frame.columns,
+    )
+
+
+def prepare_panel(
+    closes: pd.DataFrame,
+    sentiment_frame: pd.DataFrame,
+    bollinger_window: int = 20,
+    bollinger_std: float = 2.0,
+) -> Panel:
+    """
+    Run the parameter-independent stages on every asset at once.
+
+    The panel counterpart of ``pipeline.prepare_base``. Returns and
+    Bollinger Bands are computed per asset on the dates it trades, so
+    assets with different calendars (crypto and equities) match their
+    single-asset results; the Kalman trend runs on all assets at once and
+    skips missing prices. As ``merge_price_and_sentiment`` drops the row
+    without a return, the first observation of every asset is masked,
+    and dates on which no asset has a return are dropped.
+    """
+    returns = _per_asset(closes, lambda column: column.pct_change())
+    has_return = returns.notna()
+    keep = has_return.any(axis=1)
+    closes = closes.where(has_return).loc[keep]
+    returns = returns.loc[keep]
+    sentiment_frame = sentiment_frame.loc[keep]
+
+    middle = _per_asset(
+        closes, lambda column: column.rolling(window=bollinger_window).mean()
+    )
+    std = _per_asset(
+        closes, lambda column: column.rolling(window=bollinger_window).std()
+    )
+    kalman = indicators.estimate_kalman_trend_panel(closes.to_numpy())
+
+    fields = {
+        "close": closes,
+        "return": returns,
+        "bb_middle": middle,
+        "bb_upper": middle + (std * bollinger_std),
+        "bb_lower": middle - (std * bollinger_std),
+        "kalman_trend": pd.DataFrame(
+            kalman, index=closes.index, columns=closes.columns
+        ),
+    }
+    return Panel(sentiment=sentiment_frame, fields=fields)
+
+
+def run_panel(
+    base: Panel,
+    params: Dict[str, int],
+    periods_per_year: int = backtesting.TRADING_DAYS_PER_YEAR,
+) -> Panel:
+    """
+    Run the parameter-dependent stages on a panel from :func:`prepare_panel`.
+
+    Moving averages, regime masks, positions and equity curves are
+    (time x asset) arrays; metrics come from one call to
+    ``backtesting.vectorized_metrics``.
+
+    Returns
+    -------
+    Panel
+        New panel with 'sma_short', 'sma_long', 'position',
+        '_strategy_equity' and '_benchmark_equity' added.
+    """
+    close = base.fields["close"]
+    sma_short = _per_asset(
+        close,
+        lambda column: indicators.calculate_sma(
+            column, params["short_window"]
+        ),
+    )
+    sma_long = _per_asset(
+        close,
+        lambda column: indicators.calculate_sma(
+            column, params["long_window"]
+        ),
+    )
+
+    fg_values = base.sentiment["fg_value"].to_numpy(dtype=float)
+    fear_mask = sentiment.extreme_fear_mask(
+        fg_values, params["extreme_fear_threshold"]
+    )
+    greed_mask = sentiment.extreme_greed_mask(
+        fg_values,
+        params["extreme_fear_threshold"],
+        params["extreme_greed_threshold"],
+    )
+
+    short_ma = sma_short.to_numpy()
+    long_ma = sma_long.to_numpy()
+    trend_up = base.fields["kalman_trend"].to_numpy() > 0
+    returns = base.fields["return"].to_numpy(dtype=float)
+    valid = ~np.isnan(returns)
+    # Sentiment on dates an asset does not trade must not move it.
+    enter = (short_ma > long_ma) & trend_up & ~greed_mask[:, None] & valid
+    exit = ((short_ma < long_ma) | fear_mask[:, None]) & valid
+    positions = strategy.hysteresis_positions(enter.T, exit.T).T
+
+    lagged = np.zeros_like(positions)
+    lagged[1:] = positions[:-1]
+    strategy_equity = np.cumprod(
+        1.0 + np.where(valid, lagged * returns, 0.0), axis=0
+    )
+    benchmark_equity = np.cumprod(
+        1.0 + np.where(valid, returns, 0.0), axis=0
+    )
+
+    arrays = backtesting.vectorized_metrics(
+        lagged.T, returns.T, periods_per_year
+    )
+    metrics = {
+        ticker: {name: float(values[i]) for name, values in arrays.items()}
+        for i, ticker in enumerate(base.tickers)
+    }
+
+    def _frame(values: np.ndarray) -> pd.DataFrame:
+        return pd.DataFrame(values, index=close.index, columns=close.columns)
+
+    fields = dict(base.fields)
+    fields["sma_short"] = sma_short
+    fields["sma_long"] = sma_long
+    fields["position"] = _frame(positions)
+    fields["_strategy_equity"] = _frame(
+        np.where(valid, strategy_equity, np.nan)
+    )
+    fields["_benchmark_equity"] = _frame(
+        np.where(valid, benchmark_equity, np.nan)
+    )
+    return Panel(
+        sentiment=base.sentiment,
+        fields=fields,
+        params=dict(params),
+        metrics=metrics,
+        periods_per_year=periods_per_year,
+    )
+
+
+def asset_frame(panel: Panel, ticker: str) -> pd.DataFrame:
+    """
+    Return the enriched single-asset frame of one ticker of a run panel.
+
+    The frame has the same columns as the output of
+    ``pipeline.run_parameter_stages``, restricted to the dates on which
+    the asset has a return.
+    """
+    if ticker not in panel.tickers:
+        raise ValueError(f"Ticker not in panel: {ticker}")
+
+    def _column(name: str) -> pd.Series:
+        return panel.fields[name][ticker]
+
+    frame = pd.DataFrame(
+        {
+            "close": _column("close"),
+            "fg_value": panel.sentiment["fg_value"],
+            "fg_classification": panel.sentiment["fg_classification"],
+            "return": _column("return"),
+            "bb_middle": _column("bb_middle"),
+            "bb_upper": _column("bb_upper"),
+            "bb_lower": _column("bb_lower"),
+            "kalman_trend": _column("kalman_trend"),
+            "sma_short": _column("sma_short"),
+            "sma_long": _column("sma_long"),
+        }
+    )
+    valid = frame["return"].notna()
+    frame = sentiment.add_sentiment_regime(
+        frame.loc[valid],
+        extreme_fear_threshold=panel.params["extreme_fear_threshold"],
+        extreme_greed_threshold=panel.params["extreme_greed_threshold"],
+    )
+    frame["position"] = _column("position").loc[valid].astype(int)
+    frame = strategy.generate_trade_signals(frame)
+    frame["_strategy_equity"] = _column("_strategy_equity").loc[valid]
+    frame["_benchmark_equity"] = _column("_benchmark_equity").loc[valid]
+    return frame
+
+
+def asset_result(
+    panel: Panel, ticker: str, compact: bool = False
+) -> PipelineResult:
+    """Build the dashboard result of one ticker from a run panel."""
+    enriched = asset_frame(panel, ticker)
+    metrics = panel.metrics[ticker]
+    payloads, payload_fields = pipeline.encode_payloads(
+        enriched, metrics, panel.periods_per_year
+    )
+    if compact:
+        enriched = pipeline.compact_frame(enriched)
+    return PipelineResult(
+        frame=enriched,
+        metrics=metrics,
+        payloads=payloads,
+        payload_fields=payload_fields,
+    )
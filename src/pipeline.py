@@ -0,0 +1,505 @@
+"""End-to-end strategy pipeline shared by the dashboard and the CLI."""
+
+from __future__ import annotations
+
+import json
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+import numpy as np
+import pandas as pd
+
+from . import (
+    backtesting,
+    data_loader,
+    indicators,
+    sentiment,
+    serialization,
+    strategy,
+    trades,
+)
+
+
+# Bump whenever a change to the pipeline alters its results, so that
+# persisted results computed by older code are discarded.
+PIPELINE_VERSION = 3
+
+DEFAULT_PARAMETERS: Dict[str, int] = {
+    "short_window": 5,
+    "long_window": 50,
+    "extreme_fear_threshold": 25,
+    "extreme_greed_threshold": 75,
+}
+
+
+# Payload fields produced by the signal and backtest stages, which every
+# strategy parameter feeds into.
+_SIGNAL_FIELDS = {
+    "position",
+    "trade_signal",
+    "buy_indices",
+    "sell_indices",
+    "strategy_equity",
+    "metrics",
+    "latest_signal",
+    "latest_explanation",
+}
+
+# Payload fields that can change when a given parameter changes. Fields
+# not listed here (dates, close, Bollinger, Kalman, fg_value, benchmark)
+# come from parameter-independent stages.
+PARAMETER_FIELDS: Dict[str, Set[str]] = {
+    "short_window": {"sma_short"} | _SIGNAL_FIELDS,
+    "long_window": {"sma_long"} | _SIGNAL_FIELDS,
+    "extreme_fear_threshold": {"sentiment_regime"} | _SIGNAL_FIELDS,
+    "extreme_greed_threshold": {"sentiment_regime"} | _SIGNAL_FIELDS,
+}
+
+_TOKEN_ORDER = list(DEFAULT_PARAMETERS)
+
+# Decimals the API payloads round each numeric column to.
+SERIALIZED_DECIMALS: Dict[str, int] = {
+    "close": 2,
+    "sma_short": 2,
+    "sma_long": 2,
+    "bb_middle": 2,
+    "bb_upper": 2,
+    "bb_lower": 2,
+    "kalman_trend": 2,
+    "fg_value": 0,
+    "_strategy_equity": 3,
+    "_benchmark_equity": 3,
+}
+
+# Chart columns that live updates, the trade ledger and the results store
+# continue from; compact_frame keeps them at full precision.
+STATE_COLUMNS = (
+    "close",
+    "kalman_trend",
+    "_strategy_equity",
+    "_benchmark_equity",
+)
+
+# Text columns with a handful of distinct values.
+LABEL_COLUMNS = ("trade_signal", "sentiment_regime", "fg_classification")
+
+# Payload fields sent as columns in the binary payloads, by payload, with
+# the frame column they come from. Other fields go into the header.
+BINARY_COLUMNS: Dict[str, Dict[str, str]] = {
+    "time_series": {
+        name: name
+        for name in (
+            "close",
+            "sma_short",
+            "sma_long",
+            "bb_middle",
+            "bb_upper",
+            "bb_lower",
+            "kalman_trend",
+            "position",
+            "trade_signal",
+        )
+    },
+    "sentiment": {
+        "fg_value": "fg_value",
+        "sentiment_regime": "sentiment_regime",
+    },
+    "performance": {
+        "strategy_equity": "_strategy_equity",
+        "benchmark_equity": "_benchmark_equity",
+    },
+}
+
+# Labels standing in for missing values, as in the JSON payloads.
+_LABEL_FILLS = {"trade_signal": "Hold", "sentiment_regime": "Unknown"}
+
+
+@dataclass
+class PipelineResult:
+    """Enriched frame, metrics and pre-encoded JSON payloads of one run.
+
+    ``payload_fields`` maps each payload name to the byte range of every
+    top-level field's value inside the encoded payload, so that subsets
+    of a payload can be sent without re-encoding.
+    """
+
+    frame: pd.DataFrame
+    metrics: Dict[str, float] = field(default_factory=dict)
+    payloads: Dict[str, bytes] = field(default_factory=dict)
+    payload_fields: Dict[str, Dict[str, List[int]]] = field(
+        default_factory=dict
+    )
+    # Binary columnar payloads, encoded on first request in each process.
+    binary_payloads: Dict[str, bytearray] = field(
+        default_factory=dict, repr=False, compare=False
+    )
+    # Trade ledger, extracted on first request in each process.
+    trades: Optional[pd.DataFrame] = field(
+        default=None, repr=False, compare=False
+    )
+
+
+def cache_key(params: Dict[str, int]) -> str:
+    """Return a stable cache key for a parameter set."""
+    return str(sorted(params.items()))
+
+
+def params_token(params: Dict[str, int]) -> str:
+    """Encode a parameter set as a short dotted token, e.g. '5.50.25.75'."""
+    return ".".join(str(int(params[name])) for name in _TOKEN_ORDER)
+
+
+def parse_params_token(token: str) -> Optional[Dict[str, int]]:
+    """Decode a token from :func:`params_token`; None if malformed."""
+    parts = token.split(".")
+    if len(parts) != len(_TOKEN_ORDER):
+        return None
+    try:
+        return {name: int(part) for name, part in zip(_TOKEN_ORDER, parts)}
+    except ValueError:
+        return None
+
+
+def changed_fields(
+    old_params: Dict[str, int], new_params: Dict[str, int]
+) -> Set[str]:
+    """Return the payload fields invalidated by moving between two sets."""
+    fields: Set[str] = set()
+    for name, invalidated in PARAMETER_FIELDS.items():
+        if old_params.get(name) != new_params.get(name):
+            fields |= invalidated
+    return fields
+
+
+def default_fear_greed_csv() -> Path:
+    """Return the Fear & Greed CSV shipped in the project data folder."""
+    project_root = Path(__file__).resolve().parents[1]
+    return data_loader.get_default_data_paths(project_root)
+
+
+def result_version(
+    ticker: str = "BTC-USD",
+    start_date: str = data_loader.START_DATE,
+    end_date: str = data_loader.END_DATE,
+) -> str:
+    """Return a version tag combining pipeline and data versions."""
+    data_version = data_loader.data_version(
+        default_fear_greed_csv(), ticker, start_date, end_date
+    )
+    return f"p{PIPELINE_VERSION}-{data_version}"
+
+
+def load_merged_data(
+    ticker: str = "BTC-USD", source: Optional[Any] = None
+) -> pd.DataFrame:
+    """
+    Load merged price and sentiment data from the default data folder.
+
+    Parameters
+    ----------
+    ticker:
+        Yahoo Finance ticker symbol.
+    source:
+        Price source passed to ``data_loader.load_all_data``.
+
+    Returns
+    -------
+    pd.DataFrame
+        Merged data frame indexed by date.
+    """
+    fg_csv = default_fear_greed_csv()
+    _price_df, _fg_df, merged = data_loader.load_all_data(
+        fg_csv, ticker=ticker, source=source
+    )
+    return merged
+
+
+def prepare_base(merged: pd.DataFrame) -> pd.DataFrame:
+    """
+    Run the parameter-independent stages (Bollinger Bands, Kalman trend).
+
+    The result can be reused for every parameter set of the same data.
+    """
+    base = indicators.add_bollinger_bands(merged)
+    return indicators.add_kalman_trend(base)
+
+
+def run_parameter_stages(
+    base: pd.DataFrame,
+    params: Dict[str, int],
+    periods_per_year: int = backtesting.TRADING_DAYS_PER_YEAR,
+) -> Tuple[pd.DataFrame, Dict[str, float]]:
+    """
+    Run the parameter-dependent stages on the output of ``prepare_base``.
+
+    ``periods_per_year`` is the number of bars per year of ``base``
+    (see ``timeframes.TIMEFRAMES``).
+
+    Returns
+    -------
+    tuple[pd.DataFrame, dict[str, float]]
+        Enriched data frame (including equity curves) and backtest metrics.
+    """
+    enriched = indicators.add_moving_averages(
+        base,
+        short_window=params["short_window"],
+        long_window=params["long_window"],
+    )
+    enriched = sentiment.add_sentiment_regime(
+        enriched,
+        extreme_fear_threshold=params["extreme_fear_threshold"],
+        extreme_greed_threshold=params["extreme_greed_threshold"],
+    )
+    enriched = strategy.generate_positions(enriched)
+    enriched = strategy.generate_trade_signals(enriched)
+
+    backtest_df, metrics = backtesting.run_backtest(
+        enriched, periods_per_year
+    )
+    enriched["_strategy_equity"] = backtest_df["strategy_equity"]
+    enriched["_benchmark_equity"] = backtest_df["benchmark_equity"]
+    return enriched, metrics
+
+
+def run_pipeline(
+    merged: pd.DataFrame,
+    params: Dict[str, int],
+    periods_per_year: int = backtesting.TRADING_DAYS_PER_YEAR,
+) -> Tuple[pd.DataFrame, Dict[str, float]]:
+    """
+    Run indicators, sentiment, signals and the backtest on merged data.
+
+    Parameters
+    ----------
+    merged:
+        Merged price and sentiment data frame.
+    params:
+        Strategy parameters (see ``DEFAULT_PARAMETERS``).
+    periods_per_year:
+        Bars per year of ``merged``, e.g. 52 for weekly bars.
+
+    Returns
+    -------
+    tuple[pd.DataFrame, dict[str, float]]
+        Enriched data frame (including equity curves) and backtest metrics.
+    """
+    return run_parameter_stages(
+        prepare_base(merged), params, periods_per_year
+    )
+
+
+def _encode_fields(
+    payload: Dict[str, Any],
+) -> Tuple[bytes, Dict[str, List[int]]]:
+    """Encode a JSON object and record the byte range of each value."""
+    parts = [b"{"]
+    offsets: Dict[str, List[int]] = {}
+    position = 1
+    for number, (name, value) in enumerate(payload.items()):
+        prefix = (b"," if number else b"") + json.dumps(name).encode("utf-8")
+        prefix += b":"
+        body = json.dumps(value, separators=(",", ":")).encode("utf-8")
+        position += len(prefix)
+        offsets[name] = [position, position + len(body)]
+        position += len(body)
+        parts.extend([prefix, body])
+    parts.append(b"}")
+    return b"".join(parts), offsets
+
+
+def encode_payloads(
+    enriched: pd.DataFrame,
+    metrics: Dict[str, float],
+    periods_per_year: int = backtesting.TRADING_DAYS_PER_YEAR,
+) -> Tuple[Dict[str, bytes], Dict[str, Dict[str, List[int]]]]:
+    """
+    Serialize the three dashboard API payloads to JSON once.
+
+    The performance payload carries ``periods_per_year`` so that clients
+    annualize like the backtest.
+
+    Returns
+    -------
+    tuple[dict[str, bytes], dict[str, dict[str, list[int]]]]
+        Encoded payloads keyed by 'time_series', 'sentiment' and
+        'performance', and the byte range of each field in them.
+    """
+    performance = serialization.serialize_performance(
+        enriched.rename(
+            columns={
+                "_strategy_equity": "strategy_equity",
+                "_benchmark_equity": "benchmark_equity",
+            }
+        ),
+        metrics,
+    )
+    signal, explanation = strategy.latest_recommendation(enriched)
+    performance["latest_signal"] = signal
+    performance["latest_explanation"] = explanation
+    performance["periods_per_year"] = periods_per_year
+
+    payloads: Dict[str, Any] = {
+        "time_series": serialization.serialize_time_series(enriched),
+        "sentiment": serialization.serialize_sentiment(enriched),
+        "performance": performance,
+    }
+    encoded: Dict[str, bytes] = {}
+    fields: Dict[str, Dict[str, List[int]]] = {}
+    for name, payload in payloads.items():
+        encoded[name], fields[name] = _encode_fields(payload)
+    return encoded, fields
+
+
+def encode_delta(
+    result: PipelineResult, name: str, fields: Set[str], base: str
+) -> bytes:
+    """
+    Build a JSON object holding only ``fields`` of one encoded payload.
+
+    The object carries ``"delta": true`` and the ``base`` tag the client
+    should merge it into.
+    """
+    payload = result.payloads[name]
+    parts = [b'{"delta":true,"base":', json.dumps(base).encode("utf-8")]
+    for field_name, (start, end) in result.payload_fields[name].items():
+        if field_name in fields:
+            parts.append(b"," + json.dumps(field_name).encode("utf-8") + b":")
+            parts.append(payload[start:end])
+    parts.append(b"}")
+    return b"".join(parts)
+
+
+def encode_binary(result: PipelineResult, name: str) -> bytearray:
+    """
+    Return one payload in the binary columnar format, encoding it once.
+
+    Numeric columns are sent as float32 (NaN for null) with the decimals
+    the JSON payload rounds them to, ``position`` as int8, label columns
+    as int8 codes with their labels, dates as int32 epoch days and
+    ``buy_indices``/``sell_indices`` as int32. The remaining fields are
+    copied from the encoded JSON payload into the header.
+    """
+    encoded = result.binary_payloads.get(name)
+    if encoded is not None:
+        return encoded
+
+    frame = result.frame
+    if not frame.index.is_monotonic_increasing:
+        frame = frame.sort_index()
+    columns: List[Tuple[str, np.ndarray, Dict[str, Any]]] = [
+        ("dates", serialization.epoch_days(frame.index), {"unit": "day"})
+    ]
+    for field_name, column in BINARY_COLUMNS[name].items():
+        if column in _LABEL_FILLS:
+            labels = (
+                frame[column].astype(object).fillna(_LABEL_FILLS[column])
+            )
+            codes, uniques = pd.factorize(labels.astype(str))
+            columns.append(
+                (
+                    field_name,
+                    codes.astype(np.int8),
+                    {"labels": [str(label) for label in uniques]},
+                )
+            )
+            if column == "trade_signal":
+                for signal in ("Buy", "Sell"):
+                    indices = np.flatnonzero(labels.to_numpy() == signal)
+                    columns.append(
+                        (
+                            f"{signal.lower()}_indices",
+                            indices.astype(np.int32),
+                            {},
+                        )
+                    )
+        elif column == "position":
+            values = frame[column].fillna(0).to_numpy(dtype=np.int8)
+            columns.append((field_name, values, {}))
+        else:
+            decimals = SERIALIZED_DECIMALS[column]
+            if column in frame.columns:
+                values = frame[column].to_numpy()
+                if values.dtype != np.float32:
+                    values = np.round(values.astype(np.float64), decimals)
+                values = values.astype(np.float32, copy=False)
+            else:
+                values = np.full(len(frame), np.nan, dtype=np.float32)
+            columns.append((field_name, values, {"decimals": decimals}))
+
+    sent = {column_name for column_name, _values, _extra in columns}
+    payload = result.payloads[name]
+    meta = {
+        field_name: json.loads(payload[start:end])
+        for field_name, (start, end) in result.payload_fields[name].items()
+        if field_name not in sent
+    }
+    encoded = serialization.encode_columns(columns, meta)
+    result.binary_payloads[name] = encoded
+    return encoded
+
+
+def trade_ledger(result: PipelineResult) -> pd.DataFrame:
+    """Return the trade ledger of a result, extracting it once."""
+    if result.trades is None:
+        result.trades = trades.extract_trades(result.frame)
+    return result.trades
+
+
+def compact_frame(enriched: pd.DataFrame) -> pd.DataFrame:
+    """
+    Return a smaller copy of an enriched frame for caching.
+
+    Chart columns are rounded to their ``SERIALIZED_DECIMALS`` and stored
+    as float32 when that round-trips exactly through the serializer
+    (otherwise they stay float64), integer columns are downcast,
+    ``position`` becomes int8 and ``LABEL_COLUMNS`` become categoricals.
+    Columns used for further computation, such as 'return' and the
+    ``STATE_COLUMNS``, are kept at full precision.
+    """
+    result = enriched.copy()
+    for column, decimals in SERIALIZED_DECIMALS.items():
+        if column not in result.columns or column in STATE_COLUMNS:
+            continue
+        series = result[column]
+        if pd.api.types.is_integer_dtype(series.dtype):
+            result[column] = pd.to_numeric(series, downcast="integer")
+            continue
+        rounded = series.round(decimals).to_numpy(dtype=np.float64)
+        narrow = rounded.astype(np.float32)
+        restored = np.round(narrow.astype(np.float64), decimals)
+        if np.array_equal(restored, rounded, equal_nan=True):
+            result[column] = narrow
+
+    if "position" in result.columns:
+        result["position"] = result["position"].astype(np.int8)
+    for column in LABEL_COLUMNS:
+        if column in result.columns:
+            result[column] = result[column].astype("category")
+    return result
+
+
+def build_result(
+    base: pd.DataFrame,
+    params: Dict[str, int],
+    compact: bool = False,
+    periods_per_year: int = backtesting.TRADING_DAYS_PER_YEAR,
+) -> PipelineResult:
+    """
+    Run the parameter stages on ``base`` and pre-encode the payloads.
+
+    With ``compact=True`` the cached frame goes through
+    :func:`compact_frame` after the payloads were encoded.
+    """
+    enriched, metrics = run_parameter_stages(base, params, periods_per_year)
+    payloads, payload_fields = encode_payloads(
+        enriched, metrics, periods_per_year
+    )
+    if compact:
+        enriched = compact_frame(enriched)
+    return PipelineResult(
+        frame=enriched,
+        metrics=metrics,
+        payloads=payloads,
+        payload_fields=payload_fields,
+    )
@@ -0,0 +1,280 @@
+"""Precomputed strategy and benchmark statistics per sentiment regime."""
+
+from __future__ import annotations
+
+from math import sqrt
+from typing import Any, Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+from . import backtesting, heatmap, indicators, sentiment, strategy
+
+
+# Threshold axes, the same as the heatmap's.
+THRESHOLD_AXES: Dict[str, np.ndarray] = {
+    "extreme_fear_threshold": heatmap.GRID_AXES["extreme_fear_threshold"],
+    "extreme_greed_threshold": heatmap.GRID_AXES["extreme_greed_threshold"],
+}
+
+# Additive sums stored per cell; the statistics are derived from them,
+# so that cells can be summed over years before deriving.
+SUMS = (
+    "days",
+    "transitions",
+    "strategy_log_return",
+    "strategy_return",
+    "strategy_squared_return",
+    "benchmark_log_return",
+    "benchmark_return",
+    "benchmark_squared_return",
+    "active_days",
+    "winning_days",
+)
+
+STATISTICS = (
+    "days",
+    "transitions",
+    "strategy_return",
+    "benchmark_return",
+    "strategy_volatility",
+    "benchmark_volatility",
+    "strategy_hit_rate",
+)
+
+
+class RegimeCube:
+    """
+    Sums of per-period statistics by threshold pair, year and regime.
+
+    ``values`` has the shape (fear threshold, greed threshold, year,
+    regime, ``SUMS``), with regimes in the order of
+    ``sentiment.REGIMES``.
+    """
+
+    def __init__(
+        self,
+        values: np.ndarray,
+        axes: Dict[str, np.ndarray],
+        years: np.ndarray,
+        periods_per_year: int = backtesting.TRADING_DAYS_PER_YEAR,
+        version: str = "",
+    ) -> None:
+        self.values = values
+        self.axes = axes
+        self.years = years
+        self.periods_per_year = periods_per_year
+        self.version = version
+
+    def summary(
+        self,
+        extreme_fear_threshold: float,
+        extreme_greed_threshold: float,
+        year: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        """
+        Return the statistics of every regime for one threshold pair.
+
+        Thresholds snap to the nearest grid values. Returns compound over
+        the regime's periods and volatilities are annualized.
+
+        Parameters
+        ----------
+        extreme_fear_threshold, extreme_greed_threshold:
+            Threshold pair.
+        year:
+            Calendar year, or None for all years.
+
+        Returns
+        -------
+        dict
+            JSON-ready summary with one row per regime.
+        """
+        fear = int(
+            np.abs(
+                self.axes["extreme_fear_threshold"] - extreme_fear_threshold
+            ).argmin()
+        )
+        greed = int(
+            np.abs(
+                self.axes["extreme_greed_threshold"] - extreme_greed_threshold
+            ).argmin()
+        )
+        cell = self.values[fear, greed]
+        if year is None:
+            sums = cell.sum(axis=0)
+        else:
+            matches = np.flatnonzero(self.years == year)
+            if not len(matches):
+                raise ValueError(f"No data for year: {year}")
+            sums = cell[matches[0]]
+
+        columns = dict(zip(SUMS, sums.T.astype(np.float64)))
+        days = columns["days"]
+        scale = sqrt(self.periods_per_year)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            stats = {
+                "days": days,
+                "transitions": columns["transitions"],
+                "strategy_return": np.expm1(columns["strategy_log_return"]),
+                "benchmark_return": np.expm1(
+                    columns["benchmark_log_return"]
+                ),
+                "strategy_volatility": _volatility(
+                    days,
+                    columns["strategy_return"],
+                    columns["strategy_squared_return"],
+                )
+                * scale,
+                "benchmark_volatility": _volatility(
+                    days,
+                    columns["benchmark_return"],
+                    columns["benchmark_squared_return"],
+                )
+                * scale,
+                "strategy_hit_rate": np.where(
+                    columns["active_days"] > 0,
+                    columns["winning_days"] / columns["active_days"],
+                    np.nan,
+                ),
+            }
+
+        rows = []
+        for code, regime in enumerate(sentiment.REGIMES):
+            row: Dict[str, Any] = {"regime": regime}
+            for name in STATISTICS:
+                value = float(stats[name][code])
+                if name in ("days", "transitions"):
+                    row[name] = int(value)
+                else:
+                    row[name] = (
+                        None if np.isnan(value) else round(value, 4)
+                    )
+            rows.append(row)
+        return {
+            "extreme_fear_threshold": int(
+                self.axes["extreme_fear_threshold"][fear]
+            ),
+            "extreme_greed_threshold": int(
+                self.axes["extreme_greed_threshold"][greed]
+            ),
+            "year": year,
+            "years": self.years.tolist(),
+            "rows": rows,
+        }
+
+
+def _volatility(
+    count: np.ndarray, total: np.ndarray, squares: np.ndarray
+) -> np.ndarray:
+    """Sample standard deviation from count, sum and sum of squares."""
+    variance = (squares - total**2 / count) / (count - 1)
+    return np.where(count > 1, np.sqrt(np.maximum(variance, 0.0)), np.nan)
+
+
+def build_regime_cube(
+    base: pd.DataFrame,
+    short_window: int,
+    long_window: int,
+    axes: Optional[Dict[str, np.ndarray]] = None,
+    periods_per_year: int = backtesting.TRADING_DAYS_PER_YEAR,
+    version: str = "",
+) -> RegimeCube:
+    """
+    Aggregate strategy and benchmark returns per regime for all thresholds.
+
+    Regime codes and positions are computed for every threshold pair at
+    once (as in ``heatmap.build_cube``); each period is then assigned the
+    group ``(pair, year, regime)`` and every sum is one ``np.bincount``
+    over the group ids.
+
+    Parameters
+    ----------
+    base:
+        Output of ``pipeline.prepare_base`` (needs 'close', 'return',
+        'fg_value' and 'kalman_trend').
+    short_window, long_window:
+        Moving-average windows of the strategy.
+    axes:
+        Threshold axes; defaults to ``THRESHOLD_AXES``.
+    periods_per_year:
+        Bars per year, used to annualize volatilities.
+    version:
+        Version tag stored with the cube.
+
+    Returns
+    -------
+    RegimeCube
+        Cube of shape (fear, greed, year, regime, sum).
+    """
+    axes = THRESHOLD_AXES if axes is None else axes
+    fears = axes["extreme_fear_threshold"]
+    greeds = axes["extreme_greed_threshold"]
+
+    returns = np.nan_to_num(base["return"].to_numpy(dtype=float))
+    fg_values = base["fg_value"].to_numpy(dtype=float)
+    trend_up = base["kalman_trend"].to_numpy(dtype=float) > 0
+    short_ma = indicators.calculate_sma(base["close"], short_window)
+    long_ma = indicators.calculate_sma(base["close"], long_window)
+    short_ma, long_ma = short_ma.to_numpy(), long_ma.to_numpy()
+
+    # Regime codes and positions for every pair: (fear, greed, time),
+    # with the same masks as the heatmap.
+    fear_thresholds = fears[:, None, None]
+    greed_thresholds = greeds[None, :, None]
+    codes = sentiment.regime_codes(
+        fg_values, fear_thresholds, greed_thresholds
+    )
+    fear_mask = sentiment.extreme_fear_mask(fg_values, fear_thresholds)
+    greed_mask = sentiment.extreme_greed_mask(
+        fg_values, fear_thresholds, greed_thresholds
+    )
+    enter = (short_ma > long_ma) & trend_up & ~greed_mask
+    exit = (short_ma < long_ma) | fear_mask
+    positions = strategy.hysteresis_positions(enter, exit)
+    lagged = np.zeros_like(positions)
+    lagged[..., 1:] = positions[..., :-1]
+    strategy_returns = lagged * returns
+
+    years, year_codes = np.unique(
+        pd.DatetimeIndex(base.index).year, return_inverse=True
+    )
+    n_regimes = len(sentiment.REGIMES)
+    n_pairs = len(fears) * len(greeds)
+    n_groups = n_pairs * len(years) * n_regimes
+    pair_ids = np.arange(n_pairs).reshape(len(fears), len(greeds), 1)
+    groups = (
+        (pair_ids * len(years) + year_codes) * n_regimes + codes
+    ).ravel()
+
+    entered = np.zeros(codes.shape, dtype=bool)
+    entered[..., 1:] = codes[..., 1:] != codes[..., :-1]
+    weights = {
+        "days": None,
+        "transitions": entered,
+        "strategy_log_return": np.log1p(strategy_returns),
+        "strategy_return": strategy_returns,
+        "strategy_squared_return": strategy_returns**2,
+        "benchmark_log_return": np.log1p(returns),
+        "benchmark_return": returns,
+        "benchmark_squared_return": returns**2,
+        "active_days": lagged != 0,
+        "winning_days": (lagged != 0) & (strategy_returns > 0),
+    }
+
+    values = np.empty((n_groups, len(SUMS)), dtype=np.float64)
+    for k, name in enumerate(SUMS):
+        weight = weights[name]
+        if weight is not None:
+            weight = np.broadcast_to(weight, codes.shape).ravel()
+        values[:, k] = np.bincount(groups, weight, minlength=n_groups)
+
+    return RegimeCube(
+        values=values.reshape(
+            len(fears), len(greeds), len(years), n_regimes, len(SUMS)
+        ),
+        axes={name: np.asarray(v) for name, v in axes.items()},
+        years=years,
+        periods_per_year=periods_per_year,
+        version=version,
+    )
@@ -0,0 +1,270 @@
+"""Embedded SQLite store of backtest runs and their equity curves."""
+
+from __future__ import annotations
+
+import contextlib
+import sqlite3
+import time
+import zlib
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from . import backtesting, pipeline, timeframes
+
+
+PARAMETER_COLUMNS = tuple(pipeline.DEFAULT_PARAMETERS)
+
+_SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    run_key TEXT NOT NULL UNIQUE,
+    ticker TEXT NOT NULL,
+    timeframe TEXT NOT NULL DEFAULT '{timeframes.DEFAULT_TIMEFRAME}',
+    start_date TEXT NOT NULL,
+    end_date TEXT NOT NULL,
+    {", ".join(f"{name} INTEGER NOT NULL" for name in PARAMETER_COLUMNS)},
+    pipeline_version INTEGER NOT NULL,
+    result_version TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    {", ".join(f"{name} REAL" for name in backtesting.METRIC_NAMES)},
+    latest_signal TEXT,
+    n_obs INTEGER NOT NULL,
+    dates BLOB NOT NULL,
+    strategy_equity BLOB NOT NULL,
+    benchmark_equity BLOB NOT NULL
+);
+"""
+
+# Created after older databases gained the timeframe column.
+_INDEXES = f"""
+DROP INDEX IF EXISTS runs_ticker_version;
+CREATE INDEX IF NOT EXISTS runs_ticker_timeframe_version
+    ON runs (ticker, timeframe, pipeline_version, result_version);
+CREATE INDEX IF NOT EXISTS runs_parameters
+    ON runs ({", ".join(PARAMETER_COLUMNS)});
+CREATE INDEX IF NOT EXISTS runs_date_range ON runs (start_date, end_date);
+CREATE INDEX IF NOT EXISTS runs_result_version ON runs (result_version);
+CREATE INDEX IF NOT EXISTS runs_ticker_sharpe
+    ON runs (ticker, strategy_sharpe_ratio);
+"""
+
+# Columns returned by queries; the equity blobs are only read on demand.
+_SUMMARY_COLUMNS = (
+    ("id", "ticker", "timeframe", "start_date", "end_date")
+    + PARAMETER_COLUMNS
+    + ("pipeline_version", "result_version", "created_at")
+    + backtesting.METRIC_NAMES
+    + ("latest_signal", "n_obs")
+)
+
+
+def _pack(values: np.ndarray, dtype: str) -> bytes:
+    return zlib.compress(np.ascontiguousarray(values, dtype=dtype).tobytes())
+
+
+def _unpack(blob: bytes, dtype: str) -> np.ndarray:
+    return np.frombuffer(zlib.decompress(blob), dtype=dtype)
+
+
+class ResultsStore:
+    """
+    Persist backtest metrics and equity curves in one SQLite file.
+
+    Runs are keyed by result version, ticker, timeframe, date range and
+    parameters, so recording the same run again replaces it. Equity
+    curves are stored as zlib-compressed float32 arrays next to the dates
+    as int32 days since the epoch. Each operation opens its own
+    connection, so a store can be shared between threads and processes.
+
+    Parameters
+    ----------
+    path:
+        Database file; created with its schema if missing.
+    """
+
+    def __init__(self, path: str | Path) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as connection:
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.executescript(_SCHEMA)
+            columns = {
+                row["name"]
+                for row in connection.execute("PRAGMA table_info(runs)")
+            }
+            if "timeframe" not in columns:
+                # Databases written before runs had a timeframe.
+                connection.execute(
+                    "ALTER TABLE runs ADD COLUMN timeframe TEXT NOT NULL "
+                    f"DEFAULT '{timeframes.DEFAULT_TIMEFRAME}'"
+                )
+            connection.executescript(_INDEXES)
+
+    @contextlib.contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        connection = sqlite3.connect(self.path, timeout=30)
+        connection.row_factory = sqlite3.Row
+        try:
+            with connection:
+                yield connection
+        finally:
+            connection.close()
+
+    def record(
+        self,
+        ticker: str,
+        start_date: str,
+        end_date: str,
+        params: Dict[str, int],
+        metrics: Dict[str, float],
+        dates: Sequence,
+        strategy_equity: np.ndarray,
+        benchmark_equity: np.ndarray,
+        result_version: str,
+        latest_signal: Optional[str] = None,
+        timeframe: str = timeframes.DEFAULT_TIMEFRAME,
+    ) -> int:
+        """
+        Insert or replace one run.
+
+        Returns
+        -------
+        int
+            Row id of the run.
+        """
+        days = pd.DatetimeIndex(dates).values.astype("datetime64[D]")
+        row: Dict[str, Any] = {
+            "run_key": "|".join(
+                [
+                    result_version,
+                    ticker,
+                    timeframe,
+                    start_date,
+                    end_date,
+                    pipeline.params_token(params),
+                ]
+            ),
+            "ticker": ticker,
+            "timeframe": timeframe,
+            "start_date": start_date,
+            "end_date": end_date,
+            "pipeline_version": pipeline.PIPELINE_VERSION,
+            "result_version": result_version,
+            "created_at": time.time(),
+            "latest_signal": latest_signal,
+            "n_obs": len(days),
+            "dates": _pack(days.astype(np.int64), "<i4"),
+            "strategy_equity": _pack(strategy_equity, "<f4"),
+            "benchmark_equity": _pack(benchmark_equity, "<f4"),
+        }
+        row.update({name: int(params[name]) for name in PARAMETER_COLUMNS})
+        row.update(
+            {name: metrics.get(name) for name in backtesting.METRIC_NAMES}
+        )
+
+        names = list(row)
+        updates = ", ".join(
+            f"{name} = excluded.{name}" for name in names if name != "run_key"
+        )
+        with self._connect() as connection:
+            connection.execute(
+                f"INSERT INTO runs ({', '.join(names)}) "
+                f"VALUES ({', '.join('?' * len(names))}) "
+                f"ON CONFLICT(run_key) DO UPDATE SET {updates}",
+                [row[name] for name in names],
+            )
+            found = connection.execute(
+                "SELECT id FROM runs WHERE run_key = ?", (row["run_key"],)
+            ).fetchone()
+        return int(found["id"])
+
+    def top_runs(
+        self,
+        metric: str = "strategy_sharpe_ratio",
+        limit: int = 20,
+        ticker: Optional[str] = None,
+        min_pipeline_version: Optional[int] = None,
+        result_version: Optional[str] = None,
+        params: Optional[Dict[str, int]] = None,
+        timeframe: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Return the best runs by ``metric``, highest first.
+
+        Parameters
+        ----------
+        metric:
+            One of ``backtesting.METRIC_NAMES``.
+        limit:
+            Maximum number of runs.
+        ticker, timeframe, result_version:
+            Exact filters (None = any).
+        min_pipeline_version:
+            Only runs computed by this pipeline version or later.
+        params:
+            Exact filters on strategy parameters.
+
+        Returns
+        -------
+        list[dict[str, Any]]
+            Run summaries without equity curves.
+        """
+        if metric not in backtesting.METRIC_NAMES:
+            raise ValueError(f"Unknown metric: {metric}")
+
+        clauses: List[str] = [f"{metric} IS NOT NULL"]
+        values: List[Any] = []
+        if ticker is not None:
+            clauses.append("ticker = ?")
+            values.append(ticker)
+        if timeframe is not None:
+            clauses.append("timeframe = ?")
+            values.append(timeframe)
+        if min_pipeline_version is not None:
+            clauses.append("pipeline_version >= ?")
+            values.append(int(min_pipeline_version))
+        if result_version is not None:
+            clauses.append("result_version = ?")
+            values.append(result_version)
+        for name, value in (params or {}).items():
+            if name not in PARAMETER_COLUMNS:
+                raise ValueError(f"Unknown parameter: {name}")
+            clauses.append(f"{name} = ?")
+            values.append(int(value))
+        values.append(int(limit))
+
+        query = (
+            f"SELECT {', '.join(_SUMMARY_COLUMNS)} FROM runs "
+            f"WHERE {' AND '.join(clauses)} "
+            f"ORDER BY {metric} DESC LIMIT ?"
+        )
+        with self._connect() as connection:
+            rows = connection.execute(query, values).fetchall()
+        return [dict(row) for row in rows]
+
+    def get_run(self, run_id: int) -> Optional[Dict[str, Any]]:
+        """
+        Return one run with its equity curves, or None if unknown.
+
+        The curves are returned as 'dates' (ISO strings),
+        'strategy_equity' and 'benchmark_equity' lists.
+        """
+        with self._connect() as connection:
+            row = connection.execute(
+                f"SELECT {', '.join(_SUMMARY_COLUMNS)}, dates, "
+                "strategy_equity, benchmark_equity FROM runs WHERE id = ?",
+                (int(run_id),),
+            ).fetchone()
+        if row is None:
+            return None
+
+        run = {name: row[name] for name in _SUMMARY_COLUMNS}
+        days = _unpack(row["dates"], "<i4").astype("datetime64[D]")
+        run["dates"] = np.datetime_as_string(days).tolist()
+        for name in ("strategy_equity", "benchmark_equity"):
+            values = _unpack(row[name], "<f4").astype(np.float64)
+            run[name] = np.round(values, 3).tolist()
+        return run
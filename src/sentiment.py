@@ -1,6 +1,7 @@
 """Sentiment processing utilities for the trading strategy."""
 
 from __future__ import annotations
+import numpy as np
 import pandas as pd
 from typing import Tuple
 
@@ -43,6 +44,63 @@ def add_sentiment_regime(
     return result
 
 
+def extreme_fear_mask(
+    values: np.ndarray, extreme_fear_threshold
+) -> np.ndarray:
+    """
+    Vectorized ``classify_sentiment_value(...) == "Extreme Fear"``.
+
+    Thresholds may be arrays that broadcast against ``values``.
+    """
+    return np.asarray(values) <= extreme_fear_threshold
+
+
+def extreme_greed_mask(
+    values: np.ndarray, extreme_fear_threshold, extreme_greed_threshold
+) -> np.ndarray:
+    """
+    Vectorized ``classify_sentiment_value(...) == "Extreme Greed"``.
+
+    Written as negated comparisons so that NaN values classify exactly
+    as in the scalar function.
+    """
+    values = np.asarray(values)
+    return (
+        ~(values <= extreme_fear_threshold)
+        & ~(values < 45)
+        & ~(values <= 55)
+        & ~(values < extreme_greed_threshold)
+    )
+
+
+# Regimes of ``classify_sentiment_value`` in the order of their codes.
+REGIMES = ("Extreme Fear", "Fear", "Neutral", "Greed", "Extreme Greed")
+
+
+def regime_codes(
+    values: np.ndarray, extreme_fear_threshold, extreme_greed_threshold
+) -> np.ndarray:
+    """
+    Vectorized ``REGIMES.index(classify_sentiment_value(...))`` as int8.
+
+    Thresholds may be arrays that broadcast against ``values``. Later
+    assignments take precedence, mirroring the order of the checks in the
+    scalar function; NaN values end up in "Extreme Greed" as there.
+    """
+    values = np.asarray(values)
+    shape = np.broadcast_shapes(
+        values.shape,
+        np.shape(extreme_fear_threshold),
+        np.shape(extreme_greed_threshold),
+    )
+    codes = np.full(shape, 4, dtype=np.int8)
+    codes[np.broadcast_to(values < extreme_greed_threshold, shape)] = 3
+    codes[np.broadcast_to(values <= 55, shape)] = 2
+    codes[np.broadcast_to(values < 45, shape)] = 1
+    codes[np.broadcast_to(values <= extreme_fear_threshold, shape)] = 0
+    return codes
+
+
 def is_extreme_fear(regime: str) -> bool:
     """Return True if the sentiment regime represents extreme fear."""
     return regime == "Extreme Fear"
@@ -2,22 +2,47 @@
 
 from __future__ import annotations
 
-from typing import Dict, List
+import json
+import struct
+from typing import Any, Dict, List, Sequence, Tuple
 
+import numpy as np
 import pandas as pd
 
 
+# Media type of the binary columnar payloads (JSON stays the default).
+COLUMNS_MIMETYPE = "application/vnd.algo-dash.columns"
+
+_COLUMNS_MAGIC = b"ADC1"
+
+# Column buffers start at multiples of this many bytes, so that clients
+# can view them as typed arrays in place.
+_COLUMNS_ALIGNMENT = 8
+
+
 def _to_list_handle_nan(series: pd.Series) -> List:
     """Convert a pandas Series to a list, replacing NaNs with None."""
     return [None if pd.isna(x) else x for x in series.tolist()]
 
 
+def _rounded(series: pd.Series, decimals: int) -> List:
+    """Round a numeric series and list it; float32 is rounded as float64."""
+    if series.dtype == np.float32:
+        series = series.astype(np.float64)
+    return _to_list_handle_nan(series.round(decimals))
+
+
+def _labels(series: pd.Series, fill: str) -> List[str]:
+    """Convert a label column (object or categorical) to strings."""
+    return series.astype(object).fillna(fill).astype(str).tolist()
+
+
 def _optional_series(
     df: pd.DataFrame, column: str, decimals: int = 2
 ) -> List:
     if column not in df.columns:
         return [None] * len(df)
-    return _to_list_handle_nan(df[column].round(decimals))
+    return _rounded(df[column], decimals)
 
 
 def serialize_time_series(data: pd.DataFrame) -> Dict[str, List]:
@@ -33,28 +58,20 @@ def serialize_time_series(data: pd.DataFrame) -> Dict[str, List]:
     # by converting them to None, which becomes Valid JSON 'null'.
     payload = {
         "dates": dates,
-        "close": _to_list_handle_nan(df["close"].round(2)),
-        "sma_short": _to_list_handle_nan(df["sma_short"].round(2)),
-        "sma_long": _to_list_handle_nan(df["sma_long"].round(2)),
+        "close": _rounded(df["close"], 2),
+        "sma_short": _rounded(df["sma_short"], 2),
+        "sma_long": _rounded(df["sma_long"], 2),
         "bb_middle": _optional_series(df, "bb_middle"),
         "bb_upper": _optional_series(df, "bb_upper"),
         "bb_lower": _optional_series(df, "bb_lower"),
-        "kalman_trend": _to_list_handle_nan(df["kalman_trend"].round(2)),
+        "kalman_trend": _rounded(df["kalman_trend"], 2),
         "position": df["position"].fillna(0).astype(int).tolist(),
-        "trade_signal": df["trade_signal"].fillna("Hold").astype(str).tolist(),
+        "trade_signal": _labels(df["trade_signal"], "Hold"),
     }
 
-    buy_indices = [
-        i for i, signal in enumerate(payload["trade_signal"])
-        if signal == "Buy"
-    ]
-    sell_indices = [
-        i for i, signal in enumerate(payload["trade_signal"])
-        if signal == "Sell"
-    ]
-
-    payload["buy_indices"] = buy_indices
-    payload["sell_indices"] = sell_indices
+    signal = df["trade_signal"]
+    payload["buy_indices"] = np.flatnonzero(signal == "Buy").tolist()
+    payload["sell_indices"] = np.flatnonzero(signal == "Sell").tolist()
     return payload
 
 
@@ -69,10 +86,8 @@ def serialize_sentiment(data: pd.DataFrame) -> Dict[str, List]:
 
     payload = {
         "dates": dates,
-        "fg_value": _to_list_handle_nan(df["fg_value"].round(0)),
-        "sentiment_regime": (
-            df["sentiment_regime"].fillna("Unknown").astype(str).tolist()
-        ),
+        "fg_value": _rounded(df["fg_value"], 0),
+        "sentiment_regime": _labels(df["sentiment_regime"], "Unknown"),
     }
     return payload
 
@@ -90,12 +105,105 @@ def serialize_performance(
 
     payload = {
         "dates": dates,
-        "strategy_equity": _to_list_handle_nan(
-            df["strategy_equity"].round(3)
-        ),
-        "benchmark_equity": _to_list_handle_nan(
-            df["benchmark_equity"].round(3)
-        ),
+        "strategy_equity": _rounded(df["strategy_equity"], 3),
+        "benchmark_equity": _rounded(df["benchmark_equity"], 3),
         "metrics": metrics,
     }
     return payload
+
+
+def epoch_days(index: pd.Index) -> np.ndarray:
+    """Return a date index as int32 days since 1970-01-01."""
+    days = pd.DatetimeIndex(index).values.astype("datetime64[D]")
+    return days.astype(np.int32)
+
+
+def encode_columns(
+    columns: Sequence[Tuple[str, np.ndarray, Dict[str, Any]]],
+    meta: Dict[str, Any],
+) -> bytearray:
+    """
+    Encode arrays as one binary columnar payload.
+
+    The layout is the magic ``ADC1``, the header length as a little-endian
+    uint32 and a JSON header, followed by the column buffers. The header
+    lists every column's name, dtype ('f4', 'i1' or 'i4', little-endian),
+    length and byte offset from the first buffer, plus the column's extra
+    fields (e.g. 'decimals' or 'labels'), and carries ``meta`` as is.
+    Buffers are aligned to 8 bytes and copied straight from the arrays
+    into the single output buffer.
+
+    Parameters
+    ----------
+    columns:
+        ``(name, values, extra)`` triples; ``values`` must be
+        one-dimensional float32, int8 or int32 arrays.
+    meta:
+        JSON-ready fields that are not columns, e.g. metrics.
+
+    Returns
+    -------
+    bytearray
+        The encoded payload, returned without a final copy; callers that
+        cache it must not modify it.
+    """
+    specs = []
+    buffers = []
+    offset = 0
+    for name, values, extra in columns:
+        dtype = values.dtype.newbyteorder("<")
+        code = f"{dtype.kind}{dtype.itemsize}"
+        if code not in ("f4", "i1", "i4") or values.ndim != 1:
+            raise ValueError(f"Unsupported column {name}: {values.dtype}")
+        values = np.ascontiguousarray(values, dtype=dtype)
+        specs.append(
+            dict(
+                extra,
+                name=name,
+                dtype=code,
+                length=len(values),
+                offset=offset,
+            )
+        )
+        buffers.append((offset, values))
+        offset = _aligned(offset + values.nbytes)
+
+    header = json.dumps(
+        {"columns": specs, "meta": meta}, separators=(",", ":")
+    ).encode("utf-8")
+    start = _aligned(8 + len(header))
+    encoded = bytearray(start + offset)
+    encoded[:4] = _COLUMNS_MAGIC
+    struct.pack_into("<I", encoded, 4, len(header))
+    encoded[8:8 + len(header)] = header
+    for position, values in buffers:
+        begin = start + position
+        encoded[begin:begin + values.nbytes] = memoryview(values).cast("B")
+    return encoded
+
+
+def decode_columns(payload: bytes | bytearray) -> Dict[str, Any]:
+    """
+    Decode :func:`encode_columns` output into ``meta`` plus the columns.
+
+    Columns are returned as read-only NumPy views on ``payload``.
+    """
+    payload = memoryview(payload).toreadonly()
+    if payload[:4] != _COLUMNS_MAGIC:
+        raise ValueError("Not a columnar payload.")
+    (length,) = struct.unpack_from("<I", payload, 4)
+    header = json.loads(payload[8:8 + length].tobytes())
+    start = _aligned(8 + length)
+    decoded = dict(header["meta"])
+    for spec in header["columns"]:
+        decoded[spec["name"]] = np.frombuffer(
+            payload,
+            dtype=np.dtype(spec["dtype"]).newbyteorder("<"),
+            count=spec["length"],
+            offset=start + spec["offset"],
+        )
+    return decoded
+
+
+def _aligned(size: int) -> int:
+    return -(-size // _COLUMNS_ALIGNMENT) * _COLUMNS_ALIGNMENT
@@ -0,0 +1,192 @@
+"""On-disk result cache shared by several worker processes."""
+
+from __future__ import annotations
+
+import contextlib
+import fcntl
+import hashlib
+import json
+import os
+import shutil
+from pathlib import Path
+from typing import Callable, Iterator, Optional
+
+from . import frame_store
+from .pipeline import PipelineResult
+
+
+# Directory lock held while entries are pruned.
+LOCK_FILE = ".lock"
+
+
+class SharedResultCache:
+    """
+    Cache of pipeline results stored in a directory on local disk.
+
+    Every entry is a directory holding the frame columns as ``.npy`` files,
+    the metrics and the pre-encoded payloads. Readers memory-map the
+    columns, so all processes share one copy of each entry in the page
+    cache. A per-key ``flock`` guarantees that only one process computes
+    a missing entry while the others wait for it.
+
+    The first cache of a new version removes the entries and lock files
+    of all other versions, and every version keeps at most
+    ``max_entries`` entries: reads mark an entry as used, and writes
+    beyond the limit remove the least recently used ones.
+
+    Parameters
+    ----------
+    directory:
+        Cache directory; created if missing.
+    version:
+        Result version tag. Entries of other versions are never returned.
+    max_entries:
+        Maximum number of entries of this version (None = unlimited).
+    """
+
+    def __init__(
+        self,
+        directory: str | Path,
+        version: str = "",
+        max_entries: Optional[int] = None,
+    ) -> None:
+        self.directory = Path(directory)
+        self.version = version
+        self.max_entries = max_entries
+        name = version or "default"
+        self._entries = self.directory / "entries" / name
+        self._locks = self.directory / "locks" / name
+        self.directory.mkdir(parents=True, exist_ok=True)
+        if not self._entries.is_dir():
+            with self._directory_locked():
+                self._remove_other_versions()
+        self._entries.mkdir(parents=True, exist_ok=True)
+        self._locks.mkdir(parents=True, exist_ok=True)
+
+    def _digest(self, key: str) -> str:
+        tagged = f"{self.version}|{key}"
+        return hashlib.sha1(tagged.encode("utf-8")).hexdigest()
+
+    def _entry_dir(self, key: str) -> Path:
+        return self._entries / self._digest(key)
+
+    @contextlib.contextmanager
+    def _flocked(self, lock_path: Path) -> Iterator[None]:
+        with open(lock_path, "a+") as handle:
+            fcntl.flock(handle.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
+
+    def _locked(self, key: str) -> contextlib.AbstractContextManager:
+        self._locks.mkdir(parents=True, exist_ok=True)
+        return self._flocked(self._locks / f"{self._digest(key)}.lock")
+
+    def _directory_locked(self) -> contextlib.AbstractContextManager:
+        return self._flocked(self.directory / LOCK_FILE)
+
+    def _remove_other_versions(self) -> None:
+        """Delete the entries and locks of other versions (lock held)."""
+        for parent in (self.directory / "entries", self.directory / "locks"):
+            if not parent.is_dir():
+                continue
+            for path in parent.iterdir():
+                if path.name != self._entries.name:
+                    shutil.rmtree(path, ignore_errors=True)
+
+    def _prune(self) -> None:
+        """Delete the least recently used entries beyond ``max_entries``."""
+        if self.max_entries is None:
+            return
+        entries = []
+        for path in self._entries.iterdir():
+            # Skip entries still being written ('.{digest}.{pid}.{uuid}').
+            if path.name.startswith("."):
+                continue
+            try:
+                entries.append((path.stat().st_mtime_ns, path))
+            except FileNotFoundError:
+                continue
+        if len(entries) <= self.max_entries:
+            return
+        entries.sort()
+        for _used, path in entries[: len(entries) - self.max_entries]:
+            shutil.rmtree(path, ignore_errors=True)
+            (self._locks / f"{path.name}.lock").unlink(missing_ok=True)
+
+    def get(self, key: str) -> Optional[PipelineResult]:
+        """Return the stored result for ``key`` or None."""
+        entry_dir = self._entry_dir(key)
+        try:
+            os.utime(entry_dir)
+            return read_result(entry_dir)
+        except FileNotFoundError:
+            # Missing, or pruned by another process while being read.
+            return None
+
+    def put(self, key: str, result: PipelineResult) -> None:
+        """Store ``result`` under ``key``; an existing entry is kept."""
+        frame_store.write_atomically(
+            self._entry_dir(key),
+            lambda tmp_dir: write_result(tmp_dir, result),
+        )
+        if self.max_entries is not None:
+            with self._directory_locked():
+                self._prune()
+
+    def get_or_compute(
+        self, key: str, compute: Callable[[], PipelineResult]
+    ) -> PipelineResult:
+        """
+        Return the entry for ``key``, computing it in at most one process.
+
+        The returned result is always read back from disk, so its frame is
+        memory-mapped rather than a private copy.
+        """
+        result = self.get(key)
+        if result is not None:
+            return result
+
+        with self._locked(key):
+            result = self.get(key)
+            if result is not None:
+                return result
+            self.put(key, compute())
+
+        return self.get(key)
+
+
+def write_result(directory: str | Path, result: PipelineResult) -> None:
+    """Write a pipeline result into ``directory``."""
+    directory = Path(directory)
+    frame_store.write_frame(directory / "frame", result.frame)
+    (directory / "metrics.json").write_text(
+        json.dumps(result.metrics), encoding="utf-8"
+    )
+    for name, payload in result.payloads.items():
+        (directory / f"payload-{name}.json").write_bytes(payload)
+    (directory / "payload_fields.json").write_text(
+        json.dumps(result.payload_fields), encoding="utf-8"
+    )
+
+
+def read_result(directory: str | Path, mmap: bool = True) -> PipelineResult:
+    """Read a pipeline result written by :func:`write_result`."""
+    directory = Path(directory)
+    metrics = json.loads(
+        (directory / "metrics.json").read_text(encoding="utf-8")
+    )
+    payloads = {
+        path.stem[len("payload-"):]: path.read_bytes()
+        for path in directory.glob("payload-*.json")
+    }
+    payload_fields = json.loads(
+        (directory / "payload_fields.json").read_text(encoding="utf-8")
+    )
+    return PipelineResult(
+        frame=frame_store.read_frame(directory / "frame", mmap=mmap),
+        metrics=metrics,
+        payloads=payloads,
+        payload_fields=payload_fields,
+    )
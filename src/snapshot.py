@@ -0,0 +1,192 @@
+"""Versioned on-disk snapshots of the hottest cached pipeline results."""
+
+from __future__ import annotations
+
+import contextlib
+import fcntl
+import json
+import os
+import shutil
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Callable, Dict, Iterator, Mapping, Optional
+
+from . import frame_store
+from .pipeline import PipelineResult
+from .shared_cache import read_result, write_result
+
+
+CURRENT_FILE = "CURRENT"
+MANIFEST_FILE = "manifest.json"
+LOCK_FILE = ".lock"
+
+
+class SnapshotStore:
+    """
+    Save and restore cache snapshots tagged with a result version.
+
+    A snapshot is a directory with one sub-directory per entry (see
+    :func:`shared_cache.write_result`) and a manifest mapping cache keys
+    to those sub-directories. The ``CURRENT`` file names the latest
+    snapshot; it is replaced atomically so readers never see a partial
+    snapshot. Saves from several processes are serialized by a ``flock``
+    on the store, and each save only removes snapshots older than the
+    current one, so a snapshot is never deleted while it is current.
+    Snapshots written under another version are ignored and removed on
+    the next save.
+
+    Parameters
+    ----------
+    directory:
+        Snapshot root directory; created if missing.
+    version:
+        Version tag, e.g. from :func:`pipeline.result_version`.
+    """
+
+    def __init__(self, directory: str | Path, version: str) -> None:
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.version = version
+
+    @contextlib.contextmanager
+    def _locked(self) -> Iterator[None]:
+        with open(self.directory / LOCK_FILE, "a+") as handle:
+            fcntl.flock(handle.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
+
+    @staticmethod
+    def _created(snapshot_dir: Path) -> int:
+        # Names end in '-{time_ns}-{pid}'; the version may contain '-'.
+        try:
+            return int(snapshot_dir.name.rsplit("-", 2)[-2])
+        except (IndexError, ValueError):
+            return -1
+
+    def _current(self) -> Optional[Path]:
+        pointer = self.directory / CURRENT_FILE
+        if not pointer.exists():
+            return None
+        snapshot_dir = self.directory / pointer.read_text().strip()
+        manifest_path = snapshot_dir / MANIFEST_FILE
+        if not manifest_path.exists():
+            return None
+        return snapshot_dir
+
+    def load_index(self) -> Dict[str, Path]:
+        """
+        Return the entry directories of the current snapshot by cache key.
+
+        Only the manifest is read; entries are loaded later with
+        :meth:`load_entry`. An empty dict is returned if there is no
+        snapshot for this version.
+        """
+        snapshot_dir = self._current()
+        if snapshot_dir is None:
+            return {}
+        manifest = json.loads(
+            (snapshot_dir / MANIFEST_FILE).read_text(encoding="utf-8")
+        )
+        if manifest.get("version") != self.version:
+            return {}
+        return {
+            key: snapshot_dir / name
+            for key, name in manifest["entries"].items()
+        }
+
+    @staticmethod
+    def load_entry(entry_dir: Path) -> PipelineResult:
+        """Load one snapshot entry with memory-mapped columns."""
+        return read_result(entry_dir, mmap=True)
+
+    def save(
+        self,
+        results: Mapping[str, PipelineResult],
+        hits: Mapping[str, int],
+        max_entries: int = 32,
+    ) -> Path:
+        """
+        Write the ``max_entries`` most used results as the new snapshot.
+
+        Parameters
+        ----------
+        results:
+            Cached results by cache key.
+        hits:
+            Access counts by cache key, used to rank the entries.
+        max_entries:
+            Maximum number of entries to keep.
+
+        Returns
+        -------
+        Path
+            Directory of the new snapshot.
+        """
+        ranked = sorted(
+            results, key=lambda key: hits.get(key, 0), reverse=True
+        )[:max_entries]
+        name = f"snapshot-{self.version}-{time.time_ns()}-{os.getpid()}"
+
+        def _write(tmp_dir: Path) -> None:
+            tmp_dir.mkdir(parents=True)
+            entries = {}
+            for position, key in enumerate(ranked):
+                entry_name = f"entry{position}"
+                write_result(tmp_dir / entry_name, results[key])
+                entries[key] = entry_name
+            manifest = {"version": self.version, "entries": entries}
+            (tmp_dir / MANIFEST_FILE).write_text(
+                json.dumps(manifest), encoding="utf-8"
+            )
+
+        snapshot_dir = self.directory / name
+        with self._locked():
+            frame_store.write_atomically(snapshot_dir, _write)
+
+            pointer_tmp = self.directory / (
+                f".{CURRENT_FILE}.{os.getpid()}.{uuid.uuid4().hex}"
+            )
+            pointer_tmp.write_text(name)
+            os.replace(pointer_tmp, self.directory / CURRENT_FILE)
+
+            self._prune()
+        return snapshot_dir
+
+    def _prune(self) -> None:
+        """Remove the snapshots older than the current one (lock held)."""
+        current = self._current()
+        if current is None:
+            return
+        cutoff = self._created(current)
+        for path in self.directory.glob("snapshot-*"):
+            if path != current and self._created(path) < cutoff:
+                shutil.rmtree(path, ignore_errors=True)
+
+
+def start_periodic_snapshots(
+    save: Callable[[], None], interval: float
+) -> threading.Event:
+    """
+    Call ``save`` every ``interval`` seconds on a daemon thread.
+
+    Returns
+    -------
+    threading.Event
+        Set the event to stop the thread.
+    """
+    stop = threading.Event()
+
+    def _run() -> None:
+        while not stop.wait(interval):
+            try:
+                save()
+            except Exception as e:
+                print(f"Snapshot error: {e}")
+
+    thread = threading.Thread(target=_run, name="snapshots", daemon=True)
+    thread.start()
+    return stop
@@ -4,11 +4,41 @@ from __future__ import annotations
 
 from typing import Tuple
 
+import numpy as np
 import pandas as pd
 
+from . import kernels
 from .sentiment import is_extreme_fear, is_extreme_greed
 
 
+def next_position(
+    current_position: int,
+    short_ma: float,
+    long_ma: float,
+    trend: float,
+    regime: str,
+) -> int:
+    """
+    Apply the entry/exit rules to one bar given the previous position.
+    """
+    enter_long = (
+        (short_ma > long_ma)
+        and (trend > 0)
+        and not is_extreme_greed(regime)
+    )
+
+    exit_or_avoid = (
+        (short_ma < long_ma)
+        or is_extreme_fear(regime)
+    )
+
+    if enter_long:
+        return 1
+    if exit_or_avoid:
+        return 0
+    return current_position
+
+
 def generate_positions(
     data: pd.DataFrame,
     short_ma_col: str = "sma_short",
@@ -21,35 +51,36 @@ def generate_positions(
     """
     result = data.copy()
 
-    short_ma = result[short_ma_col]
-    long_ma = result[long_ma_col]
-    trend = result[trend_col]
-    sentiment = result[sentiment_col]
-
-    positions = []
-    current_position = 0
-
-    for idx in result.index:
-        enter_long = (
-            (short_ma.loc[idx] > long_ma.loc[idx])
-            and (trend.loc[idx] > 0)
-            and not is_extreme_greed(sentiment.loc[idx])
-        )
-
-        exit_or_avoid = (
-            (short_ma.loc[idx] < long_ma.loc[idx])
-            or is_extreme_fear(sentiment.loc[idx])
-        )
+    short_ma = result[short_ma_col].to_numpy(dtype=float)
+    long_ma = result[long_ma_col].to_numpy(dtype=float)
+    trend = result[trend_col].to_numpy(dtype=float)
+    regime = result[sentiment_col]
+
+    # The rules of ``next_position`` for all bars; NaN comparisons are
+    # False there as here.
+    enter = (
+        (short_ma > long_ma)
+        & (trend > 0)
+        & ~(regime == "Extreme Greed").to_numpy()
+    )
+    exit = (short_ma < long_ma) | (regime == "Extreme Fear").to_numpy()
+    result["position"] = hysteresis_positions(enter, exit).astype(np.int64)
+    return result
 
-        if enter_long:
-            current_position = 1
-        elif exit_or_avoid:
-            current_position = 0
 
-        positions.append(current_position)
+def hysteresis_positions(enter: np.ndarray, exit: np.ndarray) -> np.ndarray:
+    """
+    Apply the ``next_position`` state machine to whole arrays.
 
-    result["position"] = positions
-    return result
+    Along the last axis, the position becomes 1 where ``enter`` is True,
+    0 where only ``exit`` is True, and otherwise keeps its previous value
+    (starting flat). Leading axes are independent scenarios. Runs in the
+    active ``kernels`` backend.
+    """
+    enter, exit = np.broadcast_arrays(
+        np.asarray(enter, dtype=bool), np.asarray(exit, dtype=bool)
+    )
+    return kernels.get_kernel("hysteresis_positions")(enter, exit)
 
 
 def generate_trade_signals(data: pd.DataFrame) -> pd.DataFrame:
@@ -0,0 +1,139 @@
+"""Bar timeframes and resampling of daily data to coarser bars."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+
+import pandas as pd
+
+from . import backtesting
+
+
+@dataclass(frozen=True)
+class Timeframe:
+    """
+    Bar size offered by the dashboard.
+
+    ``rule`` is the pandas offset alias daily bars are resampled with
+    (None for the native daily bars) and ``periods_per_year`` the number
+    of bars used to annualize the Sharpe ratio.
+    """
+
+    name: str
+    label: str
+    rule: Optional[str]
+    periods_per_year: int
+
+
+DEFAULT_TIMEFRAME = "1D"
+
+TIMEFRAMES: Dict[str, Timeframe] = {
+    timeframe.name: timeframe
+    for timeframe in (
+        Timeframe(
+            "1D", "Daily", None, backtesting.TRADING_DAYS_PER_YEAR
+        ),
+        Timeframe("1W", "Weekly", "W-SUN", 52),
+        Timeframe("1M", "Monthly", "ME", 12),
+    )
+}
+
+# How each column of the merged data is aggregated into one bar.
+AGGREGATIONS: Dict[str, str] = {
+    "open": "first",
+    "high": "max",
+    "low": "min",
+    "close": "last",
+    "volume": "sum",
+    "fg_value": "last",
+    "fg_classification": "last",
+}
+
+
+def get_timeframe(name: str) -> Timeframe:
+    """Return the timeframe called ``name``; ValueError if unknown."""
+    try:
+        return TIMEFRAMES[name]
+    except KeyError:
+        raise ValueError(f"Unknown timeframe: {name}") from None
+
+
+def _period_ends(index: pd.Index, rule: str) -> pd.Series:
+    # Bars are labelled with the last date they contain, so that a bar
+    # still in progress never carries a future date.
+    return pd.Series(index, index=index).resample(rule).max()
+
+
+def resample_bars(frame: pd.DataFrame, rule: str) -> pd.DataFrame:
+    """
+    Aggregate date-indexed bars into ``rule`` periods.
+
+    Columns listed in ``AGGREGATIONS`` are aggregated (OHLC as usual,
+    volume summed, sentiment taken at the close); other columns, such as
+    indicators of the finer bars, are dropped. Periods without data are
+    skipped.
+
+    Parameters
+    ----------
+    frame:
+        Bars indexed by date, e.g. the output of
+        ``data_loader.merge_price_and_sentiment``.
+    rule:
+        Pandas offset alias, e.g. 'W-SUN' or 'ME'.
+
+    Returns
+    -------
+    pd.DataFrame
+        One row per period, indexed by the period's last date.
+    """
+    columns = {
+        column: how
+        for column, how in AGGREGATIONS.items()
+        if column in frame.columns
+    }
+    bars = frame[list(columns)].resample(rule).agg(columns)
+    ends = _period_ends(frame.index, rule)
+    bars = bars.loc[ends.notna().to_numpy()]
+    bars.index = pd.DatetimeIndex(ends.dropna(), name=frame.index.name)
+    return bars
+
+
+def resample_merged(merged: pd.DataFrame, timeframe: str) -> pd.DataFrame:
+    """
+    Return merged price and sentiment data at ``timeframe``.
+
+    Daily data is returned unchanged. Otherwise the bars are resampled
+    and 'return' is recomputed from the resampled closes; as in
+    ``data_loader.merge_price_and_sentiment``, the first bar, which has
+    no return, is dropped.
+    """
+    rule = get_timeframe(timeframe).rule
+    if rule is None:
+        return merged
+    bars = resample_bars(merged, rule)
+    bars["return"] = bars["close"].pct_change()
+    return bars.dropna(subset=["return"])
+
+
+def resample_panel(
+    closes: pd.DataFrame, sentiment_frame: pd.DataFrame, timeframe: str
+) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Resample a close panel and its sentiment frame to ``timeframe``.
+
+    Takes and returns the output of ``panel.merge_price_panel``; every
+    asset's bar closes at its last available price in the period.
+    """
+    rule = get_timeframe(timeframe).rule
+    if rule is None:
+        return closes, sentiment_frame
+    ends = _period_ends(closes.index, rule)
+    keep = ends.notna().to_numpy()
+    index = pd.DatetimeIndex(ends.dropna(), name=closes.index.name)
+
+    closes = closes.resample(rule).last().loc[keep]
+    closes.index = index
+    sentiment_frame = sentiment_frame.resample(rule).last().loc[keep]
+    sentiment_frame.index = index
+    return closes, sentiment_frame
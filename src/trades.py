@@ -0,0 +1,202 @@
+"""Round-trip trade ledger extracted from a position column."""
+
+from __future__ import annotations
+
+from typing import Any, Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+
+# Columns of the ledger returned by ``extract_trades``.
+TRADE_COLUMNS = (
+    "entry_date",
+    "exit_date",
+    "entry_price",
+    "exit_price",
+    "bars_held",
+    "return",
+    "mae",
+    "mfe",
+    "open",
+)
+
+
+def _segment_extremes(
+    values: np.ndarray, starts: np.ndarray, stops: np.ndarray, ufunc: Any
+) -> np.ndarray:
+    """
+    Reduce ``values[start:stop]`` for every segment with ``ufunc.reduceat``.
+
+    Segments must be non-empty, sorted and non-overlapping. Their bounds
+    are interleaved into one index array; the reductions of the gaps
+    between segments are discarded.
+    """
+    # One padding element keeps a stop equal to len(values) in range.
+    padded = np.append(values, values[-1:])
+    bounds = np.empty(2 * len(starts), dtype=np.intp)
+    bounds[0::2] = starts
+    bounds[1::2] = stops
+    return ufunc.reduceat(padded, bounds)[0::2]
+
+
+def extract_trades(
+    data: pd.DataFrame,
+    position_col: str = "position",
+    price_col: str = "close",
+) -> pd.DataFrame:
+    """
+    Turn position changes into one row per round-trip trade.
+
+    A trade is entered at the close of the bar where the position goes
+    from 0 to 1 (a 'Buy' of ``strategy.generate_trade_signals``) and
+    exited at the close of the bar where it returns to 0, so its return
+    equals the compounded strategy returns of the bars in between. A
+    trade still open on the last bar is marked to that bar's close and
+    flagged ``open``.
+
+    MAE and MFE (maximum adverse and favourable excursion) are the
+    lowest and highest price during the trade relative to the entry
+    price, using 'low' and 'high' when the frame has them. Everything is
+    computed with index arrays and segment reductions, without a loop
+    over trades.
+
+    Parameters
+    ----------
+    data:
+        Date-indexed frame with ``position_col`` (0 or 1) and
+        ``price_col``.
+    position_col, price_col:
+        Names of the position and price columns.
+
+    Returns
+    -------
+    pd.DataFrame
+        Ledger with ``TRADE_COLUMNS``, one row per trade in entry order.
+    """
+    position = data[position_col].fillna(0).to_numpy(dtype=np.int8)
+    close = data[price_col].to_numpy(dtype=np.float64)
+    high = low = close
+    if "high" in data.columns and "low" in data.columns:
+        high = data["high"].to_numpy(dtype=np.float64)
+        low = data["low"].to_numpy(dtype=np.float64)
+
+    change = np.diff(position, prepend=np.int8(0))
+    entries = np.flatnonzero(change > 0)
+    exits = np.flatnonzero(change < 0)
+    still_open = len(exits) < len(entries)
+    if still_open:
+        exits = np.append(exits, len(position) - 1)
+
+    if len(entries):
+        # Excursions cover the bars after the entry up to the exit bar.
+        starts = np.minimum(entries + 1, exits)
+        stops = exits + 1
+        lowest = _segment_extremes(low, starts, stops, np.minimum)
+        highest = _segment_extremes(high, starts, stops, np.maximum)
+    else:
+        lowest = highest = np.empty(0)
+
+    entry_price = close[entries]
+    exit_price = close[exits]
+    is_open = np.zeros(len(entries), dtype=bool)
+    if still_open:
+        is_open[-1] = True
+
+    index = pd.DatetimeIndex(data.index)
+    return pd.DataFrame(
+        {
+            "entry_date": index[entries],
+            "exit_date": index[exits],
+            "entry_price": entry_price,
+            "exit_price": exit_price,
+            "bars_held": exits - entries,
+            "return": exit_price / entry_price - 1.0,
+            "mae": np.minimum(lowest / entry_price - 1.0, 0.0),
+            "mfe": np.maximum(highest / entry_price - 1.0, 0.0),
+            "open": is_open,
+        },
+        columns=list(TRADE_COLUMNS),
+    )
+
+
+def trade_statistics(ledger: pd.DataFrame) -> Dict[str, Optional[float]]:
+    """
+    Summarize a ledger from :func:`extract_trades`.
+
+    Returns
+    -------
+    dict[str, float | None]
+        Number of trades, win rate, average, best and worst trade
+        return, average holding period in bars, profit factor (gross
+        gains over gross losses) and average MAE/MFE. Ratios are None
+        when undefined.
+    """
+    returns = ledger["return"].to_numpy(dtype=np.float64)
+    count = len(returns)
+    if not count:
+        return {
+            "trades": 0,
+            "win_rate": None,
+            "average_return": None,
+            "best_return": None,
+            "worst_return": None,
+            "average_bars_held": None,
+            "profit_factor": None,
+            "average_mae": None,
+            "average_mfe": None,
+        }
+    gains = float(returns[returns > 0].sum())
+    losses = float(-returns[returns < 0].sum())
+    return {
+        "trades": count,
+        "win_rate": float((returns > 0).mean()),
+        "average_return": float(returns.mean()),
+        "best_return": float(returns.max()),
+        "worst_return": float(returns.min()),
+        "average_bars_held": float(ledger["bars_held"].mean()),
+        "profit_factor": gains / losses if losses > 0 else None,
+        "average_mae": float(ledger["mae"].mean()),
+        "average_mfe": float(ledger["mfe"].mean()),
+    }
+
+
+def serialize_trades(
+    ledger: pd.DataFrame, offset: int = 0, limit: int = 100
+) -> Dict[str, Any]:
+    """
+    Serialize one page of a ledger as JSON-ready columns.
+
+    Parameters
+    ----------
+    ledger:
+        Output of :func:`extract_trades`.
+    offset, limit:
+        First trade and maximum number of trades of the page.
+
+    Returns
+    -------
+    dict
+        'total', 'offset', 'limit', the page's columns under 'trades' and
+        the statistics of the whole ledger.
+    """
+    if offset < 0 or limit < 1:
+        raise ValueError("offset must be >= 0 and limit >= 1")
+    page = ledger.iloc[offset:offset + limit]
+    columns: Dict[str, Any] = {
+        "entry_date": page["entry_date"].dt.strftime("%Y-%m-%d").tolist(),
+        "exit_date": page["exit_date"].dt.strftime("%Y-%m-%d").tolist(),
+        "entry_price": page["entry_price"].round(2).tolist(),
+        "exit_price": page["exit_price"].round(2).tolist(),
+        "bars_held": page["bars_held"].astype(int).tolist(),
+        "open": page["open"].astype(bool).tolist(),
+    }
+    for name in ("return", "mae", "mfe"):
+        columns[name] = page[name].round(4).tolist()
+    return {
+        "total": len(ledger),
+        "offset": offset,
+        "limit": limit,
+        "trades": columns,
+        "statistics": trade_statistics(ledger),
+    }
@@ -32,27 +32,123 @@ function buildQueryParams() {
   return params.toString();
 }
 
+// The live stream and the parameter heatmap only cover the default asset
+// on daily bars.
+function selectedTicker() {
+  return document.querySelector('#settings-form [name="ticker"]').value;
+}
+
+function selectedTimeframe() {
+  return document.querySelector('#settings-form [name="timeframe"]').value;
+}
+
+function isDefaultTicker() {
+  const form = document.getElementById("settings-form");
+  return selectedTicker() === form.dataset.defaultTicker
+    && selectedTimeframe() === form.dataset.defaultTimeframe;
+}
+
+function updateAssetLabels() {
+  document.querySelectorAll(".asset-name").forEach((el) => {
+    el.textContent = selectedTicker();
+  });
+}
+
+// ETags of the payloads held in fullData; sent back as `base` so the
+// server only returns the fields the changed parameters affect.
+let payloadEtags = null;
+
+function withBase(url, etag) {
+  return etag ? `${url}&base=${encodeURIComponent(etag)}` : url;
+}
+
+function readEtag(res) {
+  const etag = res.headers.get("ETag");
+  return etag ? etag.replace(/^W\//, "").replace(/"/g, "") : null;
+}
+
+// Merge a delta payload ({delta: true, base, ...changed fields}) into the
+// payload it was computed against. Full payloads replace the old one.
+function mergePayload(previous, payload) {
+  if (!payload.delta || !previous) return payload;
+  const merged = { ...previous };
+  Object.keys(payload).forEach((key) => {
+    if (key !== "delta" && key !== "base") merged[key] = payload[key];
+  });
+  return merged;
+}
+
+// Full payloads are requested in the binary columnar format: a JSON
+// header followed by little-endian column buffers, read in place through
+// typed array views. Deltas stay JSON.
+const COLUMNS_TYPE = "application/vnd.algo-dash.columns";
+const COLUMN_ARRAYS = { f4: Float32Array, i1: Int8Array, i4: Int32Array };
+const DAY_MS = 86400000;
+
+function decodeColumns(buffer) {
+  const magic = new TextDecoder().decode(new Uint8Array(buffer, 0, 4));
+  if (magic !== "ADC1") throw new Error("Unexpected payload format");
+  const headerLength = new DataView(buffer).getUint32(4, true);
+  const header = JSON.parse(new TextDecoder().decode(new Uint8Array(buffer, 8, headerLength)));
+  const start = Math.ceil((8 + headerLength) / 8) * 8;
+
+  const payload = { ...header.meta };
+  header.columns.forEach((column) => {
+    const values = new COLUMN_ARRAYS[column.dtype](buffer, start + column.offset, column.length);
+    if (column.unit === "day") {
+      payload[column.name] = Array.from(values, (day) => new Date(day * DAY_MS).toISOString().slice(0, 10));
+    } else if (column.labels) {
+      payload[column.name] = Array.from(values, (code) => column.labels[code]);
+    } else if (column.decimals !== undefined) {
+      // Undo the float32 rounding error; NaN marks missing values.
+      const scale = 10 ** column.decimals;
+      payload[column.name] = Array.from(values, (v) => (Number.isNaN(v) ? null : Math.round(v * scale) / scale));
+    } else {
+      payload[column.name] = Array.from(values);
+    }
+  });
+  return payload;
+}
+
+function fetchPayload(url, etag) {
+  if (etag) return fetch(withBase(url, etag));
+  return fetch(url, { headers: { Accept: `${COLUMNS_TYPE}, application/json;q=0.9` } });
+}
+
+async function readPayload(res) {
+  const type = res.headers.get("Content-Type") || "";
+  if (type.startsWith(COLUMNS_TYPE)) return decodeColumns(await res.arrayBuffer());
+  return res.json();
+}
+
 async function fetchAllData() {
   const query = buildQueryParams();
+  const previous = fullData && payloadEtags ? fullData : null;
+  const etags = previous ? payloadEtags : {};
   try {
     const [tsRes, sentRes, perfRes] = await Promise.all([
-      fetch(`/api/time_series?${query}`),
-      fetch(`/api/sentiment?${query}`),
-      fetch(`/api/performance?${query}`),
+      fetchPayload(`/api/time_series?${query}`, etags.timeSeries),
+      fetchPayload(`/api/sentiment?${query}`, etags.sentiment),
+      fetchPayload(`/api/performance?${query}`, etags.performance),
     ]);
 
     if (!tsRes.ok) throw new Error(`Time Series API error: ${tsRes.statusText}`);
     if (!sentRes.ok) throw new Error(`Sentiment API error: ${sentRes.statusText}`);
     if (!perfRes.ok) throw new Error(`Performance API error: ${perfRes.statusText}`);
 
-    const timeSeries = await tsRes.json();
-    const sentiment = await sentRes.json();
-    const performance = await perfRes.json();
+    const timeSeries = mergePayload(previous && previous.timeSeries, await readPayload(tsRes));
+    const sentiment = mergePayload(previous && previous.sentiment, await readPayload(sentRes));
+    const performance = mergePayload(previous && previous.performance, await readPayload(perfRes));
 
     if (timeSeries.error) throw new Error(timeSeries.error);
     if (sentiment.error) throw new Error(sentiment.error);
     if (performance.error) throw new Error(performance.error);
 
+    payloadEtags = {
+      timeSeries: readEtag(tsRes),
+      sentiment: readEtag(sentRes),
+      performance: readEtag(perfRes),
+    };
     return { timeSeries, sentiment, performance };
   } catch (err) {
     console.error("Failed to fetch data:", err);
@@ -129,7 +225,7 @@ function updateKpis(performance, index, timeSeries) {
   const maxDrawdown = calculateMaxDrawdown(visibleEquity);
 
   // Calculate progressive Sharpe ratio (annualized)
-  const sharpeRatio = calculateSharpeRatio(visibleEquity);
+  const sharpeRatio = calculateSharpeRatio(visibleEquity, performance.periods_per_year);
 
   // Calculate progressive win rate based on visible buy/sell signals
   const winRate = calculateWinRate(timeSeries, index);
@@ -185,10 +281,10 @@ function calculateMaxDrawdown(equity) {
 }
 
 // Calculate annualized Sharpe ratio from equity curve
-function calculateSharpeRatio(equity) {
+function calculateSharpeRatio(equity, periodsPerYear = 252) {
   if (equity.length < 10) return 0;
 
-  // Calculate daily returns
+  // Calculate per-bar returns
   const returns = [];
   for (let i = 1; i < equity.length; i++) {
     returns.push((equity[i] - equity[i - 1]) / equity[i - 1]);
@@ -202,8 +298,8 @@ function calculateSharpeRatio(equity) {
 
   if (stdDev === 0) return 0;
 
-  // Annualize (assuming 252 trading days)
-  return (avgReturn / stdDev) * Math.sqrt(252);
+  // Annualize with the bars per year of the selected timeframe
+  return (avgReturn / stdDev) * Math.sqrt(periodsPerYear);
 }
 
 // Calculate win rate based on completed trades up to current index
@@ -313,7 +409,8 @@ function slicePerformance(perf, endIndex) {
     benchmark_equity: perf.benchmark_equity.slice(0, endIndex + 1),
     metrics: perf.metrics,
     latest_signal: perf.latest_signal,
-    latest_explanation: perf.latest_explanation
+    latest_explanation: perf.latest_explanation,
+    periods_per_year: perf.periods_per_year
   };
 }
 
@@ -630,6 +727,101 @@ function streamNextPoint() {
   checkForNewSignal(fullData.timeSeries, currentIndex);
 }
 
+// -- Live updates pushed by the server (Server-Sent Events) --
+let liveSource = null;
+
+const PRICE_DATASET_FIELDS = {
+  "Upper BB": "bb_upper",
+  "Middle BB": "bb_middle",
+  "Lower BB": "bb_lower",
+  "Price": "close",
+  "SMA 5": "sma_short",
+  "SMA 50": "sma_long",
+};
+
+function connectLiveStream() {
+  if (liveSource) liveSource.close();
+  liveSource = null;
+  if (!window.EventSource || !isDefaultTicker()) return;
+
+  liveSource = new EventSource(`/api/stream?${buildQueryParams()}`);
+  liveSource.onmessage = (evt) => appendLivePoint(JSON.parse(evt.data));
+  liveSource.addEventListener("end", () => {
+    liveSource.close();
+    liveSource = null;
+  });
+}
+
+// Append one pushed bar to the loaded data and, if the replay already
+// reached the end, to the charts themselves.
+function appendLivePoint(point) {
+  if (!fullData) return;
+  // The server's payloads end before the live bars, so deltas against
+  // them would no longer line up with fullData: fetch full payloads next.
+  payloadEtags = null;
+
+  const ts = fullData.timeSeries;
+  const sent = fullData.sentiment;
+  const perf = fullData.performance;
+  const index = ts.dates.length;
+  const wasAtEnd = !streamingInterval && currentIndex === index - 1;
+
+  ts.dates.push(point.date);
+  ["close", "sma_short", "sma_long", "bb_middle", "bb_upper", "bb_lower",
+    "kalman_trend", "position", "trade_signal"].forEach((key) => ts[key].push(point[key]));
+  if (point.trade_signal === "Buy") ts.buy_indices.push(index);
+  if (point.trade_signal === "Sell") ts.sell_indices.push(index);
+
+  sent.dates.push(point.date);
+  sent.fg_value.push(point.fg_value);
+  sent.sentiment_regime.push(point.sentiment_regime);
+
+  perf.dates.push(point.date);
+  perf.strategy_equity.push(point.strategy_equity);
+  perf.benchmark_equity.push(point.benchmark_equity);
+
+  // While the replay is running or paused it will reach this point itself.
+  if (!wasAtEnd) return;
+  currentIndex = index;
+
+  appendToPriceChart(point);
+  sentimentChart.data.labels.push(point.date);
+  sentimentChart.data.datasets[0].data.push(point.fg_value);
+  sentimentChart.update("none");
+  performanceChart.data.labels.push(point.date);
+  performanceChart.data.datasets[0].data.push(point.strategy_equity);
+  performanceChart.data.datasets[1].data.push(point.benchmark_equity);
+  performanceChart.update("none");
+
+  const previousPrice = ts.close[index - 1] || point.close;
+  const priceChange = point.close - previousPrice;
+  updateLiveTicker(point.close, priceChange, (priceChange / previousPrice) * 100);
+  updateTimestamp(point.date);
+  updateKpis(slicePerformance(perf, index), index, ts);
+  checkForNewSignal(ts, index);
+}
+
+function appendToPriceChart(point) {
+  const markerLabel = { Buy: "Buy Signal", Sell: "Sell Signal" }[point.trade_signal];
+  const markers = markerLabel
+    ? priceChart.data.datasets.find((ds) => ds.label === markerLabel)
+    : null;
+
+  if (markerLabel && !markers) {
+    // First marker of its kind: the scatter dataset does not exist yet.
+    buildPriceChart(sliceTimeSeries(fullData.timeSeries, currentIndex), false);
+    return;
+  }
+
+  priceChart.data.labels.push(point.date);
+  priceChart.data.datasets.forEach((ds) => {
+    const field = PRICE_DATASET_FIELDS[ds.label];
+    if (field) ds.data.push(point[field]);
+  });
+  if (markers) markers.data.push({ x: point.date, y: point.close });
+  priceChart.update("none");
+}
+
 function setStreamingStatus(isStreaming) {
   const statusEl = document.getElementById("stream-status");
   const indicator = document.querySelector('.live-indicator');
@@ -682,6 +874,7 @@ function resetStreaming() {
 
 async function refreshDashboard() {
   pauseStreaming();
+  updateAssetLabels();
 
   const data = await fetchAllData();
   if (data && data.error) {
@@ -710,9 +903,256 @@ async function refreshDashboard() {
 
     // Auto-start streaming
     startStreaming();
+    connectLiveStream();
+    refreshHeatmap();
+    refreshRegimes();
+    refreshTrades(0);
+  }
+}
+
+// -- Parameter heatmap --
+const heatmapCanvas = document.getElementById("heatmapChart");
+let heatmapSlice = null;
+
+// Form field names of the strategy parameters used as heatmap axes.
+const HEATMAP_FORM_FIELDS = {
+  short_window: "short_window",
+  long_window: "long_window",
+  extreme_fear_threshold: "extreme_fear",
+  extreme_greed_threshold: "extreme_greed",
+};
+
+async function refreshHeatmap() {
+  const hint = document.getElementById("heatmap-hint");
+  if (!isDefaultTicker()) {
+    heatmapSlice = null;
+    heatmapCanvas.getContext("2d").clearRect(0, 0, heatmapCanvas.width, heatmapCanvas.height);
+    if (hint) hint.textContent = "The parameter landscape covers the default asset only.";
+    return;
+  }
+  if (hint) hint.textContent = "Click a cell to load its parameters.";
+  const form = new FormData(document.getElementById("heatmap-form"));
+  const [x, y] = form.get("axes").split(",");
+  const query = `${buildQueryParams()}&x=${x}&y=${y}&metric=${form.get("metric")}`;
+  try {
+    const res = await fetch(`/api/heatmap?${query}`);
+    if (!res.ok) throw new Error(`Heatmap API error: ${res.statusText}`);
+    heatmapSlice = await res.json();
+    // Values between grid cells are shown at the nearest cell.
+    if (hint && heatmapSlice.off_grid.length) {
+      hint.textContent = `Nearest grid cells shown for ${heatmapSlice.off_grid.join(", ")}. Click a cell to load its parameters.`;
+    }
+    drawHeatmap();
+  } catch (err) {
+    console.error("Failed to fetch heatmap:", err);
   }
 }
 
+// All metrics are "higher is better" (drawdowns are negative numbers).
+function heatmapColor(value, min, max) {
+  if (value === null) return "rgba(255, 255, 255, 0.03)";
+  const t = max > min ? (value - min) / (max - min) : 0.5;
+  // Red (poor) -> green (good)
+  const hue = t * 150;
+  return `hsla(${hue}, 70%, 45%, 0.85)`;
+}
+
+function drawHeatmap() {
+  if (!heatmapSlice || !heatmapCanvas) return;
+
+  const wrapper = heatmapCanvas.parentElement;
+  heatmapCanvas.width = wrapper.clientWidth;
+  heatmapCanvas.height = wrapper.clientHeight;
+  const ctx = heatmapCanvas.getContext("2d");
+  const { values, x_values: xs, y_values: ys, selected } = heatmapSlice;
+
+  const margin = { left: 40, bottom: 20 };
+  const cellW = (heatmapCanvas.width - margin.left) / xs.length;
+  const cellH = (heatmapCanvas.height - margin.bottom) / ys.length;
+  const flat = values.flat().filter((v) => v !== null);
+  const min = Math.min(...flat);
+  const max = Math.max(...flat);
+
+  ctx.clearRect(0, 0, heatmapCanvas.width, heatmapCanvas.height);
+  ctx.font = "10px 'JetBrains Mono', monospace";
+  ctx.fillStyle = "#94a3b8";
+
+  ys.forEach((yValue, row) => {
+    // Highest y value at the top.
+    const top = (ys.length - 1 - row) * cellH;
+    ctx.fillStyle = "#94a3b8";
+    ctx.fillText(String(yValue), 4, top + cellH / 2 + 3);
+    xs.forEach((_xValue, col) => {
+      ctx.fillStyle = heatmapColor(values[row][col], min, max);
+      ctx.fillRect(margin.left + col * cellW, top, cellW - 1, cellH - 1);
+    });
+  });
+  xs.forEach((xValue, col) => {
+    ctx.fillStyle = "#94a3b8";
+    ctx.fillText(String(xValue), margin.left + col * cellW + 2, heatmapCanvas.height - 6);
+  });
+
+  ctx.strokeStyle = "#f8fafc";
+  ctx.lineWidth = 2;
+  ctx.strokeRect(
+    margin.left + selected.x * cellW,
+    (ys.length - 1 - selected.y) * cellH,
+    cellW - 1,
+    cellH - 1
+  );
+
+  heatmapCanvas.dataset.cellW = cellW;
+  heatmapCanvas.dataset.cellH = cellH;
+  heatmapCanvas.dataset.marginLeft = margin.left;
+}
+
+function heatmapCellAt(evt) {
+  if (!heatmapSlice) return null;
+  const rect = heatmapCanvas.getBoundingClientRect();
+  const col = Math.floor((evt.clientX - rect.left - Number(heatmapCanvas.dataset.marginLeft)) / Number(heatmapCanvas.dataset.cellW));
+  const rowFromTop = Math.floor((evt.clientY - rect.top) / Number(heatmapCanvas.dataset.cellH));
+  const row = heatmapSlice.y_values.length - 1 - rowFromTop;
+  if (col < 0 || col >= heatmapSlice.x_values.length) return null;
+  if (row < 0 || row >= heatmapSlice.y_values.length) return null;
+  return { col, row };
+}
+
+function setFormValue(name, value) {
+  const input = document.querySelector(`#settings-form [name="${name}"]`);
+  if (!input) return;
+  input.value = value;
+  if (input.nextElementSibling && input.nextElementSibling.tagName === "OUTPUT") {
+    input.nextElementSibling.value = value;
+  }
+}
+
+heatmapCanvas.addEventListener("mousemove", (evt) => {
+  const cell = heatmapCellAt(evt);
+  const hint = document.getElementById("heatmap-hint");
+  if (!cell || !hint) return;
+  const value = heatmapSlice.values[cell.row][cell.col];
+  hint.textContent = `${heatmapSlice.x_axis} ${heatmapSlice.x_values[cell.col]}, ` +
+    `${heatmapSlice.y_axis} ${heatmapSlice.y_values[cell.row]}: ` +
+    `${value === null ? "n/a" : value.toFixed(3)}`;
+});
+
+heatmapCanvas.addEventListener("click", (evt) => {
+  const cell = heatmapCellAt(evt);
+  if (!cell) return;
+  setFormValue(HEATMAP_FORM_FIELDS[heatmapSlice.x_axis], heatmapSlice.x_values[cell.col]);
+  setFormValue(HEATMAP_FORM_FIELDS[heatmapSlice.y_axis], heatmapSlice.y_values[cell.row]);
+  refreshDashboard();
+});
+
+document.getElementById("heatmap-form").addEventListener("change", refreshHeatmap);
+window.addEventListener("resize", drawHeatmap);
+
+// -- Sentiment regime statistics --
+function formatRegimePercent(value) {
+  return value === null ? "n/a" : `${(value * 100).toFixed(1)}%`;
+}
+
+async function refreshRegimes() {
+  const rows = document.getElementById("regime-rows");
+  const hint = document.getElementById("regime-hint");
+  if (!isDefaultTicker()) {
+    rows.innerHTML = "";
+    if (hint) hint.textContent = "Regime statistics cover the default asset only.";
+    return;
+  }
+  if (hint) hint.textContent = "Returns are compounded over the days spent in each regime.";
+  const yearSelect = document.querySelector('#regime-form [name="year"]');
+  const year = yearSelect.value;
+  try {
+    const res = await fetch(`/api/regimes?${buildQueryParams()}&year=${year}`);
+    if (!res.ok) throw new Error(`Regimes API error: ${res.statusText}`);
+    const summary = await res.json();
+
+    if (yearSelect.options.length === 1) {
+      summary.years.forEach((y) => yearSelect.add(new Option(String(y), String(y))));
+    }
+    rows.innerHTML = "";
+    summary.rows.forEach((row) => {
+      const tr = document.createElement("tr");
+      [
+        row.regime,
+        String(row.days),
+        String(row.transitions),
+        formatRegimePercent(row.strategy_return),
+        formatRegimePercent(row.benchmark_return),
+        formatRegimePercent(row.strategy_volatility),
+        formatRegimePercent(row.benchmark_volatility),
+        formatRegimePercent(row.strategy_hit_rate),
+      ].forEach((text) => {
+        const td = document.createElement("td");
+        td.textContent = text;
+        tr.appendChild(td);
+      });
+      rows.appendChild(tr);
+    });
+  } catch (err) {
+    console.error("Failed to fetch regime statistics:", err);
+  }
+}
+
+document.getElementById("regime-form").addEventListener("change", refreshRegimes);
+
+// -- Trade ledger --
+const TRADES_PAGE_SIZE = 20;
+let tradesOffset = 0;
+let tradesTotal = 0;
+
+async function refreshTrades(offset) {
+  const rows = document.getElementById("trade-rows");
+  const hint = document.getElementById("trades-hint");
+  const query = `${buildQueryParams()}&offset=${offset}&limit=${TRADES_PAGE_SIZE}`;
+  try {
+    const res = await fetch(`/api/trades?${query}`);
+    if (!res.ok) throw new Error(`Trades API error: ${res.statusText}`);
+    const page = await res.json();
+    tradesOffset = page.offset;
+    tradesTotal = page.total;
+
+    const t = page.trades;
+    rows.innerHTML = "";
+    t.entry_date.forEach((entryDate, i) => {
+      const tr = document.createElement("tr");
+      [
+        entryDate,
+        t.open[i] ? "open" : t.exit_date[i],
+        t.entry_price[i].toFixed(2),
+        t.exit_price[i].toFixed(2),
+        String(t.bars_held[i]),
+        formatRegimePercent(t.return[i]),
+        formatRegimePercent(t.mae[i]),
+        formatRegimePercent(t.mfe[i]),
+      ].forEach((text) => {
+        const td = document.createElement("td");
+        td.textContent = text;
+        tr.appendChild(td);
+      });
+      rows.appendChild(tr);
+    });
+
+    const stats = page.statistics;
+    const last = Math.min(page.offset + t.entry_date.length, page.total);
+    hint.textContent = page.total === 0
+      ? "No trades for these parameters."
+      : `Trades ${page.offset + 1}-${last} of ${page.total}, ` +
+        `win rate ${formatRegimePercent(stats.win_rate)}, ` +
+        `average ${formatRegimePercent(stats.average_return)}`;
+  } catch (err) {
+    console.error("Failed to fetch trades:", err);
+  }
+}
+
+document.getElementById("trades-prev").addEventListener("click", () => {
+  if (tradesOffset > 0) refreshTrades(Math.max(tradesOffset - TRADES_PAGE_SIZE, 0));
+});
+document.getElementById("trades-next").addEventListener("click", () => {
+  if (tradesOffset + TRADES_PAGE_SIZE < tradesTotal) refreshTrades(tradesOffset + TRADES_PAGE_SIZE);
+});
+
 // Event listeners
 document.getElementById("settings-form").addEventListener("submit", (evt) => {
   evt.preventDefault();
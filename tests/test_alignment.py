@@ -0,0 +1,86 @@
+"""Tests for the as-of alignment engine."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src import alignment, data_loader
+
+
+def _series(dates, **columns):
+    index = pd.DatetimeIndex(pd.to_datetime(dates), name="date")
+    return pd.DataFrame(columns, index=index)
+
+
+def test_as_of_alignment_with_staleness_and_duplicates():
+    calendar = pd.date_range("2024-01-01", periods=6, freq="D")
+    aligner = alignment.AsOfAligner(calendar)
+    funding = alignment.AlternativeSeries(
+        "funding",
+        _series(
+            ["2024-01-02", "2024-01-02", "2023-12-31"],
+            funding_rate=[1, 2, 0],
+        ),
+        max_staleness=pd.Timedelta("2D"),
+    )
+    onchain = alignment.AlternativeSeries(
+        "onchain",
+        _series(["2024-01-03"], active_addresses=[7.5], note=["x"]),
+        columns=["active_addresses"],
+    )
+
+    aligned = aligner.align_all([funding, onchain])
+    assert list(aligned.columns) == ["funding_rate", "active_addresses"]
+    # Unsorted input, last duplicate wins, values expire after two days.
+    np.testing.assert_array_equal(
+        aligned["funding_rate"], [0, 2, 2, 2, np.nan, np.nan]
+    )
+    assert aligned["funding_rate"].dtype == np.float64
+    np.testing.assert_array_equal(
+        aligned["active_addresses"], [np.nan, np.nan, 7.5, 7.5, 7.5, 7.5]
+    )
+
+    with pytest.raises(ValueError):
+        aligner.align_all([funding, funding])
+
+
+def test_merge_forward_fills_classification_and_extra_series(tmp_path):
+    price = pd.DataFrame(
+        {
+            "Date": pd.date_range("2021-01-01", periods=5, freq="D"),
+            "close": [10.0, 11.0, 12.0, 13.0, 14.0],
+        }
+    )
+    sentiment = pd.DataFrame(
+        {
+            "date": pd.to_datetime(["2020-12-31", "2021-01-03"]),
+            "fg_value": [20, 60],
+            "fg_classification": ["Extreme Fear", "Greed"],
+        }
+    )
+    csv = tmp_path / "funding.csv"
+    csv.write_text("timestamp,rate\n2021-01-02,0.01\n2021-01-05,0.03\n")
+    funding = alignment.load_alternative_csv(
+        csv, date_column="timestamp", max_staleness="1D"
+    )
+    assert funding.name == "funding"
+
+    merged = data_loader.merge_price_and_sentiment(
+        price,
+        sentiment,
+        start_date="2021-01-01",
+        end_date="2021-12-31",
+        extra_series=[funding],
+    )
+    assert list(merged.index.strftime("%d")) == ["02", "03", "04", "05"]
+    assert merged["fg_value"].tolist() == [20.0, 60.0, 60.0, 60.0]
+    assert merged["fg_classification"].tolist() == [
+        "Extreme Fear",
+        "Greed",
+        "Greed",
+        "Greed",
+    ]
+    np.testing.assert_array_equal(
+        merged["rate"], [0.01, 0.01, np.nan, 0.03]
+    )
+    assert merged["return"].iloc[0] == pytest.approx(0.1)
@@ -0,0 +1,112 @@
+"""Tests for the parallel batch runner."""
+
+import json
+
+import pytest
+
+from src import batch, data_loader, pipeline
+from src.results_store import ResultsStore
+from tests.test_dashboard import _build_merged_frame
+
+
+def _inputs():
+    merged = _build_merged_frame(periods=200)
+    price_df = merged[["close"]].rename_axis("Date").reset_index()
+    sentiment_df = merged[["fg_value", "fg_classification"]].reset_index()
+    return {"BTC-USD": price_df, "ETH-USD": price_df}, sentiment_df
+
+
+def test_load_config_expands_grid(tmp_path):
+    config = {
+        "defaults": {"start": "2020-01-01", "end": "2020-06-30"},
+        "runs": [{"ticker": "ETH-USD", "params": {"short_window": 8}}],
+        "grid": {
+            "tickers": ["BTC-USD"],
+            "short_window": [5, 8],
+            "long_window": [20, 30],
+        },
+    }
+    path = tmp_path / "batch.json"
+    path.write_text(json.dumps(config))
+
+    runs = batch.load_config(path)
+    assert len(runs) == 5
+    assert runs[0]["run_id"] == "BTC-USD:2020-01-01:2020-06-30:5.20.25.75"
+    assert runs[-1]["params"]["short_window"] == 8
+
+    with pytest.raises(ValueError):
+        batch.make_run(params={"window": 3})
+
+
+def test_run_batch_writes_parts_and_resumes(tmp_path):
+    prices, sentiment_df = _inputs()
+    runs = [
+        batch.make_run(ticker, "2020-01-01", "2020-06-30", {"long_window": w})
+        for ticker in prices
+        for w in (20, 30, 40)
+    ]
+    output = tmp_path / "out"
+
+    store = ResultsStore(tmp_path / "runs.db")
+    done = batch.run_batch(
+        runs[:4], output, workers=2, flush_every=3,
+        prices=prices, sentiment_df=sentiment_df, store=store,
+    )
+    assert done == 4
+    assert len(store.top_runs(ticker="BTC-USD")) == 3
+    assert len(batch.ResultWriter(output).parts()) == 2
+
+    done = batch.run_batch(
+        runs, output, workers=2, flush_every=3,
+        prices=prices, sentiment_df=sentiment_df,
+    )
+    assert done == 2
+
+    results = batch.read_results(output)
+    assert sorted(results.index) == sorted(run["run_id"] for run in runs)
+
+    run = runs[4]
+    merged = data_loader.merge_price_and_sentiment(
+        prices["ETH-USD"], sentiment_df, end_date="2020-06-30"
+    )
+    enriched, metrics = pipeline.run_pipeline(merged, run["params"])
+    row = results.loc[run["run_id"]]
+    assert row["long_window"] == 30
+    assert row["ticker"] == "ETH-USD"
+    assert row["strategy_sharpe_ratio"] == pytest.approx(
+        metrics["strategy_sharpe_ratio"]
+    )
+    equity = batch.read_equity(output, run["run_id"])
+    assert list(equity.index) == list(enriched.index)
+    assert equity["strategy_equity"].to_numpy() == pytest.approx(
+        enriched["_strategy_equity"].to_numpy()
+    )
+
+
+def test_stale_versions_are_rerun_and_timeframe_is_used(
+    tmp_path, monkeypatch
+):
+    prices, sentiment_df = _inputs()
+    runs = [
+        batch.make_run("BTC-USD", "2020-01-01", "2020-06-30"),
+        batch.make_run("BTC-USD", "2020-01-01", "2020-06-30", timeframe="1W"),
+    ]
+    assert runs[1]["run_id"].startswith("BTC-USD:1W:")
+    output = tmp_path / "out"
+    kwargs = dict(workers=1, prices=prices, sentiment_df=sentiment_df)
+
+    monkeypatch.setattr(pipeline, "result_version", lambda *args: "old")
+    assert batch.run_batch(runs, output, **kwargs) == 2
+    assert batch.run_batch(runs, output, **kwargs) == 0
+
+    monkeypatch.setattr(pipeline, "result_version", lambda *args: "new")
+    assert batch.run_batch(runs, output, **kwargs) == 2
+    results = batch.read_results(output)
+    assert len(results) == 2
+    assert set(results["result_version"]) == {"new"}
+
+    weekly = batch.read_equity(output, runs[1]["run_id"])
+    daily = batch.read_equity(output, runs[0]["run_id"])
+    assert len(weekly) < len(daily) / 5
+    # Full weeks end on Sunday; the last bar ends on the last day.
+    assert (weekly.index[:-1].dayofweek == 6).all()
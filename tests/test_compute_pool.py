@@ -0,0 +1,64 @@
+"""Tests for the bounded compute pool."""
+
+import os
+import threading
+
+import pytest
+
+from src.compute_pool import ComputePool, PoolSaturatedError
+
+
+def test_submit_runs_and_releases_slot():
+    pool = ComputePool(max_workers=1, max_queue=0, per_client=1)
+    future = pool.submit("a", "client", lambda x: x * 2, 21)
+    assert future.result(timeout=5) == 42
+    pool.shutdown()
+    assert pool.pending == 0
+
+
+def test_same_key_joins_running_computation():
+    release = threading.Event()
+    pool = ComputePool(max_workers=1, max_queue=0, per_client=1)
+    first = pool.submit("a", "client", release.wait)
+    second = pool.submit("a", "other", release.wait)
+    assert first is second
+    release.set()
+    pool.shutdown()
+
+
+def test_rejects_when_queue_full_or_client_over_limit():
+    release = threading.Event()
+    pool = ComputePool(max_workers=1, max_queue=1, per_client=1)
+    pool.submit("a", "client-1", release.wait)
+
+    with pytest.raises(PoolSaturatedError):
+        pool.submit("b", "client-1", release.wait)
+
+    pool.submit("b", "client-2", release.wait)
+    with pytest.raises(PoolSaturatedError) as excinfo:
+        pool.submit("c", "client-3", release.wait)
+    assert excinfo.value.retry_after == pool.retry_after
+
+    release.set()
+    pool.shutdown()
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="needs fork")
+def test_forked_child_gets_fresh_pool():
+    release = threading.Event()
+    pool = ComputePool(max_workers=1, max_queue=0, per_client=1)
+    running = pool.submit("a", "client", release.wait)
+
+    pid = os.fork()
+    if pid == 0:
+        # The parent's worker thread and in-flight key are gone here.
+        ok = pool.pending == 0 and pool.submit(
+            "a", "client", lambda: 42
+        ).result(timeout=5) == 42
+        os._exit(0 if ok else 1)
+
+    _pid, status = os.waitpid(pid, 0)
+    release.set()
+    running.result(timeout=5)
+    pool.shutdown()
+    assert os.WEXITSTATUS(status) == 0
@@ -0,0 +1,481 @@
+"""Tests for the Flask dashboard API."""
+
+import gc
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src import dashboard, panel, pipeline, sentiment, serialization
+from src.compute_pool import PoolSaturatedError
+from src.memory_cache import LRUCache
+
+
+def _build_merged_frame(periods=120):
+    index = pd.date_range("2020-01-01", periods=periods, freq="D", name="date")
+    rng = np.random.default_rng(0)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.02, periods)))
+    fg_value = np.clip(50 + np.cumsum(rng.normal(0, 5, periods)), 0, 100)
+    df = pd.DataFrame(
+        {"close": close, "fg_value": fg_value, "fg_classification": "Neutral"},
+        index=index,
+    )
+    df["return"] = df["close"].pct_change()
+    return df.dropna(subset=["return"])
+
+
+@pytest.fixture
+def client(monkeypatch):
+    merged = _build_merged_frame()
+    monkeypatch.setattr(pipeline, "load_merged_data", lambda *a, **k: merged)
+    monkeypatch.setattr(dashboard, "_CACHE", LRUCache(64))
+    monkeypatch.setattr(dashboard, "_DATA_CACHE", LRUCache(64))
+    monkeypatch.setattr(dashboard, "_PANEL_CACHE", LRUCache(64))
+    app = dashboard.create_app({"TESTING": True, "SHARED_CACHE_DIR": None})
+    yield app.test_client()
+    app.extensions["compute_pool"].shutdown()
+
+
+def test_time_series_endpoint_computes_and_caches(client):
+    response = client.get("/api/time_series?short_window=5&long_window=20")
+    assert response.status_code == 200
+    assert len(response.get_json()["dates"]) == 119
+    assert len(dashboard._CACHE) == 1
+
+
+def test_cache_hit_bypasses_saturated_pool(client, monkeypatch):
+    assert client.get("/api/sentiment").status_code == 200
+
+    def _reject(*_args, **_kwargs):
+        raise PoolSaturatedError("busy", retry_after=3)
+
+    pool = client.application.extensions["compute_pool"]
+    monkeypatch.setattr(pool, "submit", _reject)
+
+    assert client.get("/api/sentiment").status_code == 200
+    response = client.get("/api/sentiment?short_window=7")
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "3"
+
+
+def test_shared_cache_serves_other_workers(tmp_path, monkeypatch):
+    merged = _build_merged_frame()
+    calls = []
+
+    def _load(*_args, **_kwargs):
+        calls.append(1)
+        return merged
+
+    monkeypatch.setattr(pipeline, "load_merged_data", _load)
+    config = {"TESTING": True, "SHARED_CACHE_DIR": str(tmp_path)}
+
+    for _worker in range(2):
+        # Each iteration stands in for a fresh worker process.
+        monkeypatch.setattr(dashboard, "_CACHE", LRUCache(64))
+        monkeypatch.setattr(dashboard, "_DATA_CACHE", LRUCache(64))
+        app = dashboard.create_app(config)
+        response = app.test_client().get("/api/performance")
+        app.extensions["compute_pool"].shutdown()
+        assert response.status_code == 200
+        assert "metrics" in response.get_json()
+
+    assert len(calls) == 1
+
+
+def test_snapshot_restores_entries_after_restart(tmp_path, monkeypatch):
+    merged = _build_merged_frame()
+    calls = []
+
+    def _load(*_args, **_kwargs):
+        calls.append(1)
+        return merged
+
+    monkeypatch.setattr(pipeline, "load_merged_data", _load)
+    monkeypatch.setattr(dashboard, "_CACHE", LRUCache(64))
+    monkeypatch.setattr(dashboard, "_DATA_CACHE", LRUCache(64))
+    monkeypatch.setattr(dashboard, "_CACHE_HITS", LRUCache(64))
+    monkeypatch.setattr(dashboard, "_SNAPSHOT_INDEX", {})
+    config = {
+        "TESTING": True,
+        "SHARED_CACHE_DIR": None,
+        "SNAPSHOT_DIR": str(tmp_path),
+        "SNAPSHOT_INTERVAL": 0,
+    }
+
+    app = dashboard.create_app(config)
+    first = app.test_client().get("/api/time_series").get_json()
+    dashboard.save_snapshot(app.extensions["snapshots"], max_entries=4)
+    app.extensions["compute_pool"].shutdown()
+
+    # Simulate a restart: empty in-process caches, new app.
+    monkeypatch.setattr(dashboard, "_CACHE", LRUCache(64))
+    monkeypatch.setattr(dashboard, "_DATA_CACHE", LRUCache(64))
+    restarted = dashboard.create_app(config)
+    second = restarted.test_client().get("/api/time_series").get_json()
+    restarted.extensions["compute_pool"].shutdown()
+
+    assert first == second
+    assert len(calls) == 1
+
+
+def test_preload_serves_default_view_from_forked_workers(monkeypatch):
+    merged = _build_merged_frame()
+    monkeypatch.setattr(pipeline, "load_merged_data", lambda *a, **k: merged)
+    monkeypatch.setattr(dashboard, "_CACHE", LRUCache(64))
+    monkeypatch.setattr(dashboard, "_DATA_CACHE", LRUCache(64))
+    app = dashboard.create_app(
+        {"TESTING": True, "SHARED_CACHE_DIR": None, "PRELOAD": True}
+    )
+    gc.unfreeze()
+    key = dashboard._scoped(
+        app.extensions["result_version"],
+        pipeline.cache_key(pipeline.DEFAULT_PARAMETERS),
+    )
+    assert key in dashboard._CACHE
+    assert dashboard._FORK_HOOK_REGISTERED
+
+    pid = os.fork()
+    if pid == 0:
+        # The default view must not need the (reset) compute pool.
+        pool = app.extensions["compute_pool"]
+        pool.submit = None
+        response = app.test_client().get("/api/performance")
+        os._exit(0 if response.status_code == 200 else 1)
+
+    _pid, status = os.waitpid(pid, 0)
+    app.extensions["compute_pool"].shutdown()
+    assert os.WEXITSTATUS(status) == 0
+
+
+def test_delta_response_contains_only_changed_fields(client):
+    first = client.get("/api/time_series?extreme_fear=25")
+    etag = first.headers["ETag"].strip('"')
+
+    delta = client.get(f"/api/time_series?extreme_fear=30&base={etag}")
+    payload = delta.get_json()
+    assert payload["delta"] is True
+    assert "position" in payload
+    assert "close" not in payload
+    assert "dates" not in payload
+
+    unchanged = client.get(
+        "/api/time_series?extreme_fear=30",
+        headers={"If-None-Match": delta.headers["ETag"]},
+    )
+    assert unchanged.status_code == 304
+
+
+def test_binary_payload_is_negotiated(client):
+    default = client.get("/api/time_series", headers={"Accept": "*/*"})
+    assert default.mimetype == "application/json"
+    assert default.headers["Vary"] == "Accept"
+
+    accept = {"Accept": serialization.COLUMNS_MIMETYPE}
+    binary = client.get("/api/time_series", headers=accept)
+    assert binary.mimetype == serialization.COLUMNS_MIMETYPE
+    assert binary.headers["ETag"] != default.headers["ETag"]
+
+    expected = default.get_json()
+    decoded = serialization.decode_columns(binary.data)
+    assert len(decoded["dates"]) == len(expected["dates"])
+    assert decoded["buy_indices"].tolist() == expected["buy_indices"]
+    close = np.round(decoded["close"].astype(float), 2)
+    assert close.tolist() == expected["close"]
+
+    etag = binary.headers["ETag"].strip('"')
+    delta = client.get(f"/api/time_series?short_window=7&base={etag}")
+    assert delta.get_json()["delta"] is True
+
+    unchanged = client.get(
+        "/api/time_series",
+        headers={**accept, "If-None-Match": binary.headers["ETag"]},
+    )
+    assert unchanged.status_code == 304
+
+
+def test_stream_pushes_new_bars_as_events(monkeypatch):
+    from src import live_feed
+
+    merged = _build_merged_frame()
+    monkeypatch.setattr(pipeline, "load_merged_data", lambda *a, **k: merged)
+    monkeypatch.setattr(dashboard, "_CACHE", LRUCache(64))
+    monkeypatch.setattr(dashboard, "_DATA_CACHE", LRUCache(64))
+    feed = live_feed.SyntheticFeed.random_walk(
+        merged.index[-1] + pd.Timedelta(days=1),
+        float(merged["close"].iloc[-1]),
+        periods=3,
+    )
+    app = dashboard.create_app(
+        {
+            "TESTING": True,
+            "SHARED_CACHE_DIR": None,
+            "LIVE_FEED": feed,
+            "LIVE_POLL_INTERVAL": 0,
+        }
+    )
+
+    response = app.test_client().get("/api/stream")
+    body = response.get_data(as_text=True)
+    app.extensions["compute_pool"].shutdown()
+
+    assert response.mimetype == "text/event-stream"
+    events = [
+        line[len("data: "):]
+        for line in body.splitlines()
+        if line.startswith("data: {\"")
+    ]
+    assert len(events) == 3
+    assert "event: end" in body
+
+
+def test_stream_count_is_capped(monkeypatch):
+    from src import live_feed
+
+    merged = _build_merged_frame()
+    monkeypatch.setattr(pipeline, "load_merged_data", lambda *a, **k: merged)
+    monkeypatch.setattr(dashboard, "_CACHE", LRUCache(64))
+    monkeypatch.setattr(dashboard, "_DATA_CACHE", LRUCache(64))
+    app = dashboard.create_app(
+        {
+            "TESTING": True,
+            "SHARED_CACHE_DIR": None,
+            "LIVE_FEED": live_feed.SyntheticFeed([]),
+            "LIVE_POLL_INTERVAL": 0,
+            "LIVE_MAX_STREAMS": 1,
+        }
+    )
+    client = app.test_client()
+    first = client.get("/api/stream")
+    assert client.get("/api/stream").status_code == 503
+    first.close()
+    again = client.get("/api/stream")
+    assert again.status_code == 200
+    again.close()
+    app.extensions["compute_pool"].shutdown()
+
+
+def test_heatmap_endpoint_returns_slice(client, monkeypatch):
+    from src import heatmap
+
+    monkeypatch.setattr(
+        heatmap,
+        "GRID_AXES",
+        {
+            "short_window": np.array([3, 5]),
+            "long_window": np.array([10, 20]),
+            "extreme_fear_threshold": np.array([20, 30]),
+            "extreme_greed_threshold": np.array([70, 80]),
+        },
+    )
+    response = client.get(
+        "/api/heatmap?x=extreme_fear_threshold&y=extreme_greed_threshold"
+        "&metric=strategy_hit_rate"
+    )
+    assert response.status_code == 200
+    payload = response.get_json()
+    assert payload["x_values"] == [20, 30]
+    assert len(payload["values"]) == 2
+
+    bad = client.get("/api/heatmap?x=short_window&y=short_window")
+    assert bad.status_code == 400
+
+
+def test_regimes_endpoint_returns_rows_per_regime(client, monkeypatch):
+    from src import regimes
+
+    monkeypatch.setattr(
+        regimes,
+        "THRESHOLD_AXES",
+        {
+            "extreme_fear_threshold": np.array([20, 30]),
+            "extreme_greed_threshold": np.array([70, 80]),
+        },
+    )
+    response = client.get("/api/regimes?short_window=3&long_window=20")
+    assert response.status_code == 200
+    payload = response.get_json()
+    assert [row["regime"] for row in payload["rows"]] == list(
+        sentiment.REGIMES
+    )
+    assert sum(row["days"] for row in payload["rows"]) > 0
+    app = client.application
+    assert list(app.extensions["regime_cubes"]) == [
+        dashboard._regime_key(app.extensions["result_version"], 3, 20)
+    ]
+
+    year = payload["years"][0]
+    by_year = client.get(
+        f"/api/regimes?short_window=3&long_window=20&year={year}"
+    )
+    assert by_year.get_json()["year"] == year
+    assert client.get("/api/regimes?year=1999").status_code == 400
+
+    app.extensions["regime_cubes"].maxsize = 2
+    for short_window in (4, 5, 6):
+        response = client.get(
+            f"/api/regimes?short_window={short_window}&long_window=20"
+        )
+        assert response.status_code == 200
+    assert len(app.extensions["regime_cubes"]) == 2
+
+
+def test_trades_endpoint_pages_the_ledger(client):
+    full = client.get("/api/trades?short_window=3&long_window=20")
+    assert full.status_code == 200
+    payload = full.get_json()
+    total = payload["total"]
+    assert payload["statistics"]["trades"] == total
+
+    series = client.get(
+        "/api/time_series?short_window=3&long_window=20"
+    ).get_json()
+    dates = payload["trades"]["entry_date"]
+    assert dates == [series["dates"][i] for i in series["buy_indices"]][
+        : len(dates)
+    ]
+
+    page = client.get(
+        "/api/trades?short_window=3&long_window=20&offset=1&limit=1"
+    ).get_json()
+    assert page["trades"]["entry_date"] == dates[1:2]
+    assert client.get("/api/trades?offset=-1").status_code == 400
+
+
+def test_asset_selector_serves_panel_assets(client, monkeypatch):
+    merged = _build_merged_frame()
+    closes = pd.DataFrame(
+        {"BTC-USD": merged["close"], "ETH-USD": merged["close"] / 20},
+    )
+    sentiment = merged[["fg_value", "fg_classification"]]
+    calls = []
+
+    def _load(tickers, **_kwargs):
+        calls.append(list(tickers))
+        return closes[list(tickers)], sentiment
+
+    monkeypatch.setattr(panel, "load_panel_data", _load)
+    client.application.config["PANEL_TICKERS"] = ("BTC-USD", "ETH-USD")
+
+    btc = client.get("/api/performance?long_window=20")
+    eth = client.get("/api/performance?long_window=20&ticker=ETH-USD")
+    assert eth.status_code == 200
+    assert eth.headers["ETag"] != btc.headers["ETag"]
+    assert "ETH-USD" in eth.headers["ETag"]
+    assert "metrics" in eth.get_json()
+
+    series = client.get("/api/time_series?long_window=30&ticker=ETH-USD")
+    # The panel treats the first close as the listing day without return.
+    assert len(series.get_json()["dates"]) == len(merged) - 1
+    assert calls == [["BTC-USD", "ETH-USD"]]
+
+    unknown = client.get("/api/performance?ticker=DOGE-USD")
+    assert unknown.status_code == 400
+
+
+def test_timeframes_reuse_loaded_data(client, monkeypatch):
+    merged = _build_merged_frame(periods=200)
+    loads = []
+
+    def _load(*_args, **_kwargs):
+        loads.append(1)
+        return merged
+
+    monkeypatch.setattr(pipeline, "load_merged_data", _load)
+    closes = pd.DataFrame({"ETH-USD": merged["close"]})
+    panel_loads = []
+
+    def _load_panel(tickers, **_kwargs):
+        panel_loads.append(1)
+        return closes, merged[["fg_value", "fg_classification"]]
+
+    monkeypatch.setattr(panel, "load_panel_data", _load_panel)
+    client.application.config["PANEL_TICKERS"] = ("BTC-USD", "ETH-USD")
+
+    daily = client.get("/api/performance?long_window=10")
+    weekly = client.get("/api/performance?long_window=10&timeframe=1W")
+    monthly = client.get("/api/time_series?long_window=2&timeframe=1M")
+    assert weekly.status_code == 200
+    assert weekly.headers["ETag"] != daily.headers["ETag"]
+    assert weekly.get_json()["periods_per_year"] == 52
+    assert len(weekly.get_json()["dates"]) < len(daily.get_json()["dates"])
+    assert len(monthly.get_json()["dates"]) == 6
+    assert loads == [1]
+
+    for timeframe in ("1D", "1W", "1M"):
+        eth = client.get(
+            f"/api/sentiment?ticker=ETH-USD&timeframe={timeframe}"
+        )
+        assert eth.status_code == 200
+    assert panel_loads == [1]
+
+    unknown = client.get("/api/performance?timeframe=5m")
+    assert unknown.status_code == 400
+
+
+def test_computed_runs_are_served_from_results_store(tmp_path, monkeypatch):
+    merged = _build_merged_frame()
+    monkeypatch.setattr(pipeline, "load_merged_data", lambda *a, **k: merged)
+    monkeypatch.setattr(dashboard, "_CACHE", LRUCache(64))
+    monkeypatch.setattr(dashboard, "_DATA_CACHE", LRUCache(64))
+    app = dashboard.create_app(
+        {
+            "TESTING": True,
+            "SHARED_CACHE_DIR": None,
+            "RESULTS_DB": str(tmp_path / "runs.db"),
+        }
+    )
+    client = app.test_client()
+    client.get("/api/performance?short_window=7")
+    client.get("/api/performance?short_window=9")
+    app.extensions["compute_pool"].shutdown()
+
+    runs = client.get("/api/runs?ticker=BTC-USD").get_json()["runs"]
+    assert sorted(run["short_window"] for run in runs) == [7, 9]
+    assert client.get("/api/runs?metric=volume").status_code == 400
+
+    run = client.get(f"/api/runs/{runs[0]['id']}").get_json()
+    assert len(run["dates"]) == len(run["strategy_equity"]) == 119
+    assert client.get("/api/runs/999").status_code == 404
+
+
+def test_price_sources_do_not_share_cache_entries(monkeypatch):
+    class Source:
+        def __init__(self, version, frame):
+            self.version = version
+            self.frame = frame
+
+    loads = []
+
+    def load(ticker, source=None):
+        loads.append(source.version)
+        return source.frame
+
+    monkeypatch.setattr(pipeline, "load_merged_data", load)
+    monkeypatch.setattr(dashboard, "_CACHE", LRUCache(64))
+    monkeypatch.setattr(dashboard, "_DATA_CACHE", LRUCache(64))
+    monkeypatch.setattr(dashboard, "_CACHE_HITS", LRUCache(64))
+    sources = [
+        Source("first", _build_merged_frame(periods=120)),
+        Source("second", _build_merged_frame(periods=90)),
+    ]
+    lengths = []
+    for source in sources:
+        app = dashboard.create_app(
+            {
+                "TESTING": True,
+                "SHARED_CACHE_DIR": None,
+                "PRICE_SOURCE": source,
+                "CACHE_MAX_ENTRIES": 1,
+            }
+        )
+        client = app.test_client()
+        for _ in range(2):
+            response = client.get("/api/performance")
+            assert response.status_code == 200
+        lengths.append(len(response.get_json()["dates"]))
+        app.extensions["compute_pool"].shutdown()
+
+    assert loads == ["first", "second"]
+    assert lengths == [119, 89]
+    assert len(dashboard._CACHE) == 1
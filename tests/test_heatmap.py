@@ -0,0 +1,71 @@
+"""Tests for the precomputed parameter heatmap cube."""
+
+import numpy as np
+import pytest
+
+from src import heatmap, pipeline
+from tests.test_dashboard import _build_merged_frame
+
+
+AXES = {
+    "short_window": np.array([3, 5]),
+    "long_window": np.array([10, 20, 30]),
+    "extreme_fear_threshold": np.array([20, 40]),
+    "extreme_greed_threshold": np.array([55, 70]),
+}
+
+
+def test_cube_cells_match_full_pipeline():
+    base = pipeline.prepare_base(_build_merged_frame(periods=200))
+    cube = heatmap.build_cube(base, axes=AXES)
+    assert cube.values.shape == (2, 3, 2, 2, len(heatmap.METRICS))
+    assert cube.values.dtype == np.float32
+
+    for idx, params in [
+        ((0, 1, 0, 1), (3, 20, 20, 70)),
+        ((1, 2, 1, 0), (5, 30, 40, 55)),
+    ]:
+        _enriched, metrics = pipeline.run_parameter_stages(
+            base, dict(zip(pipeline.DEFAULT_PARAMETERS, params))
+        )
+        for k, name in enumerate(heatmap.METRICS):
+            assert cube.values[idx + (k,)] == pytest.approx(
+                metrics[name], rel=1e-5, abs=1e-6
+            )
+
+
+def test_slice_and_persistence(tmp_path):
+    base = pipeline.prepare_base(_build_merged_frame(periods=200))
+    cube = heatmap.build_cube(base, axes=AXES, version="v1")
+    cube.save(tmp_path)
+
+    loaded = heatmap.HeatmapCube.load(tmp_path, "v1")
+    assert heatmap.HeatmapCube.load(tmp_path, "v2") is None
+    fixed = {
+        "short_window": 5,
+        "long_window": 21,
+        "extreme_fear_threshold": 38,
+        "extreme_greed_threshold": 60,
+    }
+    plane = loaded.slice("short_window", "long_window", fixed)
+    assert plane["x_values"] == [3, 5]
+    assert len(plane["values"]) == 3
+    assert len(plane["values"][0]) == 2
+    assert plane["selected"] == {"x": 1, "y": 1}
+    assert plane["off_grid"] == [
+        "long_window",
+        "extreme_fear_threshold",
+        "extreme_greed_threshold",
+    ]
+    expected = cube.values[1, 1, 1, 0, 0]
+    assert plane["values"][1][1] == pytest.approx(float(expected), abs=1e-4)
+
+
+def test_grid_contains_defaults_and_stale_grids_are_ignored(tmp_path):
+    for name, value in pipeline.DEFAULT_PARAMETERS.items():
+        assert value in heatmap.GRID_AXES[name]
+
+    base = pipeline.prepare_base(_build_merged_frame(periods=100))
+    heatmap.build_cube(base, axes=AXES, version="v1").save(tmp_path)
+    assert heatmap.HeatmapCube.load(tmp_path, "v1", AXES) is not None
+    assert heatmap.HeatmapCube.load(tmp_path, "v1", heatmap.GRID_AXES) is None
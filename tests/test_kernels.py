@@ -0,0 +1,91 @@
+"""Parity tests of the kernel backends."""
+
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src import kernels, strategy
+
+
+BACKENDS = kernels.available_backends()
+
+
+@pytest.fixture
+def rng():
+    return np.random.default_rng(7)
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_hysteresis_matches_next_position_loop(backend, rng):
+    enter = rng.random((3, 4, 500)) < 0.1
+    exit = rng.random((3, 4, 500)) < 0.1
+    positions = kernels.get_kernel("hysteresis_positions", backend)(
+        enter, exit
+    )
+    assert positions.dtype == np.int8
+
+    for scenario in np.ndindex(3, 4):
+        current = 0
+        expected = []
+        for entering, exiting in zip(enter[scenario], exit[scenario]):
+            # MAs and trend chosen so that the rules enter and exit
+            # exactly where the masks do.
+            current = strategy.next_position(
+                current,
+                1.0 if entering or not exiting else -1.0,
+                0.0,
+                1.0 if entering else -1.0,
+                "Neutral",
+            )
+            expected.append(current)
+        assert positions[scenario].tolist() == expected
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_drawdown_matches_pandas_cummax(backend, rng):
+    equity = np.cumprod(1 + rng.normal(0, 0.02, (5, 300)), axis=-1)
+    equity[0, :10] = np.nan
+    equity[1, 50] = np.nan
+    result = kernels.get_kernel("drawdown", backend)(equity)
+    for row in range(5):
+        series = pd.Series(equity[row])
+        expected = (series / series.cummax() - 1.0).to_numpy()
+        np.testing.assert_allclose(result[row], expected, equal_nan=True)
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_kalman_backends_agree(backend, rng):
+    values = 100 + np.cumsum(rng.normal(0, 1, 2000))
+    reference = kernels.get_kernel("kalman_filter", "numpy")
+    kernel = kernels.get_kernel("kalman_filter", backend)
+    np.testing.assert_allclose(
+        kernel(values, 1e-5, 1e-2, 1.0),
+        reference(values, 1e-5, 1e-2, 1.0),
+        rtol=1e-12,
+    )
+    assert kernel(values[:0], 1e-5, 1e-2, 1.0).size == 0
+
+
+def test_backend_selection(monkeypatch):
+    monkeypatch.setattr(kernels, "_backend", "auto")
+    assert kernels.active_backend() == BACKENDS[-1]
+    kernels.set_backend("numpy")
+    assert kernels.active_backend() == "numpy"
+    assert kernels.get_kernel("drawdown") is kernels.drawdown
+    with pytest.raises(ValueError):
+        kernels.set_backend("fortran")
+    with pytest.raises(ValueError):
+        kernels.get_kernel("unknown")
+    if "numba" not in BACKENDS:
+        with pytest.raises(ValueError):
+            kernels.set_backend("numba")
+
+
+def test_requested_backend_is_available():
+    # CI selects the backend through the environment; a requested backend
+    # that failed to install must not silently fall back to numpy.
+    requested = os.environ.get("ALGO_DASH_KERNEL_BACKEND", "auto")
+    if requested != "auto":
+        assert requested in BACKENDS
@@ -0,0 +1,85 @@
+"""Tests for live feeds and incremental strategy updates."""
+
+import numpy as np
+
+from src import live_feed, pipeline
+from tests.test_dashboard import _build_merged_frame
+
+
+def test_incremental_updates_match_full_pipeline():
+    merged = _build_merged_frame(periods=150)
+    params = dict(pipeline.DEFAULT_PARAMETERS, long_window=30)
+    history, tail = merged.iloc[:-10], merged.iloc[-10:]
+
+    enriched, _metrics = pipeline.run_pipeline(history, params)
+    updater = live_feed.IncrementalStrategy(enriched, params)
+    points = [
+        updater.update(live_feed.Bar(date, row.close, row.fg_value))
+        for date, row in tail.iterrows()
+    ]
+
+    expected, _metrics = pipeline.run_pipeline(merged, params)
+    expected = expected.iloc[-10:]
+    for column in ["sma_short", "sma_long", "bb_upper", "kalman_trend"]:
+        np.testing.assert_allclose(
+            [p[column] for p in points], expected[column], atol=0.01
+        )
+    assert [p["position"] for p in points] == expected["position"].tolist()
+    assert [p["trade_signal"] for p in points] == (
+        expected["trade_signal"].tolist()
+    )
+    np.testing.assert_allclose(
+        [p["strategy_equity"] for p in points],
+        expected["_strategy_equity"],
+        atol=1e-3,
+    )
+
+
+def test_old_bars_are_ignored():
+    merged = _build_merged_frame(periods=80)
+    enriched, _metrics = pipeline.run_pipeline(
+        merged, pipeline.DEFAULT_PARAMETERS
+    )
+    updater = live_feed.IncrementalStrategy(
+        enriched, pipeline.DEFAULT_PARAMETERS
+    )
+    last = merged.iloc[-1]
+    assert updater.update(
+        live_feed.Bar(merged.index[-1], last.close, last.fg_value)
+    ) is None
+
+
+def test_hub_delivers_all_bars_then_closes():
+    feed = live_feed.SyntheticFeed.random_walk(
+        "2025-01-01", 100.0, periods=5, batch_size=2
+    )
+    hub = live_feed.BarHub(feed, poll_interval=0)
+    hub.start()
+
+    cursor, received, closed = 0, [], False
+    while not closed:
+        bars, cursor, closed = hub.wait(cursor, timeout=1)
+        received.extend(bars)
+    assert len(received) == 5
+
+
+def test_hub_keeps_only_the_latest_bars():
+    feed = live_feed.SyntheticFeed.random_walk(
+        "2025-01-01", 100.0, periods=10, batch_size=10
+    )
+    hub = live_feed.BarHub(feed, poll_interval=0, max_bars=4)
+    hub.start()
+
+    bars, cursor, closed = hub.wait(0, timeout=1)
+    while not closed:
+        _more, _cursor, closed = hub.wait(cursor, timeout=1)
+    assert cursor == 10
+    assert [bar.date.day for bar in bars] == [7, 8, 9, 10]
+
+
+def test_kalman_variance_matches_full_recursion():
+    variance = 1.0
+    for _ in range(1, 5000):
+        variance += 1e-5
+        variance *= 1.0 - variance / (variance + 1e-2)
+    assert live_feed.IncrementalStrategy._kalman_variance(5000) == variance
@@ -0,0 +1,63 @@
+"""Tests for the offline load-testing harness."""
+
+from benchmarks import load_test
+from src import dashboard
+from src.data_loader import SyntheticPriceSource
+
+
+def test_synthetic_source_is_deterministic():
+    source = SyntheticPriceSource(seed=3)
+    window = ("2021-01-01", "2021-03-01")
+    first = source.download_bitcoin_history("BTC-USD", *window)
+    again = SyntheticPriceSource(seed=3).download_bitcoin_history(
+        "BTC-USD", *window
+    )
+    other = source.download_bitcoin_history("ETH-USD", *window)
+
+    assert first.equals(again)
+    assert not first["close"].equals(other["close"])
+    assert len(first) == 59
+
+
+def test_build_sessions_is_reproducible():
+    sessions = load_test.build_sessions(50, seed=1, tickers=["A", "B"])
+    assert sessions == load_test.build_sessions(50, seed=1, tickers=["A", "B"])
+    assert {kind for kind, _views in sessions} == set(load_test.SESSION_MIX)
+
+
+def test_run_load_test_reports_latency_and_cache():
+    report = load_test.run_load_test(sessions=6, concurrency=2, seed=0)
+
+    assert set(report["endpoints"]) == set(load_test.ENDPOINTS)
+    assert report["requests"] == sum(
+        summary["count"] for summary in report["endpoints"].values()
+    )
+    for summary in report["endpoints"].values():
+        assert set(summary["statuses"]) <= {"200", "304"}
+        assert summary["p50_ms"] <= summary["p99_ms"]
+    assert 0.0 <= report["cache"]["hit_ratio"] < 1.0
+    assert report["peak_rss_mb"] > 0
+
+    slower = dict(report, throughput_rps=report["throughput_rps"] / 2)
+    assert load_test.compare(report, report) == []
+    assert load_test.compare(slower, report) != []
+
+
+def test_computations_count_misses_beyond_cache_size():
+    tickers = list(dashboard.DEFAULT_CONFIG["PANEL_TICKERS"])
+    views = {
+        tuple(sorted(view.items()))
+        for _kind, session in load_test.build_sessions(
+            8, seed=0, tickers=tickers
+        )
+        for view in session
+    }
+    unbounded = load_test.run_load_test(sessions=8, concurrency=1, seed=0)
+    assert unbounded["cache"]["computations"] == len(views)
+
+    bounded = load_test.run_load_test(
+        sessions=8, concurrency=1, seed=0, config={"CACHE_MAX_ENTRIES": 2}
+    )
+    assert len(dashboard._CACHE) == 2
+    assert bounded["cache"]["computations"] > len(views) > 2
+    assert bounded["cache"]["hit_ratio"] < unbounded["cache"]["hit_ratio"]
@@ -0,0 +1,63 @@
+"""Tests for the bounded in-process caches."""
+
+import threading
+import time
+
+import pytest
+
+from src.memory_cache import LRUCache
+
+
+def test_least_recently_used_key_is_evicted():
+    cache = LRUCache(2)
+    cache["a"] = 1
+    cache["b"] = 2
+    assert cache["a"] == 1
+    cache["c"] = 3
+    assert list(cache) == ["a", "c"]
+    assert "b" not in cache
+
+    cache.maxsize = 1
+    cache["d"] = 4
+    assert dict(cache) == {"d": 4}
+
+    with pytest.raises(ValueError):
+        LRUCache(0)
+
+
+def test_concurrent_loads_of_a_key_run_once():
+    cache = LRUCache(4)
+    calls = []
+
+    def load():
+        calls.append(1)
+        time.sleep(0.05)
+        return "value"
+
+    results = []
+    threads = [
+        threading.Thread(
+            target=lambda: results.append(cache.get_or_load("key", load))
+        )
+        for _ in range(8)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert calls == [1]
+    assert results == ["value"] * 8
+    assert cache._loading == {}
+
+
+def test_failed_load_is_not_stored():
+    cache = LRUCache(4)
+
+    def fail():
+        raise RuntimeError("download failed")
+
+    with pytest.raises(RuntimeError):
+        cache.get_or_load("key", fail)
+    assert "key" not in cache
+    assert cache.get_or_load("key", lambda: 5) == 5
@@ -0,0 +1,94 @@
+"""Tests for the multi-asset panel engine."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src import panel, pipeline
+
+
+PARAMS = {
+    "short_window": 5,
+    "long_window": 20,
+    "extreme_fear_threshold": 30,
+    "extreme_greed_threshold": 70,
+}
+
+
+def _build_panel_inputs(periods=200):
+    index = pd.date_range("2021-01-01", periods=periods, freq="D", name="date")
+    rng = np.random.default_rng(1)
+    steps = rng.normal(0, 0.02, (periods, 2))
+    closes = pd.DataFrame(
+        100 * np.exp(np.cumsum(steps, axis=0)),
+        index=index,
+        columns=["AAA-USD", "BBB-USD"],
+    )
+    # The second asset is listed 40 days later.
+    closes.iloc[:40, 1] = np.nan
+    sentiment_df = pd.DataFrame(
+        {
+            "date": index,
+            "fg_value": np.clip(
+                50 + np.cumsum(rng.normal(0, 5, periods)), 0, 100
+            ),
+            "fg_classification": "Neutral",
+        }
+    )
+    return closes, sentiment_df
+
+
+def _single_asset_merged(closes, sentiment_df, ticker):
+    merged = sentiment_df.set_index("date")
+    merged.insert(0, "close", closes[ticker])
+    merged = merged.dropna(subset=["close"])
+    merged["return"] = merged["close"].pct_change()
+    return merged.dropna(subset=["return"])
+
+
+def test_panel_matches_single_asset_pipeline():
+    closes, sentiment_df = _build_panel_inputs()
+    base = panel.prepare_panel(*panel.merge_price_panel(closes, sentiment_df))
+    result = panel.run_panel(base, PARAMS)
+    assert result.fields["position"].shape == (199, 2)
+
+    for ticker in closes.columns:
+        merged = _single_asset_merged(closes, sentiment_df, ticker)
+        expected, metrics = pipeline.run_pipeline(merged, PARAMS)
+        frame = panel.asset_frame(result, ticker)
+
+        assert list(frame.columns) == list(expected.columns)
+        pd.testing.assert_frame_equal(
+            frame, expected, check_freq=False, check_names=False
+        )
+        assert result.metrics[ticker] == pytest.approx(metrics)
+
+
+def test_asset_result_encodes_payloads():
+    closes, sentiment_df = _build_panel_inputs()
+    base = panel.prepare_panel(*panel.merge_price_panel(closes, sentiment_df))
+    result = panel.run_panel(base, PARAMS)
+
+    asset = panel.asset_result(result, "BBB-USD")
+    assert set(asset.payloads) == {"time_series", "sentiment", "performance"}
+    with pytest.raises(ValueError):
+        panel.asset_result(result, "CCC-USD")
+
+
+def test_crypto_and_equity_calendars_match_single_asset_pipeline():
+    closes, sentiment_df = _build_panel_inputs(periods=300)
+    closes.columns = ["BTC-USD", "SPY"]
+    closes["SPY"] = closes["BTC-USD"].iloc[::-1].to_numpy()
+    # The equity only trades on weekdays.
+    closes.loc[closes.index.dayofweek >= 5, "SPY"] = np.nan
+    base = panel.prepare_panel(*panel.merge_price_panel(closes, sentiment_df))
+    result = panel.run_panel(base, PARAMS)
+
+    for ticker in closes.columns:
+        merged = _single_asset_merged(closes, sentiment_df, ticker)
+        expected, metrics = pipeline.run_pipeline(merged, PARAMS)
+        frame = panel.asset_frame(result, ticker)
+        pd.testing.assert_frame_equal(
+            frame, expected, check_freq=False, check_names=False
+        )
+        assert result.metrics[ticker] == pytest.approx(metrics)
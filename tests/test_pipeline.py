@@ -0,0 +1,88 @@
+"""Tests for the shared pipeline helpers."""
+
+import json
+
+import numpy as np
+import pandas as pd
+
+from src import pipeline
+from tests.test_dashboard import _build_merged_frame
+
+
+def test_params_token_round_trip():
+    params = dict(pipeline.DEFAULT_PARAMETERS)
+    token = pipeline.params_token(params)
+    assert pipeline.parse_params_token(token) == params
+    assert pipeline.parse_params_token("1.2") is None
+    assert pipeline.parse_params_token("a.b.c.d") is None
+
+
+def test_changed_fields_follow_stage_dependencies():
+    old = dict(pipeline.DEFAULT_PARAMETERS)
+    new = dict(old, extreme_fear_threshold=30)
+    fields = pipeline.changed_fields(old, new)
+    assert "sentiment_regime" in fields
+    assert "strategy_equity" in fields
+    assert "close" not in fields
+    assert "sma_short" not in fields
+    assert pipeline.changed_fields(old, old) == set()
+
+
+def test_encoded_payload_fields_and_delta():
+    base = pipeline.prepare_base(_build_merged_frame())
+    result = pipeline.build_result(base, pipeline.DEFAULT_PARAMETERS)
+
+    full = json.loads(result.payloads["time_series"])
+    for name, (start, end) in result.payload_fields["time_series"].items():
+        raw = result.payloads["time_series"][start:end]
+        assert json.loads(raw) == full[name]
+
+    delta = json.loads(
+        pipeline.encode_delta(result, "time_series", {"position"}, "tag")
+    )
+    assert delta == {
+        "delta": True,
+        "base": "tag",
+        "position": full["position"],
+    }
+
+
+def test_compact_frame_is_smaller_and_serializes_identically():
+    merged = _build_merged_frame(periods=400)
+    merged["close"] *= 400
+    merged["fg_value"] = merged["fg_value"].round()
+    merged["fg_classification"] = ["Fear", "Greed"] * 199 + ["Fear"]
+    enriched, metrics = pipeline.run_pipeline(
+        merged, pipeline.DEFAULT_PARAMETERS
+    )
+
+    compact = pipeline.compact_frame(enriched)
+    assert compact["sma_short"].dtype == "float32"
+    assert compact["position"].dtype == "int8"
+    assert compact["trade_signal"].dtype == "category"
+    assert compact["return"].dtype == "float64"
+    assert (
+        compact.memory_usage(deep=True).sum() * 3
+        < enriched.memory_usage(deep=True).sum()
+    )
+
+    original, _ = pipeline.encode_payloads(enriched, metrics)
+    compacted, _ = pipeline.encode_payloads(compact, metrics)
+    assert original == compacted
+
+
+def test_compact_result_keeps_ledger_and_state_columns():
+    merged = _build_merged_frame(periods=400)
+    merged["close"] *= 1.2345678
+    base = pipeline.prepare_base(merged)
+    params = pipeline.DEFAULT_PARAMETERS
+    full = pipeline.build_result(base, params)
+    compact = pipeline.build_result(base, params, compact=True)
+
+    pd.testing.assert_frame_equal(
+        pipeline.trade_ledger(compact), pipeline.trade_ledger(full)
+    )
+    for column in pipeline.STATE_COLUMNS:
+        np.testing.assert_array_equal(
+            compact.frame[column].to_numpy(), full.frame[column].to_numpy()
+        )
@@ -0,0 +1,95 @@
+"""Tests for the vectorized portfolio backtester."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src import backtesting, pipeline, portfolio
+from tests.test_dashboard import _build_merged_frame
+
+
+def _single_asset_inputs():
+    merged = _build_merged_frame(periods=300)
+    enriched, metrics = pipeline.run_pipeline(
+        merged, dict(pipeline.DEFAULT_PARAMETERS, long_window=20)
+    )
+    targets = enriched[["position"]].rename(columns={"position": "BTC"})
+    returns = enriched[["return"]].rename(columns={"return": "BTC"})
+    return enriched, metrics, targets.astype(float), returns
+
+
+@pytest.mark.parametrize("schedule", ["daily", "on_signal"])
+def test_single_asset_matches_run_backtest(schedule):
+    enriched, metrics, targets, returns = _single_asset_inputs()
+    result = portfolio.run_portfolio_backtest(targets, returns, schedule)
+
+    backtest_df, _metrics = backtesting.run_backtest(enriched)
+    np.testing.assert_allclose(
+        result.frame["strategy_equity"], backtest_df["strategy_equity"]
+    )
+    for name, value in metrics.items():
+        assert result.metrics[name] == pytest.approx(value)
+
+
+def test_weights_drift_between_weekly_rebalances():
+    index = pd.date_range("2024-01-01", periods=14, freq="D")  # Monday
+    returns = pd.DataFrame({"A": 0.10, "B": 0.0}, index=index)
+    targets = portfolio.equal_weights(
+        pd.DataFrame({"A": 1, "B": 1}, index=index)
+    )
+    result = portfolio.run_portfolio_backtest(
+        targets, returns, schedule="weekly", cost_per_turnover=0.01
+    )
+
+    # Bought on Monday, drifting towards A until the next Monday.
+    weights = result.weights
+    assert weights["A"].iloc[6] > weights["A"].iloc[1] > 0.5
+    assert weights.iloc[3].sum() == pytest.approx(1.0)
+    turnover = result.frame["turnover"]
+    assert turnover.iloc[0] == pytest.approx(1.0)
+    assert (turnover.iloc[1:7] == 0).all()
+    assert turnover.iloc[7] == pytest.approx(
+        2 * (weights["A"].iloc[7] - 0.5)
+    )
+    assert result.frame["portfolio_return"].iloc[0] == pytest.approx(-0.01)
+
+
+def test_equal_weights_and_unknown_schedule():
+    positions = pd.DataFrame({"A": [1, 1, 0], "B": [1, 0, 0]})
+    weights = portfolio.equal_weights(positions)
+    assert weights.to_numpy().tolist() == [[0.5, 0.5], [1.0, 0.0], [0, 0]]
+
+    with pytest.raises(ValueError):
+        portfolio.rebalance_dates(weights, "monthly")
+
+
+def test_wiped_out_asset_and_periods_per_year():
+    index = pd.date_range("2024-01-01", periods=21, freq="D")
+    returns = pd.DataFrame({"A": 0.01, "B": 0.02}, index=index)
+    returns.iloc[3, 0] = -1.0
+    targets = portfolio.equal_weights(
+        pd.DataFrame({"A": 1, "B": 1}, index=index)
+    )
+    daily = portfolio.run_portfolio_backtest(targets, returns, "weekly")
+    frame = daily.frame
+    assert np.isfinite(frame.to_numpy()).all()
+    assert np.isfinite(daily.weights.to_numpy()).all()
+    # Bought on Monday; A is lost on Thursday, B keeps growing.
+    before = 0.5 * 1.01 ** 2 + 0.5 * 1.02 ** 2
+    assert frame["portfolio_return"].iloc[3] == pytest.approx(
+        0.5 * 1.02 ** 3 / before - 1
+    )
+    # From the next Monday on, A's half is kept in cash.
+    assert daily.weights["A"].iloc[8] == 0.0
+    assert frame["portfolio_return"].iloc[8] == pytest.approx(0.5 * 0.02)
+    np.testing.assert_allclose(
+        frame["drawdown"],
+        frame["strategy_equity"] / frame["strategy_equity"].cummax() - 1,
+    )
+
+    weekly = portfolio.run_portfolio_backtest(
+        targets, returns, "weekly", periods_per_year=52
+    )
+    assert weekly.metrics["annual_turnover"] == pytest.approx(
+        daily.metrics["annual_turnover"] * 52 / 252
+    )
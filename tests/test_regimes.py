@@ -0,0 +1,70 @@
+"""Tests for the sentiment-regime statistics cube."""
+
+import numpy as np
+import pytest
+
+from src import pipeline, regimes
+from tests.test_dashboard import _build_merged_frame
+
+
+AXES = {
+    "extreme_fear_threshold": np.array([20, 30, 40]),
+    "extreme_greed_threshold": np.array([60, 65, 80]),
+}
+
+
+def test_summary_matches_groupby_of_full_pipeline():
+    base = pipeline.prepare_base(_build_merged_frame(periods=400))
+    cube = regimes.build_regime_cube(base, 3, 20, axes=AXES)
+    assert cube.values.shape == (3, 3, 2, 5, len(regimes.SUMS))
+    assert cube.years.tolist() == [2020, 2021]
+
+    enriched, _metrics = pipeline.run_parameter_stages(
+        base,
+        {
+            "short_window": 3,
+            "long_window": 20,
+            "extreme_fear_threshold": 30,
+            "extreme_greed_threshold": 65,
+        },
+    )
+    frame = enriched.assign(
+        strategy=enriched["position"].shift(1).fillna(0) * enriched["return"],
+        year=enriched.index.year,
+    )
+    for year in (None, 2020):
+        summary = cube.summary(31, 64, year=year)
+        assert summary["extreme_fear_threshold"] == 30
+        assert summary["extreme_greed_threshold"] == 65
+        rows = frame if year is None else frame[frame["year"] == year]
+        grouped = rows.groupby("sentiment_regime")
+        for row in summary["rows"]:
+            if row["regime"] not in grouped.groups:
+                assert row["days"] == 0
+                continue
+            group = grouped.get_group(row["regime"])
+            assert row["days"] == len(group)
+            assert row["strategy_return"] == pytest.approx(
+                (1 + group["strategy"]).prod() - 1, abs=1e-4
+            )
+            assert row["benchmark_return"] == pytest.approx(
+                (1 + group["return"]).prod() - 1, abs=1e-4
+            )
+            if len(group) > 1:
+                assert row["benchmark_volatility"] == pytest.approx(
+                    group["return"].std() * np.sqrt(252), abs=1e-4
+                )
+
+    regime = frame["sentiment_regime"]
+    entries = (regime != regime.shift(1)).iloc[1:]
+    summary = cube.summary(30, 65)
+    assert sum(row["transitions"] for row in summary["rows"]) == int(
+        entries.sum()
+    )
+
+
+def test_summary_rejects_unknown_year():
+    base = pipeline.prepare_base(_build_merged_frame(periods=100))
+    cube = regimes.build_regime_cube(base, 3, 20, axes=AXES)
+    with pytest.raises(ValueError):
+        cube.summary(30, 65, year=1999)
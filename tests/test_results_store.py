@@ -0,0 +1,90 @@
+"""Tests for the SQLite results store."""
+
+import sqlite3
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src import pipeline, results_store
+from src.results_store import ResultsStore
+
+
+def _record(store, sharpe, ticker="BTC-USD", version="p2-a", **params):
+    dates = pd.date_range("2024-01-01", periods=5, freq="D")
+    return store.record(
+        ticker=ticker,
+        start_date="2024-01-01",
+        end_date="2024-01-05",
+        params=dict(pipeline.DEFAULT_PARAMETERS, **params),
+        metrics={"strategy_sharpe_ratio": sharpe},
+        dates=dates,
+        strategy_equity=np.linspace(1.0, 1.2, 5),
+        benchmark_equity=np.linspace(1.0, 0.9, 5),
+        result_version=version,
+        latest_signal="Hold",
+    )
+
+
+def test_record_replaces_and_round_trips(tmp_path):
+    store = ResultsStore(tmp_path / "runs.db")
+    first = _record(store, 0.5)
+    again = _record(store, 0.7)
+    assert first == again
+
+    run = store.get_run(first)
+    assert run["strategy_sharpe_ratio"] == 0.7
+    assert run["dates"][0] == "2024-01-01"
+    assert run["strategy_equity"] == [1.0, 1.05, 1.1, 1.15, 1.2]
+    assert store.get_run(first + 1) is None
+
+
+def test_top_runs_filters_and_orders(tmp_path):
+    store = ResultsStore(tmp_path / "runs.db")
+    _record(store, 0.5, short_window=3)
+    _record(store, 1.5, short_window=4)
+    _record(store, 2.5, ticker="ETH-USD")
+    _record(store, 3.5, short_window=6, version="p1-old")
+
+    runs = store.top_runs(ticker="BTC-USD", limit=2)
+    assert [run["strategy_sharpe_ratio"] for run in runs] == [3.5, 1.5]
+    runs = store.top_runs(ticker="BTC-USD", result_version="p2-a")
+    assert [run["short_window"] for run in runs] == [4, 3]
+    assert len(store.top_runs(params={"short_window": 3})) == 1
+
+    with pytest.raises(ValueError):
+        store.top_runs(metric="volume")
+
+
+def test_timeframes_are_separate_runs(tmp_path):
+    store = ResultsStore(tmp_path / "runs.db")
+    daily = _record(store, 0.5)
+    weekly = store.record(
+        ticker="BTC-USD",
+        start_date="2024-01-01",
+        end_date="2024-01-05",
+        params=dict(pipeline.DEFAULT_PARAMETERS),
+        metrics={"strategy_sharpe_ratio": 0.9},
+        dates=pd.date_range("2024-01-07", periods=2, freq="W-SUN"),
+        strategy_equity=np.ones(2),
+        benchmark_equity=np.ones(2),
+        result_version="p2-a",
+        timeframe="1W",
+    )
+    assert daily != weekly
+    runs = store.top_runs(timeframe="1W")
+    assert [run["id"] for run in runs] == [weekly]
+    assert store.get_run(daily)["timeframe"] == "1D"
+
+
+def test_older_database_gains_timeframe_column(tmp_path):
+    path = tmp_path / "runs.db"
+    with sqlite3.connect(path) as connection:
+        connection.executescript(
+            results_store._SCHEMA.replace(
+                "timeframe TEXT NOT NULL DEFAULT '1D',", ""
+            )
+        )
+    store = ResultsStore(path)
+    run_id = _record(store, 0.5)
+    assert store.top_runs(timeframe="1D")[0]["id"] == run_id
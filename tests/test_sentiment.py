@@ -25,3 +25,12 @@ def test_summarize_sentiment_returns_tuple():
     mean_value, std_value = sentiment.summarize_sentiment(df)
     assert isinstance(mean_value, float)
     assert isinstance(std_value, float)
+
+
+def test_regime_codes_match_scalar_classification():
+    values = [0, 10, 25, 26, 44, 45, 55, 56, 74, 75, 90, float("nan")]
+    codes = sentiment.regime_codes(values, 25, 75)
+    assert codes.dtype.name == "int8"
+    assert [sentiment.REGIMES[c] for c in codes] == [
+        sentiment.classify_sentiment_value(v, 25, 75) for v in values
+    ]
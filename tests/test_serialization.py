@@ -53,3 +53,27 @@ def test_serialize_performance_structure():
     payload = serialization.serialize_performance(df, metrics)
     assert "strategy_equity" in payload
     assert payload["metrics"]["strategy_cumulative_return"] == 0.1
+
+
+def test_encode_columns_round_trips_aligned_buffers():
+    close = np.array([1.5, np.nan, 3.25], dtype=np.float32)
+    codes = np.array([0, 1, 0], dtype=np.int8)
+    days = serialization.epoch_days(pd.date_range("2020-01-01", periods=3))
+
+    payload = serialization.encode_columns(
+        [
+            ("dates", days, {"unit": "day"}),
+            ("trade_signal", codes, {"labels": ["Hold", "Buy"]}),
+            ("close", close, {"decimals": 2}),
+        ],
+        {"metrics": {"sharpe": 1.0}},
+    )
+    decoded = serialization.decode_columns(payload)
+
+    assert decoded["metrics"] == {"sharpe": 1.0}
+    assert decoded["dates"].tolist() == [18262, 18263, 18264]
+    assert decoded["trade_signal"].tolist() == [0, 1, 0]
+    np.testing.assert_array_equal(decoded["close"], close)
+    assert decoded["close"].ctypes.data % 4 == 0
+    assert isinstance(payload, bytearray)
+    assert not decoded["close"].flags.writeable
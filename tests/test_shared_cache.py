@@ -0,0 +1,93 @@
+"""Tests for the on-disk shared result cache."""
+
+import os
+
+import numpy as np
+import pandas as pd
+
+from src.pipeline import PipelineResult
+from src.shared_cache import SharedResultCache
+
+
+def _build_result():
+    index = pd.date_range("2020-01-01", periods=4, freq="D", name="date")
+    frame = pd.DataFrame(
+        {
+            "close": [1.0, 2.0, np.nan, 4.0],
+            "position": [0, 1, 1, 0],
+            "trade_signal": ["Hold", "Buy", "Hold", "Sell"],
+        },
+        index=index,
+    )
+    return PipelineResult(
+        frame=frame,
+        metrics={"strategy_sharpe_ratio": 1.5},
+        payloads={"time_series": b'{"dates":[]}'},
+    )
+
+
+def test_round_trip_preserves_frame_metrics_and_payloads(tmp_path):
+    cache = SharedResultCache(tmp_path)
+    original = _build_result()
+    cache.put("key", original)
+
+    restored = cache.get("key")
+    pd.testing.assert_frame_equal(
+        restored.frame, original.frame, check_dtype=False, check_freq=False
+    )
+    assert not restored.frame["close"].to_numpy().flags.writeable
+    assert restored.metrics == original.metrics
+    assert restored.payloads == original.payloads
+
+
+def test_get_or_compute_runs_once(tmp_path):
+    cache = SharedResultCache(tmp_path)
+    calls = []
+
+    def _compute():
+        calls.append(1)
+        return _build_result()
+
+    cache.get_or_compute("key", _compute)
+    SharedResultCache(tmp_path).get_or_compute("key", _compute)
+    assert len(calls) == 1
+    assert cache.get("missing") is None
+
+
+def test_categorical_columns_round_trip(tmp_path):
+    result = _build_result()
+    result.frame["trade_signal"] = result.frame["trade_signal"].astype(
+        "category"
+    )
+    cache = SharedResultCache(tmp_path)
+    cache.put("key", result)
+    restored = cache.get("key").frame
+    assert restored["trade_signal"].dtype == "category"
+    assert restored["trade_signal"].tolist() == ["Hold", "Buy", "Hold", "Sell"]
+
+
+def test_least_recently_used_entries_are_pruned(tmp_path):
+    cache = SharedResultCache(tmp_path, max_entries=2)
+    for number, key in enumerate(("a", "b")):
+        cache.put(key, _build_result())
+        # File times can be coarser than the test; order them explicitly.
+        os.utime(cache._entry_dir(key), ns=(number, number))
+    assert cache.get("a") is not None
+    cache.put("c", _build_result())
+
+    assert cache.get("b") is None
+    assert cache.get("a") is not None and cache.get("c") is not None
+    locks = {path.stem for path in cache._locks.iterdir()}
+    assert cache._digest("b") not in locks
+
+
+def test_new_version_removes_older_versions(tmp_path):
+    old = SharedResultCache(tmp_path, version="v1")
+    old.get_or_compute("key", _build_result)
+    assert SharedResultCache(tmp_path, version="v1").get("key") is not None
+
+    new = SharedResultCache(tmp_path, version="v2")
+    assert old.get("key") is None
+    assert [p.name for p in (tmp_path / "entries").iterdir()] == ["v2"]
+    assert [p.name for p in (tmp_path / "locks").iterdir()] == ["v2"]
+    assert new.get("key") is None
@@ -0,0 +1,48 @@
+"""Tests for warm-restart cache snapshots."""
+
+import pandas as pd
+
+from src.pipeline import PipelineResult
+from src.snapshot import SnapshotStore
+
+
+def _result(value):
+    index = pd.date_range("2020-01-01", periods=3, freq="D", name="date")
+    frame = pd.DataFrame({"close": [value] * 3}, index=index)
+    return PipelineResult(frame=frame, metrics={"value": value})
+
+
+def test_save_keeps_hottest_entries(tmp_path):
+    store = SnapshotStore(tmp_path, version="v1")
+    results = {"cold": _result(1.0), "hot": _result(2.0), "warm": _result(3.0)}
+    hits = {"cold": 1, "hot": 10, "warm": 5}
+    store.save(results, hits, max_entries=2)
+
+    index = SnapshotStore(tmp_path, version="v1").load_index()
+    assert set(index) == {"hot", "warm"}
+    restored = SnapshotStore.load_entry(index["hot"])
+    assert restored.metrics == {"value": 2.0}
+    assert restored.frame["close"].tolist() == [2.0, 2.0, 2.0]
+
+
+def test_other_version_is_ignored_and_pruned(tmp_path):
+    SnapshotStore(tmp_path, version="v1").save({"a": _result(1.0)}, {})
+    assert SnapshotStore(tmp_path, version="v2").load_index() == {}
+
+    SnapshotStore(tmp_path, version="v2").save({"b": _result(2.0)}, {})
+    assert len(list(tmp_path.glob("snapshot-*"))) == 1
+    assert set(SnapshotStore(tmp_path, version="v2").load_index()) == {"b"}
+
+
+def test_prune_keeps_current_and_newer_snapshots(tmp_path):
+    store = SnapshotStore(tmp_path, version="v1")
+    first = store.save({"a": _result(1.0)}, {})
+    # A snapshot another process is still publishing.
+    newer = tmp_path / "snapshot-v1-99999999999999999999-1"
+    newer.mkdir()
+
+    current = store.save({"b": _result(2.0)}, {})
+    assert not first.exists()
+    assert current.exists() and newer.exists()
+    assert set(store.load_index()) == {"b"}
+    assert not list(tmp_path.glob(".CURRENT.*"))
@@ -40,3 +40,14 @@ def test_generate_trade_signals_buy_and_sell():
 
     assert "Buy" in with_signals["trade_signal"].values
     assert "Sell" in with_signals["trade_signal"].values
+
+
+def test_hysteresis_positions_match_generate_positions():
+    df = _build_simple_data()
+    df.loc[df.index[3], "sma_short"] = 90
+    expected = strategy.generate_positions(df)["position"].tolist()
+
+    enter = (df["sma_short"] > df["sma_long"]) & (df["kalman_trend"] > 0)
+    exit = df["sma_short"] < df["sma_long"]
+    positions = strategy.hysteresis_positions(enter, exit)
+    assert positions.tolist() == expected
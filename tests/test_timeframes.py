@@ -0,0 +1,78 @@
+"""Tests for timeframe resampling."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src import pipeline, timeframes
+from src.data_loader import SyntheticPriceSource
+from tests.test_dashboard import _build_merged_frame
+
+
+def _daily_bars():
+    index = pd.date_range("2020-01-01", periods=10, freq="D", name="date")
+    return pd.DataFrame(
+        {
+            "open": np.arange(10.0),
+            "high": np.arange(10.0) + 2,
+            "low": np.arange(10.0) - 2,
+            "close": np.arange(10.0) + 1,
+            "volume": np.ones(10),
+            "fg_value": np.arange(10.0) * 10,
+            "fg_classification": ["Fear"] * 9 + ["Greed"],
+            "bb_middle": np.zeros(10),
+        },
+        index=index,
+    )
+
+
+def test_resample_bars_aggregates_ohlcv_by_period():
+    weekly = timeframes.resample_bars(_daily_bars(), "W-SUN")
+
+    # 2020-01-01 is a Wednesday: the first week has five days.
+    assert list(weekly.index) == [
+        pd.Timestamp("2020-01-05"),
+        pd.Timestamp("2020-01-10"),
+    ]
+    assert weekly["open"].tolist() == [0.0, 5.0]
+    assert weekly["high"].tolist() == [6.0, 11.0]
+    assert weekly["low"].tolist() == [-2.0, 3.0]
+    assert weekly["close"].tolist() == [5.0, 10.0]
+    assert weekly["volume"].tolist() == [5.0, 5.0]
+    assert weekly["fg_classification"].tolist() == ["Fear", "Greed"]
+    assert "bb_middle" not in weekly.columns
+
+
+def test_resample_merged_recomputes_returns():
+    merged = _build_merged_frame(periods=120)
+
+    assert timeframes.resample_merged(merged, "1D") is merged
+    monthly = timeframes.resample_merged(merged, "1M")
+    closes = merged["close"].resample("ME").last()
+    assert monthly["return"].tolist() == pytest.approx(
+        closes.pct_change().dropna().tolist()
+    )
+    assert monthly.index[-1] == merged.index[-1]
+
+    with pytest.raises(ValueError):
+        timeframes.resample_merged(merged, "5m")
+
+
+def test_pipeline_runs_on_weekly_bars():
+    source = SyntheticPriceSource(seed=1)
+    daily = source.download_bitcoin_history(
+        "BTC-USD", "2021-01-01", "2022-01-01"
+    )
+    merged = daily.set_index("Date").assign(fg_value=50.0)
+    merged["fg_classification"] = "Neutral"
+    merged["return"] = merged["close"].pct_change()
+
+    weekly = timeframes.resample_merged(merged.dropna(), "1W")
+    params = dict(pipeline.DEFAULT_PARAMETERS, long_window=20)
+    enriched, metrics = pipeline.run_pipeline(weekly, params, 52)
+    _same, daily_scaled = pipeline.run_pipeline(weekly, params)
+
+    assert len(enriched) == len(weekly)
+    assert metrics["strategy_sharpe_ratio"] == pytest.approx(
+        daily_scaled["strategy_sharpe_ratio"] * np.sqrt(52 / 252)
+    )
@@ -0,0 +1,109 @@
+"""Tests for the vectorized trade ledger."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src import trades
+
+
+def _frame(close, position, **columns):
+    index = pd.date_range("2021-01-01", periods=len(close), freq="D")
+    return pd.DataFrame(
+        {"close": close, "position": position, **columns}, index=index
+    )
+
+
+def _loop_trades(close, position):
+    """Reference ledger built bar by bar."""
+    rows = []
+    entry = None
+    previous = 0
+    for i, current in enumerate(position):
+        if previous == 0 and current == 1:
+            entry = i
+        elif previous == 1 and current == 0:
+            rows.append((entry, i, False))
+            entry = None
+        previous = current
+    if entry is not None:
+        rows.append((entry, len(position) - 1, True))
+    return [
+        (
+            j - i,
+            close[j] / close[i] - 1,
+            min(close[i + 1:j + 1].min(initial=close[i]) / close[i] - 1, 0),
+            max(close[i + 1:j + 1].max(initial=close[i]) / close[i] - 1, 0),
+            still_open,
+        )
+        for i, j, still_open in rows
+    ]
+
+
+def test_ledger_matches_loop_reference():
+    rng = np.random.default_rng(3)
+    close = 100 * np.cumprod(1 + rng.normal(0, 0.02, 5000))
+    position = (rng.random(5000) < 0.5).astype(int)
+    ledger = trades.extract_trades(_frame(close, position))
+
+    expected = _loop_trades(close, position)
+    assert len(ledger) == len(expected)
+    assert list(ledger.columns) == list(trades.TRADE_COLUMNS)
+    bars, returns, mae, mfe, still_open = map(np.array, zip(*expected))
+    np.testing.assert_array_equal(ledger["bars_held"], bars)
+    np.testing.assert_allclose(ledger["return"], returns)
+    np.testing.assert_allclose(ledger["mae"], mae)
+    np.testing.assert_allclose(ledger["mfe"], mfe)
+    np.testing.assert_array_equal(ledger["open"], still_open)
+
+
+def test_trade_return_matches_strategy_returns_and_uses_high_low():
+    close = np.array([10.0, 11.0, 12.0, 9.0, 10.0, 10.0])
+    position = [0, 1, 1, 0, 0, 1]
+    frame = _frame(
+        close,
+        position,
+        high=close + 1,
+        low=close - 1,
+    )
+    ledger = trades.extract_trades(frame)
+    assert len(ledger) == 2
+
+    first = ledger.iloc[0]
+    assert first["entry_date"] == frame.index[1]
+    assert first["exit_date"] == frame.index[3]
+    assert first["bars_held"] == 2
+    strategy_returns = frame["close"].pct_change().iloc[2:4]
+    assert first["return"] == pytest.approx(
+        (1 + strategy_returns).prod() - 1
+    )
+    assert first["mfe"] == pytest.approx(13 / 11 - 1)
+    assert first["mae"] == pytest.approx(8 / 11 - 1)
+
+    last = ledger.iloc[1]
+    assert bool(last["open"])
+    assert last["bars_held"] == 0
+
+
+def test_serialize_trades_pages_and_statistics():
+    close = np.arange(1.0, 21.0)
+    position = [0, 1] * 10
+    ledger = trades.extract_trades(_frame(close, position))
+    assert len(ledger) == 10
+
+    payload = trades.serialize_trades(ledger, offset=8, limit=5)
+    assert payload["total"] == 10
+    assert len(payload["trades"]["entry_date"]) == 2
+    stats = payload["statistics"]
+    assert stats["trades"] == 10
+    assert stats["profit_factor"] is None
+    # The last trade is entered on the last bar and still open.
+    assert payload["trades"]["open"] == [False, True]
+
+    empty = trades.serialize_trades(
+        trades.extract_trades(_frame(close, [0] * 20))
+    )
+    assert empty["total"] == 0
+    assert empty["statistics"]["win_rate"] is None
+    with pytest.raises(ValueError):
+        trades.serialize_trades(ledger, offset=-1)